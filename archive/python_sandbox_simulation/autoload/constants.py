@@ -177,6 +177,7 @@ MAX_CONNECTIONS_PER_SECTOR = 4      # hard cap on total connections per sector
 EXTRA_CONNECTION_1_CHANCE = 0.20    # nearby branch link chance (after primary)
 EXTRA_CONNECTION_2_CHANCE = 0.05    # distant loop link chance (requires first extra)
 LOOP_MIN_HOPS = 3                   # minimum graph distance for loop candidate
+AGENT_ROUTING_MAX_HOPS = 1          # >1 lets fleeing / role-seeking agents route multi-hop
 
 # ---------------------------------------------------------------------------
 # Catastrophe
@@ -28,6 +28,8 @@ class GameState:
         self.agents: dict = {}
         self.agent_tags: dict = {}
         self.player_character_uid: str = ""
+        self.sector_occupancy = None                 # SectorOccupancy index, built on first use
+        self.graph_distance = None                   # GraphDistance cache, built on first use
 
         # === Colony progression ===
         self.colony_levels: dict = {}
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+#
+# PROJECT: GDTLancer
+# MODULE: batch.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6
+# LOG_REF: 2026-10-17
+#
+
+"""Headless multi-seed batch runner: one SimulationEngine per worker process."""
+
+import argparse
+import collections
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.simulation.simulation_engine import SimulationEngine
+
+
+METRICS = ("actions", "ages", "deaths", "discoveries")
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="GDTLancer multi-seed batch runner")
+    parser.add_argument("--seeds", type=str, default="", help="Comma-separated seed list")
+    parser.add_argument("--seed-range", type=str, default="", help="START:END range of integer seeds (END exclusive)")
+    parser.add_argument("--seed-prefix", type=str, default="batch-", help="Prefix for --seed-range seeds")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--metrics", type=str, default=",".join(METRICS), help=f"Comma-separated subset of {','.join(METRICS)}")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", type=str, default="", help="Write the aggregate report as JSON to this path")
+    parser.add_argument("--quiet", action="store_true", help="Do not stream per-seed summaries")
+    return parser.parse_args()
+
+
+def parse_seeds(seeds: str, seed_range: str = "", prefix: str = "batch-") -> list:
+    result = [seed.strip() for seed in seeds.split(",") if seed.strip()]
+    if seed_range:
+        start, _, end = seed_range.partition(":")
+        result.extend(f"{prefix}{i}" for i in range(int(start), int(end)))
+    return result
+
+
+def parse_metrics(spec: str) -> tuple:
+    metrics = tuple(name.strip() for name in spec.split(",") if name.strip())
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(unknown)}")
+    return metrics
+
+
+def run_seed(seed: str, ticks: int, metrics: tuple = METRICS) -> dict:
+    """Run one seed to completion and return its summary (runs in a worker)."""
+    engine = SimulationEngine()
+    engine.initialize_simulation(seed)
+    state = engine.state
+
+    actions = collections.Counter()
+    age_transitions = []
+    prev_age = state.world_age
+    for tick, events in engine.iter_ticks(ticks):
+        if "actions" in metrics:
+            for event in events:
+                actions[event.get("action", "unknown")] += 1
+        if state.world_age != prev_age:
+            age_transitions.append([tick, prev_age, state.world_age])
+            prev_age = state.world_age
+
+    summary = {"seed": seed, "ticks": ticks, "final_agents": len(state.agents)}
+    if "actions" in metrics:
+        summary["actions"] = dict(sorted(actions.items()))
+    if "ages" in metrics:
+        summary["age_transitions"] = age_transitions
+        summary["final_age"] = state.world_age
+    if "deaths" in metrics:
+        summary["mortal_deaths"] = len(state.mortal_agent_deaths)
+        summary["mortal_spawned"] = state.mortal_agent_counter
+    if "discoveries" in metrics:
+        summary["discovered_sectors"] = state.discovered_sector_count
+        summary["total_sectors"] = len(state.world_topology)
+    return summary
+
+
+def run_batch(seeds: list, ticks: int, metrics: tuple = METRICS, workers: int = 1):
+    """Yield per-seed summaries as they finish.
+
+    Completion order depends on scheduling; each summary depends only on
+    its seed, so results are identical for any worker count.
+    """
+    if workers <= 1:
+        for seed in seeds:
+            yield run_seed(seed, ticks, metrics)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_seed, seed, ticks, metrics) for seed in seeds]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def merge_summaries(summaries: list, metrics: tuple = METRICS) -> dict:
+    """Merge per-seed summaries into one aggregate report (order-independent)."""
+    summaries = sorted(summaries, key=lambda item: item["seed"])
+    report = {"seeds": len(summaries), "per_seed": summaries}
+    if not summaries:
+        return report
+
+    report["final_agents"] = _spread([s["final_agents"] for s in summaries])
+    if "actions" in metrics:
+        actions = collections.Counter()
+        for summary in summaries:
+            actions.update(summary["actions"])
+        report["actions"] = dict(actions.most_common())
+    if "ages" in metrics:
+        report["age_transitions"] = _spread([len(s["age_transitions"]) for s in summaries])
+        report["final_ages"] = dict(collections.Counter(s["final_age"] for s in summaries).most_common())
+    if "deaths" in metrics:
+        report["mortal_deaths"] = _spread([s["mortal_deaths"] for s in summaries])
+        report["mortal_spawned"] = _spread([s["mortal_spawned"] for s in summaries])
+    if "discoveries" in metrics:
+        report["discovered_sectors"] = _spread([s["discovered_sectors"] for s in summaries])
+    return report
+
+
+def _spread(values: list) -> dict:
+    return {
+        "min": min(values),
+        "max": max(values),
+        "mean": round(sum(values) / len(values), 3),
+        "total": sum(values),
+    }
+
+
+def _summary_line(summary: dict) -> str:
+    parts = [f"seed={summary['seed']}", f"agents={summary['final_agents']}"]
+    if "mortal_deaths" in summary:
+        parts.append(f"deaths={summary['mortal_deaths']}")
+    if "discovered_sectors" in summary:
+        parts.append(f"discovered={summary['discovered_sectors']}")
+    if "age_transitions" in summary:
+        parts.append(f"age_shifts={len(summary['age_transitions'])}")
+    if "actions" in summary:
+        parts.append(f"events={sum(summary['actions'].values())}")
+    return " ".join(parts)
+
+
+def _report_lines(report: dict) -> list:
+    lines = ["=" * 60, f"BATCH REPORT ({report['seeds']} seeds)", "=" * 60]
+    for key in ("final_agents", "mortal_deaths", "mortal_spawned", "discovered_sectors", "age_transitions"):
+        if key in report:
+            spread = report[key]
+            lines.append(f"  {key}: mean={spread['mean']} min={spread['min']} max={spread['max']}")
+    if "final_ages" in report:
+        lines.append("\n--- FINAL WORLD AGE ---")
+        for age, count in report["final_ages"].items():
+            lines.append(f"  {age}: {count}")
+    if "actions" in report:
+        lines.append("\n--- ACTION DISTRIBUTION ---")
+        total = sum(report["actions"].values()) or 1
+        for action, count in report["actions"].items():
+            lines.append(f"  {action}: {count} ({100 * count / total:.1f}%)")
+    return lines
+
+
+def main():
+    args = _parse_args()
+    seeds = parse_seeds(args.seeds, args.seed_range, args.seed_prefix)
+    if not seeds:
+        seeds = ["qualitative-default"]
+    metrics = parse_metrics(args.metrics)
+
+    summaries = []
+    for summary in run_batch(seeds, args.ticks, metrics, args.workers):
+        summaries.append(summary)
+        if not args.quiet:
+            print(f"[{len(summaries)}/{len(seeds)}] {_summary_line(summary)}", flush=True)
+
+    report = merge_summaries(summaries, metrics)
+    print("\n".join(_report_lines(report)))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
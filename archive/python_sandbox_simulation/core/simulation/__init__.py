@@ -1,3 +1,3 @@
 # core/simulation/ — mirrors src/core/simulation/ in Godot project.
 # Contains: SimulationEngine, WorldLayer, GridLayer, AgentLayer,
-#           BridgeSystems, ChronicleLayer, CARules.
+#           BridgeSystems, ChronicleLayer, CARules, SectorOccupancy.
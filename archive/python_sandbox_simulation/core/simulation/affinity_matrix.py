@@ -8,7 +8,13 @@
 
 """Qualitative tag vocabulary and affinity scoring for the simulation."""
 
+try:
+    import numpy as np
+except ImportError:  # optional: batch scoring falls back to pure Python
+    np = None
+
 from autoload.constants import ATTACK_THRESHOLD, FLEE_THRESHOLD, TRADE_THRESHOLD
+from core.simulation.tag_set import TagSet, intern_tag, intern_tags, tag_id, vocabulary_size
 
 
 # -------------------------------------------------------------------------
@@ -56,6 +62,29 @@ PERSONALITY_TAG_RULES = [
 DYNAMIC_AGENT_TAGS = {"DESPERATE", "SCAVENGER"}
 
 
+# -------------------------------------------------------------------------
+# Interned bitmasks (fixed bit order; sets are sorted for determinism)
+# -------------------------------------------------------------------------
+# Agent groups are interned in the order derive_agent_tags emits them, so a
+# TagSet iterates agent tags in the same order the old lists did and
+# compute_affinity sums floats in an unchanged order.
+ROLE_MASK = intern_tags(ROLE_TAGS.values())
+PERSONALITY_MASK = intern_tags(tag for _, _, _, tag in PERSONALITY_TAG_RULES)
+AGENT_CONDITION_MASK = intern_tags(sorted(AGENT_CONDITION_TAGS))
+AGENT_WEALTH_MASK = intern_tags(sorted(AGENT_WEALTH_TAGS))
+AGENT_CARGO_MASK = intern_tags(sorted(AGENT_CARGO_TAGS))
+DYNAMIC_AGENT_MASK = intern_tags(sorted(DYNAMIC_AGENT_TAGS))
+
+SECTOR_ECONOMY_MASKS = {
+    category: intern_tags(sorted(options)) for category, options in SECTOR_ECONOMY_TAGS.items()
+}
+SECTOR_ECONOMY_MASK = intern_tags(tag for options in SECTOR_ECONOMY_TAGS.values() for tag in options)
+SECTOR_SECURITY_MASK = intern_tags(sorted(SECTOR_SECURITY_TAGS))
+SECTOR_ENVIRONMENT_MASK = intern_tags(sorted(SECTOR_ENVIRONMENT_TAGS))
+SECTOR_SPECIAL_MASK = intern_tags(sorted(SECTOR_SPECIAL_TAGS))
+SECTOR_HOSTILE_MASK = intern_tags(["HOSTILE_INFESTED", "HOSTILE_THREATENED"])
+
+
 # -------------------------------------------------------------------------
 # Affinity matrix (actor_tag, target_tag) -> score
 # -------------------------------------------------------------------------
@@ -133,17 +162,130 @@ AFFINITY_MATRIX = {
 # Core scoring
 # -------------------------------------------------------------------------
 def compute_affinity(actor_tags: list, target_tags: list) -> float:
-    score = 0.0
-    for actor_tag in actor_tags:
-        for target_tag in target_tags:
-            score += AFFINITY_MATRIX.get((actor_tag, target_tag), 0.0)
-    return score
+    return _get_kernel().score(actor_tags, target_tags)
+
+
+def compute_affinity_batch(actor_tags: list, targets: list, use_numpy=None) -> list:
+    """Score *actor_tags* against every tag collection in *targets*.
+
+    Returns one float per target, identical to calling compute_affinity on
+    each.  ``use_numpy=None`` picks the NumPy path automatically when it is
+    installed and the batch is large enough to pay for it.
+    """
+    return _get_kernel().score_batch(actor_tags, targets, use_numpy)
+
+
+def recompile_affinity_kernel() -> None:
+    """Rebuild the compiled kernel after AFFINITY_MATRIX is edited at runtime."""
+    global _KERNEL
+    _KERNEL = AffinityKernel(AFFINITY_MATRIX)
+
+
+# -------------------------------------------------------------------------
+# Compiled kernel
+# -------------------------------------------------------------------------
+class AffinityKernel:
+    """AFFINITY_MATRIX compiled to a dense score matrix over interned tag ids.
+
+    Scores are accumulated pair by pair in actor-major, target-minor order,
+    exactly like the reference nested loop, so results match it bit for
+    bit.  Zero cells are skipped; adding 0.0 never changes the running sum.
+    """
+
+    NUMPY_MIN_BATCH = 32
+
+    def __init__(self, matrix: dict):
+        for actor_tag, target_tag in matrix:
+            intern_tag(actor_tag)
+            intern_tag(target_tag)
+        self.size = vocabulary_size()
+        self.rows = [[0.0] * self.size for _ in range(self.size)]
+        for (actor_tag, target_tag), value in matrix.items():
+            self.rows[tag_id(actor_tag)][tag_id(target_tag)] = value
+        # actor id -> ((target_bit, score), ...) for non-zero cells, in bit order
+        self._sparse_rows = [
+            tuple((1 << target_id, value) for target_id, value in enumerate(row) if value != 0.0)
+            for row in self.rows
+        ]
+        self._actor_pairs = {}   # actor mask -> flattened (target_bit, score) pairs
+
+    def score(self, actor_tags, target_tags) -> float:
+        if isinstance(actor_tags, TagSet) and isinstance(target_tags, TagSet):
+            target_mask = target_tags.mask
+            score = 0.0
+            for bit, value in self._pairs_for(actor_tags):
+                if target_mask & bit:
+                    score += value
+            return score
+
+        target_ids = [tag_id(tag) for tag in target_tags]
+        score = 0.0
+        for actor_tag in actor_tags:
+            actor_id = tag_id(actor_tag)
+            if actor_id >= self.size:
+                continue
+            row = self.rows[actor_id]
+            for target_id in target_ids:
+                if target_id < self.size:
+                    score += row[target_id]
+        return score
+
+    def score_batch(self, actor_tags, targets: list, use_numpy=None) -> list:
+        if not targets:
+            return []
+        if not isinstance(actor_tags, TagSet) or not all(isinstance(t, TagSet) for t in targets):
+            return [self.score(actor_tags, target_tags) for target_tags in targets]
+
+        pairs = self._pairs_for(actor_tags)
+        masks = [target_tags.mask for target_tags in targets]
+        if use_numpy is None:
+            use_numpy = np is not None and len(masks) >= self.NUMPY_MIN_BATCH
+        if use_numpy and np is not None and max(masks).bit_length() < 63:
+            mask_array = np.array(masks, dtype=np.int64)
+            scores = np.zeros(len(masks), dtype=np.float64)
+            for bit, value in pairs:
+                scores += np.where(mask_array & bit, value, 0.0)
+            return scores.tolist()
+
+        results = []
+        for target_mask in masks:
+            score = 0.0
+            for bit, value in pairs:
+                if target_mask & bit:
+                    score += value
+            results.append(score)
+        return results
+
+    def _pairs_for(self, actor_tags: TagSet) -> tuple:
+        pairs = self._actor_pairs.get(actor_tags.mask)
+        if pairs is None:
+            flat = []
+            mask = actor_tags.mask
+            while mask:
+                low = mask & -mask
+                actor_id = low.bit_length() - 1
+                if actor_id < self.size:
+                    flat.extend(self._sparse_rows[actor_id])
+                mask ^= low
+            pairs = tuple(flat)
+            self._actor_pairs[actor_tags.mask] = pairs
+        return pairs
+
+
+_KERNEL = None
+
+
+def _get_kernel() -> AffinityKernel:
+    global _KERNEL
+    if _KERNEL is None:
+        _KERNEL = AffinityKernel(AFFINITY_MATRIX)
+    return _KERNEL
 
 
 # -------------------------------------------------------------------------
 # Tag derivation
 # -------------------------------------------------------------------------
-def derive_agent_tags(character_data: dict, agent_state: dict, has_cargo: bool = False) -> list:
+def derive_agent_tags(character_data: dict, agent_state: dict, has_cargo: bool = False) -> TagSet:
     tags = []
 
     role = agent_state.get("agent_role", "idle")
@@ -182,12 +324,12 @@ def derive_agent_tags(character_data: dict, agent_state: dict, has_cargo: bool =
     if role == "prospector":
         tags.append("SCAVENGER")
 
-    return _unique(tags)
+    return TagSet(tags)
 
 
-def derive_sector_tags(sector_id: str, state) -> list:
-    existing = list(state.sector_tags.get(sector_id, [])) if hasattr(state, "sector_tags") else []
-    tags = set(existing)
+def derive_sector_tags(sector_id: str, state) -> TagSet:
+    existing = state.sector_tags.get(sector_id, ()) if hasattr(state, "sector_tags") else ()
+    tags = TagSet.coerce(existing)
 
     topology = state.world_topology.get(sector_id, {}) if hasattr(state, "world_topology") else {}
     hazards = state.world_hazards.get(sector_id, {}) if hasattr(state, "world_hazards") else {}
@@ -196,42 +338,34 @@ def derive_sector_tags(sector_id: str, state) -> list:
     tick = getattr(state, "sim_tick_count", 0)
 
     if topology.get("sector_type") == "frontier":
-        tags.add("FRONTIER")
+        tags = tags.with_tag("FRONTIER")
     else:
-        tags.add("STATION")
+        tags = tags.with_tag("STATION")
 
     if disabled_until and tick < disabled_until:
-        tags.add("DISABLED")
+        tags = tags.with_tag("DISABLED")
 
     security_tag = _pick_security_tag(tags, dominion)
     env_tag = _pick_environment_tag(hazards, tags)
     economy_tags = _pick_economy_tags(tags)
 
-    tags.difference_update(SECTOR_SECURITY_TAGS)
-    tags.add(security_tag)
-    tags.difference_update(SECTOR_ENVIRONMENT_TAGS)
-    tags.add(env_tag)
-
-    all_economy_tags = set().union(*SECTOR_ECONOMY_TAGS.values())
-    tags.difference_update(all_economy_tags)
-    tags.update(economy_tags)
+    tags = tags.replace_group(SECTOR_SECURITY_MASK, security_tag)
+    tags = tags.replace_group(SECTOR_ENVIRONMENT_MASK, env_tag)
+    tags = TagSet.from_mask((tags.mask & ~SECTOR_ECONOMY_MASK) | intern_tags(economy_tags))
 
-    hostile = "HOSTILE_INFESTED" in tags or "HOSTILE_THREATENED" in tags
-    if hostile and security_tag == "SECURE":
-        tags.discard("HOSTILE_INFESTED")
-        tags.add("HOSTILE_THREATENED")
+    if tags.has_any(SECTOR_HOSTILE_MASK) and security_tag == "SECURE":
+        tags = tags.replace_group(SECTOR_HOSTILE_MASK, "HOSTILE_THREATENED")
 
     if "HAS_WRECKS" in tags:
-        tags.discard("HAS_WRECKS")
-        tags.add("HAS_SALVAGE")
+        tags = tags.replace_group(intern_tag("HAS_WRECKS"), "HAS_SALVAGE")
 
-    return _unique(list(tags))
+    return tags
 
 
 # -------------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------------
-def _pick_security_tag(existing: set, dominion: dict) -> str:
+def _pick_security_tag(existing: TagSet, dominion: dict) -> str:
     for label in SECTOR_SECURITY_TAGS:
         if label in existing:
             return label
@@ -245,7 +379,7 @@ def _pick_security_tag(existing: set, dominion: dict) -> str:
     return "CONTESTED"
 
 
-def _pick_environment_tag(hazards: dict, existing: set) -> str:
+def _pick_environment_tag(hazards: dict, existing: TagSet) -> str:
     for label in SECTOR_ENVIRONMENT_TAGS:
         if label in existing:
             return label
@@ -261,10 +395,10 @@ def _pick_environment_tag(hazards: dict, existing: set) -> str:
     return "MILD"
 
 
-def _pick_economy_tags(existing: set) -> list:
+def _pick_economy_tags(existing: TagSet) -> list:
     tags = []
     for category, options in SECTOR_ECONOMY_TAGS.items():
-        current = sorted(existing.intersection(options))
+        current = sorted(tag for tag in options if tag in existing)
         if current:
             tags.append(current[0])
             continue
@@ -276,12 +410,3 @@ def _pick_economy_tags(existing: set) -> list:
             tags.append("CURRENCY_ADEQUATE")
     return tags
 
-
-def _unique(values: list) -> list:
-    seen = set()
-    result = []
-    for value in values:
-        if value not in seen:
-            seen.add(value)
-            result.append(value)
-    return result
@@ -15,19 +15,29 @@ from autoload import constants
 from core.simulation.affinity_matrix import (
     ATTACK_THRESHOLD,
     FLEE_THRESHOLD,
+    SECTOR_ENVIRONMENT_MASK,
     TRADE_THRESHOLD,
     compute_affinity,
+    compute_affinity_batch,
 )
+from core.simulation.graph_distance import get_graph_distance, invalidate_graph_distance
+from core.simulation.sector_occupancy import get_occupancy, rebuild_occupancy
+from core.simulation.tag_set import TagSet
+from core.simulation.tick_profiler import NULL_PROFILER
 
 
 class AgentLayer:
     def __init__(self):
         self._chronicle = None
         self._rng = random.Random()
+        self._profiler = NULL_PROFILER
 
     def set_chronicle(self, chronicle) -> None:
         self._chronicle = chronicle
 
+    def set_profiler(self, profiler) -> None:
+        self._profiler = profiler if profiler is not None else NULL_PROFILER
+
     def initialize_agents(self, state) -> None:
         state.agents.clear()
         state.characters.clear()
@@ -38,26 +48,36 @@ class AgentLayer:
             if template.get("agent_type") == "player":
                 continue
             self._initialize_agent_from_template(state, agent_id, template)
+        rebuild_occupancy(state)
 
     def process_tick(self, state, config: dict) -> None:
         self._rng = random.Random(f"{state.world_seed}:{state.sim_tick_count}")
 
-        self._apply_upkeep(state)
+        profiler = self._profiler
+
+        with profiler.section("agent.upkeep"):
+            self._apply_upkeep(state)
 
         for agent_id, agent in list(state.agents.items()):
             if agent_id == "player":
                 continue
 
             if agent.get("is_disabled", False):
-                self._check_respawn(state, agent_id, agent)
+                with profiler.section("agent.respawn"):
+                    self._check_respawn(state, agent_id, agent)
                 continue
 
             self._evaluate_goals(agent)
-            self._execute_action(state, agent_id, agent)
+            with profiler.section(f"agent.action.{agent['goal_archetype']}"):
+                self._execute_action(state, agent_id, agent)
+            self._sync_occupancy(state, agent_id, agent)
 
-        self._check_catastrophe(state)
-        self._spawn_mortal_agents(state)
-        self._cleanup_dead_mortals(state)
+        with profiler.section("agent.catastrophe"):
+            self._check_catastrophe(state)
+        with profiler.section("agent.spawn"):
+            self._spawn_mortal_agents(state)
+        with profiler.section("agent.cleanup"):
+            self._cleanup_dead_mortals(state)
 
     def _initialize_player(self, state) -> None:
         character_id = "character_default"
@@ -136,6 +156,8 @@ class AgentLayer:
                 break
         if best != current:
             self._action_move_toward(state, agent_id, agent, best)
+        elif "SECURE" not in state.sector_tags.get(current, []):
+            self._route_toward(state, agent_id, agent, lambda sid: "SECURE" in state.sector_tags.get(sid, []))
 
     def _action_affinity_scan(self, state, agent_id: str, agent: dict) -> None:
         actor_tags = agent.get("sentiment_tags", [])
@@ -176,6 +198,7 @@ class AgentLayer:
             if new_target_condition == "DESTROYED":
                 target["is_disabled"] = True
                 target["disabled_at_tick"] = state.sim_tick_count
+                self._sync_occupancy(state, target_id, target)
                 state.sector_tags[current_sector] = self._add_tag(state.sector_tags.get(current_sector, []), "HAS_SALVAGE")
                 actor["cargo_tag"] = "LOADED"
             self._log_event(state, actor_id, "attack", current_sector, {"target": target_id})
@@ -184,6 +207,7 @@ class AgentLayer:
 
         if score >= TRADE_THRESHOLD:
             self._bilateral_trade(actor, target)
+            self._sync_occupancy(state, target_id, target)
             self._log_event(state, actor_id, "agent_trade", current_sector, {"target": target_id})
             return True
 
@@ -200,7 +224,8 @@ class AgentLayer:
 
         # Explorers prioritise exploration above almost everything.
         if "FRONTIER" in sector_tags and agent.get("agent_role") == "explorer":
-            self._try_exploration(state, agent_id, agent, sector_id)
+            with self._profiler.section("agent.exploration"):
+                self._try_exploration(state, agent_id, agent, sector_id)
             return
 
         if score >= ATTACK_THRESHOLD and "HAS_SALVAGE" in sector_tags:
@@ -251,7 +276,7 @@ class AgentLayer:
         if "HAS_SALVAGE" not in tags:
             return
         agent["cargo_tag"] = "LOADED"
-        state.sector_tags[sector_id] = [tag for tag in tags if tag != "HAS_SALVAGE"]
+        state.sector_tags[sector_id] = TagSet.coerce(tags).without("HAS_SALVAGE")
         self._log_event(state, agent_id, "harvest", sector_id, {})
 
     def _action_move_toward_tag(self, state, agent_id: str, agent: dict, target_tag: str) -> None:
@@ -261,12 +286,15 @@ class AgentLayer:
             if target_tag in state.sector_tags.get(sector_id, []):
                 self._action_move_toward(state, agent_id, agent, sector_id)
                 return
+        if self._route_toward(state, agent_id, agent, lambda sid: target_tag in state.sector_tags.get(sid, [])):
+            return
         self._action_move_random(state, agent_id, agent)
 
     def _action_move_toward(self, state, agent_id: str, agent: dict, target_sector_id: str) -> None:
         current = agent.get("current_sector_id", "")
         if target_sector_id in state.world_topology.get(current, {}).get("connections", []):
             agent["current_sector_id"] = target_sector_id
+            self._sync_occupancy(state, agent_id, agent)
             self._log_event(state, agent_id, "move", target_sector_id, {"from": current})
 
     def _action_move_random(self, state, agent_id: str, agent: dict) -> None:
@@ -277,6 +305,23 @@ class AgentLayer:
         target = self._rng.choice(neighbors)
         self._action_move_toward(state, agent_id, agent, target)
 
+    def _route_toward(self, state, agent_id: str, agent: dict, predicate) -> bool:
+        """Step one hop toward the nearest sector matching *predicate*.
+
+        Only active when AGENT_ROUTING_MAX_HOPS > 1; callers have already
+        checked the one-hop neighbourhood.
+        """
+        max_hops = constants.AGENT_ROUTING_MAX_HOPS
+        if max_hops <= 1:
+            return False
+        graph = get_graph_distance(state)
+        current = agent.get("current_sector_id", "")
+        target = graph.nearest(current, predicate, max_hops)
+        if target is None:
+            return False
+        self._action_move_toward(state, agent_id, agent, graph.next_hop(current, target))
+        return True
+
     def _try_exploration(self, state, agent_id: str, agent: dict, sector_id: str) -> None:
         # Cap check — stop when the graph is full.
         if len(state.world_topology) >= constants.MAX_SECTOR_COUNT:
@@ -364,9 +409,10 @@ class AgentLayer:
             existing_conns = conn_data.get("connections", [])
             if new_id not in existing_conns:
                 existing_conns.append(new_id)
+        invalidate_graph_distance(state)
 
         # --- Initialize all required state dicts ---
-        state.sector_tags[new_id] = list(initial_tags)
+        state.sector_tags[new_id] = TagSet(initial_tags)
         state.world_hazards[new_id] = {"environment": environment}
         state.colony_levels[new_id] = "frontier"
         state.colony_upgrade_progress[new_id] = 0
@@ -456,24 +502,13 @@ class AgentLayer:
         if source_id not in state.world_topology:
             return None
 
-        queue = [(source_id, 0)]
-        visited = {source_id}
-        distant = []
-
-        while queue:
-            current_id, depth = queue.pop(0)
-            if (
-                depth >= constants.LOOP_MIN_HOPS
-                and current_id not in exclude
-                and self._graph_degree(state, current_id) < constants.MAX_CONNECTIONS_PER_SECTOR
-            ):
-                distant.append(current_id)
-
-            for neighbor_id in state.world_topology.get(current_id, {}).get("connections", []):
-                if neighbor_id in visited:
-                    continue
-                visited.add(neighbor_id)
-                queue.append((neighbor_id, depth + 1))
+        distant = [
+            sector_id
+            for sector_id, hops in get_graph_distance(state).distances(source_id).items()
+            if hops >= constants.LOOP_MIN_HOPS
+            and sector_id not in exclude
+            and self._graph_degree(state, sector_id) < constants.MAX_CONNECTIONS_PER_SECTOR
+        ]
 
         if not distant:
             return None
@@ -486,13 +521,12 @@ class AgentLayer:
     def _best_agent_target(self, state, actor_id: str, actor_tags: list, sector_id: str, can_attack: bool):
         best_id = None
         best_score = 0.0
-        for target_id, target in state.agents.items():
-            if target_id == actor_id or target.get("is_disabled"):
-                continue
-            if target.get("current_sector_id") != sector_id:
-                continue
-            target_tags = target.get("sentiment_tags", [])
-            score = compute_affinity(actor_tags, target_tags)
+        target_ids = [target_id for target_id in get_occupancy(state).agent_ids(sector_id) if target_id != actor_id]
+        scores = compute_affinity_batch(
+            actor_tags,
+            [state.agents[target_id].get("sentiment_tags", []) for target_id in target_ids],
+        )
+        for target_id, score in zip(target_ids, scores):
             if not can_attack and score >= ATTACK_THRESHOLD:
                 continue
             if abs(score) > abs(best_score):
@@ -530,6 +564,7 @@ class AgentLayer:
         agent["condition_tag"] = "HEALTHY"
         agent["wealth_tag"] = "COMFORTABLE"
         agent["cargo_tag"] = "EMPTY"
+        self._sync_occupancy(state, agent_id, agent)
         self._log_event(state, agent_id, "respawn", agent.get("current_sector_id", ""), {})
 
     def _check_catastrophe(self, state) -> None:
@@ -540,23 +575,23 @@ class AgentLayer:
             return
         sector_id = self._rng.choice(sector_ids)
         state.sector_tags[sector_id] = self._add_tag(state.sector_tags.get(sector_id, []), "DISABLED")
-        state.sector_tags[sector_id] = self._replace_one(state.sector_tags[sector_id], {"MILD", "HARSH", "EXTREME"}, "EXTREME")
+        state.sector_tags[sector_id] = self._replace_one(state.sector_tags[sector_id], SECTOR_ENVIRONMENT_MASK, "EXTREME")
         state.sector_disabled_until[sector_id] = state.sim_tick_count + constants.CATASTROPHE_DISABLE_DURATION
         state.catastrophe_log.append({"tick": state.sim_tick_count, "sector_id": sector_id})
         self._log_event(state, "system", "catastrophe", sector_id, {})
 
         # Kill mortals caught in the catastrophe sector.
+        occupancy = get_occupancy(state)
         to_kill = []
-        for agent_id, agent in state.agents.items():
-            if agent.get("is_persistent", False) or agent.get("is_disabled", False):
-                continue
-            if agent.get("current_sector_id") != sector_id:
+        for agent_id in occupancy.agent_ids(sector_id):
+            if state.agents[agent_id].get("is_persistent", False):
                 continue
             if self._rng.random() < constants.CATASTROPHE_MORTAL_KILL_CHANCE:
                 to_kill.append(agent_id)
         for agent_id in to_kill:
             state.mortal_agent_deaths.append({"tick": state.sim_tick_count, "agent_id": agent_id})
             self._log_event(state, agent_id, "catastrophe_death", sector_id, {})
+            occupancy.discard_agent(agent_id)
             del state.agents[agent_id]
 
     def _spawn_mortal_agents(self, state) -> None:
@@ -602,6 +637,7 @@ class AgentLayer:
             "cargo_tag": "EMPTY",
             "dynamic_tags": [],
         }
+        self._sync_occupancy(state, agent_id, state.agents[agent_id])
         self._log_event(state, agent_id, "spawn", spawn_sector, {})
 
     def _cleanup_dead_mortals(self, state) -> None:
@@ -631,12 +667,14 @@ class AgentLayer:
             agent["condition_tag"] = "DAMAGED"
             agent["wealth_tag"] = "BROKE"
             agent["cargo_tag"] = "EMPTY"
+            self._sync_occupancy(state, agent_id, agent)
             self._log_event(state, agent_id, "survived", agent.get("current_sector_id", ""), {})
 
         # Permanent deaths
         for agent_id in to_remove:
             state.mortal_agent_deaths.append({"tick": state.sim_tick_count, "agent_id": agent_id})
             self._log_event(state, agent_id, "perma_death", state.agents[agent_id].get("current_sector_id", ""), {})
+            get_occupancy(state).discard_agent(agent_id)
             del state.agents[agent_id]
 
     def _apply_upkeep(self, state) -> None:
@@ -656,6 +694,7 @@ class AgentLayer:
                 ):
                     agent["is_disabled"] = True
                     agent["disabled_at_tick"] = state.sim_tick_count
+                    self._sync_occupancy(state, agent_id, agent)
                     continue
 
             # Random degradation
@@ -692,7 +731,7 @@ class AgentLayer:
             if role == "trader":
                 self._wealth_step_down(agent)
             if role == "pirate" and "HAS_SALVAGE" in sector_tags:
-                state.sector_tags[sector_id] = [t for t in state.sector_tags.get(sector_id, []) if t != "HAS_SALVAGE"]
+                state.sector_tags[sector_id] = TagSet.coerce(state.sector_tags.get(sector_id, ())).without("HAS_SALVAGE")
             self._log_event(state, agent_id, "load_cargo", sector_id, {})
             return True
         return False
@@ -723,7 +762,10 @@ class AgentLayer:
                 best_sector = neighbor_id
         if best_sector and best_score > 0:
             self._action_move_toward(state, agent_id, agent, best_sector)
-        else:
+        elif not self._route_toward(
+            state, agent_id, agent,
+            lambda sid: any(tag in state.sector_tags.get(sid, []) for tag in preferred_tags),
+        ):
             self._action_move_random(state, agent_id, agent)
 
     def _post_combat_dispersal(self, state, agent_id: str, agent: dict) -> None:
@@ -737,13 +779,11 @@ class AgentLayer:
         self._action_move_toward(state, agent_id, agent, target_sector)
 
     def _active_agent_count_in_sector(self, state, sector_id: str) -> int:
-        count = 0
-        for agent in state.agents.values():
-            if agent.get("is_disabled"):
-                continue
-            if agent.get("current_sector_id") == sector_id:
-                count += 1
-        return count
+        return get_occupancy(state).active_count(sector_id)
+
+    def _sync_occupancy(self, state, agent_id: str, agent: dict) -> None:
+        """Record a sector, status or cargo change in the occupancy index."""
+        get_occupancy(state).sync_agent(agent_id, agent)
 
     def _wealth_step_up(self, agent: dict) -> None:
         """Increase wealth by one level."""
@@ -781,11 +821,11 @@ class AgentLayer:
                 return value
         return default
 
-    def _replace_one(self, tags: list, options: set, replacement: str) -> list:
-        return [tag for tag in tags if tag not in options] + [replacement]
+    def _replace_one(self, tags: TagSet, group_mask: int, replacement: str) -> TagSet:
+        return TagSet.coerce(tags).replace_group(group_mask, replacement)
 
-    def _add_tag(self, tags: list, tag: str) -> list:
-        return tags if tag in tags else tags + [tag]
+    def _add_tag(self, tags: TagSet, tag: str) -> TagSet:
+        return TagSet.coerce(tags).with_tag(tag)
 
     def _log_event(self, state, actor_id: str, action: str, sector_id: str, metadata: dict) -> None:
         event = {
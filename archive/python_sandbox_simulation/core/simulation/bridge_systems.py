@@ -9,31 +9,97 @@
 """Bridge systems: derive and refresh qualitative tags across layers."""
 
 from core.simulation.affinity_matrix import derive_agent_tags, derive_sector_tags
+from core.simulation.tag_set import TagSet
 
 
 class BridgeSystems:
-    """Cross-layer tag refresh only (agent, sector, world)."""
+    """Cross-layer tag refresh only (agent, sector, world).
+
+    Tags are re-derived only for dirty entities.  An agent is dirty when its
+    role, condition, wealth, cargo or dynamic tags changed since the last
+    derivation; a sector is dirty when its tags, type, hazards, dominion
+    security level or disabled status changed.  Clean entities reuse their
+    cached tags.  Character personality traits are treated as static; call
+    ``invalidate`` after editing ``state.characters`` or swapping state.
+    """
+
+    def __init__(self):
+        self._agent_cache = {}    # agent_id -> (inputs, tags)
+        self._sector_cache = {}   # sector_id -> (inputs, tags)
+        self.last_tick_stats = {"agents_rederived": 0, "sectors_rederived": 0}
+        self.total_stats = {"ticks": 0, "agents_rederived": 0, "agents_reused": 0,
+                            "sectors_rederived": 0, "sectors_reused": 0}
 
     def process_tick(self, state, config: dict) -> None:
+        self.last_tick_stats = {"agents_rederived": 0, "sectors_rederived": 0}
+        self.total_stats["ticks"] += 1
         self._refresh_sector_tags(state)
         self._refresh_agent_tags(state)
         self._refresh_world_tags(state)
 
+    def invalidate(self) -> None:
+        """Drop every cached derivation so the next tick re-derives all."""
+        self._agent_cache.clear()
+        self._sector_cache.clear()
+
+    def get_rederive_stats(self) -> dict:
+        return {"last_tick": dict(self.last_tick_stats), "total": dict(self.total_stats)}
+
     def _refresh_agent_tags(self, state) -> None:
         state.agent_tags = state.agent_tags or {}
+        if len(self._agent_cache) > 2 * len(state.agents):
+            # Drop entries for mortals that have since been removed.
+            self._agent_cache = {aid: entry for aid, entry in self._agent_cache.items() if aid in state.agents}
         for agent_id, agent in state.agents.items():
             if agent.get("is_disabled", False):
                 continue
-            character_id = agent.get("character_id", "")
-            char_data = state.characters.get(character_id, {})
             has_cargo = "LOADED" in agent.get("initial_tags", []) or agent.get("cargo_tag") == "LOADED"
+            inputs = (
+                agent.get("character_id", ""),
+                agent.get("agent_role", "idle"),
+                agent.get("condition_tag"),
+                agent.get("wealth_tag"),
+                agent.get("cargo_tag"),
+                has_cargo,
+                tuple(agent.get("dynamic_tags", ())),
+            )
+            cached = self._agent_cache.get(agent_id)
+            if cached is not None and cached[0] == inputs and agent.get("sentiment_tags") is cached[1]:
+                self.total_stats["agents_reused"] += 1
+                continue
+
+            char_data = state.characters.get(inputs[0], {})
             tags = derive_agent_tags(char_data, agent, has_cargo=has_cargo)
+            self._agent_cache[agent_id] = (inputs, tags)
             state.agent_tags[agent_id] = tags
             agent["sentiment_tags"] = tags
+            self.last_tick_stats["agents_rederived"] += 1
+            self.total_stats["agents_rederived"] += 1
 
     def _refresh_sector_tags(self, state) -> None:
+        tick = state.sim_tick_count
         for sector_id in state.world_topology:
-            state.sector_tags[sector_id] = derive_sector_tags(sector_id, state)
+            hazards = state.world_hazards.get(sector_id, {})
+            disabled_until = state.sector_disabled_until.get(sector_id, 0)
+            inputs = (
+                TagSet.coerce(state.sector_tags.get(sector_id, ())).mask,
+                state.world_topology[sector_id].get("sector_type"),
+                bool(disabled_until and tick < disabled_until),
+                state.grid_dominion.get(sector_id, {}).get("security_level"),
+                hazards.get("radiation_level"),
+                hazards.get("thermal_background_k"),
+            )
+            cached = self._sector_cache.get(sector_id)
+            if cached is not None and cached[0] == inputs:
+                state.sector_tags[sector_id] = cached[1]
+                self.total_stats["sectors_reused"] += 1
+                continue
+
+            tags = derive_sector_tags(sector_id, state)
+            self._sector_cache[sector_id] = (inputs, tags)
+            state.sector_tags[sector_id] = tags
+            self.last_tick_stats["sectors_rederived"] += 1
+            self.total_stats["sectors_rederived"] += 1
 
     def _refresh_world_tags(self, state) -> None:
         age = state.world_age or "PROSPERITY"
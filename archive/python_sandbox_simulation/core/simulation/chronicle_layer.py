@@ -8,6 +8,9 @@
 
 """Chronicle layer: capture events, generate rumors, distribute memory."""
 
+import gzip
+import json
+
 from database.registry.template_data import LOCATIONS
 
 
@@ -17,6 +20,25 @@ class ChronicleLayer:
         self._max_events = 200
         self._max_rumors = 50
         self._max_agent_memory = 20
+        self._subscribers = []
+
+    # --- Event sinks -------------------------------------------------------
+    def subscribe(self, callback) -> "Subscription":
+        """Register ``callback(tick, events)``; called once per tick with events.
+
+        ``state.chronicle_events`` is a bounded window; subscribers see every
+        event exactly once, in log order, and may keep full history. Closing
+        the returned Subscription (or leaving its ``with`` block) unsubscribes
+        the callback and closes it if it has a ``close`` method.
+        """
+        self._subscribers.append(callback)
+        return Subscription(self, callback)
+
+    def unsubscribe(self, callback) -> None:
+        if isinstance(callback, Subscription):
+            callback = callback.callback
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
 
     def log_event(self, event_packet: dict) -> None:
         packet = dict(event_packet)
@@ -32,6 +54,8 @@ class ChronicleLayer:
             return
 
         events = self._collect_events(state)
+        for callback in list(self._subscribers):
+            callback(state.sim_tick_count, events)
         rumors = self._generate_rumors(state, events)
         self._distribute_events(state, events)
 
@@ -115,3 +139,65 @@ class ChronicleLayer:
             "age_change": "reported a world-age shift",
         }
         return labels.get(action, action)
+
+
+class Subscription:
+    """Handle for a ChronicleLayer subscriber; ``with`` yields the callback."""
+
+    def __init__(self, chronicle: ChronicleLayer, callback):
+        self.chronicle = chronicle
+        self.callback = callback
+
+    def close(self) -> None:
+        self.chronicle.unsubscribe(self.callback)
+        close = getattr(self.callback, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self.callback
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventLogSink:
+    """Append-only JSONL event log; a ``.gz`` path is written gzip-compressed.
+
+    Use as a ChronicleLayer subscriber and close it through the subscription,
+    so it stops receiving events before its file is closed::
+
+        with chronicle.subscribe(EventLogSink(path)) as sink:
+            ...
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        opener = gzip.open if path.endswith(".gz") else open
+        self._handle = opener(path, "at", encoding="utf-8")
+        self.events_written = 0
+
+    def __call__(self, tick: int, events: list) -> None:
+        for event in events:
+            self._handle.write(json.dumps(event, default=_json_default, separators=(",", ":")))
+            self._handle.write("\n")
+        self.events_written += len(events)
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self._handle.close()
+
+
+def read_event_log(path: str):
+    """Yield events back from an EventLogSink file, in log order."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
@@ -0,0 +1,103 @@
+#
+# PROJECT: GDTLancer
+# MODULE: graph_distance.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1
+# LOG_REF: 2026-10-17
+#
+
+"""Cached hop distances and next-hop tables over the world topology graph."""
+
+from collections import deque
+
+
+class GraphDistance:
+    """Lazily computed, per-source BFS results over ``world_topology``.
+
+    The graph is unweighted, so BFS gives shortest paths.  Each source is
+    searched once and cached until ``invalidate`` (called when exploration
+    adds a sector).  Distance tables keep BFS discovery order, which follows
+    connection-list order, so nearest-match queries are deterministic.
+    """
+
+    def __init__(self, topology: dict):
+        self._topology = topology
+        self._distances = {}   # source -> {sector_id: hops}
+        self._next_hops = {}   # source -> {sector_id: first hop on a shortest path}
+        self.version = 0
+
+    def invalidate(self) -> None:
+        self._distances.clear()
+        self._next_hops.clear()
+        self.version += 1
+
+    def distances(self, source_id: str) -> dict:
+        """Hop count to every reachable sector (source included, at 0). Do not mutate."""
+        distances = self._distances.get(source_id)
+        if distances is None:
+            distances = self._search(source_id)
+        return distances
+
+    def distance(self, source_id: str, target_id: str):
+        return self.distances(source_id).get(target_id)
+
+    def next_hop(self, source_id: str, target_id: str):
+        """First sector to move to from *source_id* toward *target_id* (None if unreachable or already there)."""
+        if source_id not in self._next_hops:
+            self._search(source_id)
+        return self._next_hops[source_id].get(target_id)
+
+    def path(self, source_id: str, target_id: str) -> list:
+        """Sectors after *source_id* up to and including *target_id*; [] if unreachable."""
+        path = []
+        current = source_id
+        while current != target_id:
+            current = self.next_hop(current, target_id)
+            if current is None:
+                return []
+            path.append(current)
+        return path
+
+    def nearest(self, source_id: str, predicate, max_hops: int = None):
+        """Closest sector (excluding the source) satisfying *predicate*, or None."""
+        for sector_id, hops in self.distances(source_id).items():
+            if hops == 0:
+                continue
+            if max_hops is not None and hops > max_hops:
+                break
+            if predicate(sector_id):
+                return sector_id
+        return None
+
+    def _search(self, source_id: str) -> dict:
+        topology = self._topology
+        distances = {source_id: 0}
+        next_hops = {}
+        queue = deque([source_id])
+        while queue:
+            current_id = queue.popleft()
+            depth = distances[current_id] + 1
+            for neighbor_id in topology.get(current_id, {}).get("connections", []):
+                if neighbor_id in distances:
+                    continue
+                distances[neighbor_id] = depth
+                next_hops[neighbor_id] = neighbor_id if current_id == source_id else next_hops[current_id]
+                queue.append(neighbor_id)
+        self._distances[source_id] = distances
+        self._next_hops[source_id] = next_hops
+        return distances
+
+
+def get_graph_distance(state) -> GraphDistance:
+    """Return the state's graph-distance cache, building it on first use."""
+    graph = getattr(state, "graph_distance", None)
+    if graph is None or graph._topology is not state.world_topology:
+        graph = GraphDistance(state.world_topology)
+        state.graph_distance = graph
+    return graph
+
+
+def invalidate_graph_distance(state) -> None:
+    graph = getattr(state, "graph_distance", None)
+    if graph is not None:
+        graph.invalidate()
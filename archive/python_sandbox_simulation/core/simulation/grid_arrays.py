@@ -0,0 +1,361 @@
+#
+# PROJECT: GDTLancer
+# MODULE: grid_arrays.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Array-backed (struct-of-arrays) CA step for GridLayer; requires NumPy."""
+
+from autoload import constants
+from core.simulation.affinity_matrix import (
+    SECTOR_ENVIRONMENT_MASK,
+    SECTOR_HOSTILE_MASK,
+    SECTOR_SECURITY_MASK,
+)
+from core.simulation.sector_occupancy import get_occupancy
+from core.simulation.tag_set import TagSet, intern_tag, intern_tags, prefix_mask
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; only the vector grid mode needs it
+    np = None
+
+
+# Per-sector fields written by one grid step (besides sector_tags).
+_SECTOR_FIELDS = (
+    "security_upgrade_progress",
+    "security_downgrade_progress",
+    "hostile_infestation_progress",
+    "colony_levels",
+    "colony_upgrade_progress",
+    "colony_downgrade_progress",
+)
+_ECONOMY_FIELDS = ("economy_upgrade_progress", "economy_downgrade_progress")
+
+
+class GridArrayEngine:
+    """Runs GridLayer's per-sector CA rules as whole-array operations.
+
+    Every level is an int array over sectors (economy is sectors x
+    categories) and neighbour security comes from a CSR adjacency built
+    from ``world_topology``.  Rules, precedence and tie-breaks mirror the
+    list-based ``GridLayer`` step exactly; ``mismatches`` checks that.
+    """
+
+    def __init__(self, grid_layer):
+        if np is None:
+            raise RuntimeError("Vector grid mode requires NumPy")
+        self._grid = grid_layer
+        self._topology_key = None
+        self._sector_ids = []
+        self._node_ids = []     # sectors first, then any neighbour ids outside the topology
+        self._indices = None    # CSR column indices into _node_ids
+        self._edge_rows = None  # CSR row (sector index) of every edge
+
+        grid = grid_layer
+        self._economy_bits = [
+            [intern_tag(tag) for tag in grid.ECONOMY_TAGS[category]] for category in grid.CATEGORIES
+        ]
+        self._security_bits = [intern_tag(tag) for tag in grid.SECURITY_LEVELS]
+        self._environment_bits = [intern_tag(tag) for tag in grid.ENV_LEVELS]
+        self._infested_bit = intern_tag("HOSTILE_INFESTED")
+        self._threatened_bit = intern_tag("HOSTILE_THREATENED")
+        self._group_mask = (
+            intern_tags(tag for tags in grid.ECONOMY_TAGS.values() for tag in tags)
+            | SECTOR_SECURITY_MASK
+            | SECTOR_ENVIRONMENT_MASK
+            | SECTOR_HOSTILE_MASK
+        )
+        self._colony_economy_masks = [
+            intern_tags({req, req.replace("_ADEQUATE", "_RICH")})
+            for req in constants.COLONY_UPGRADE_REQUIRED_ECONOMY
+        ]
+        self._colony_security_bit = intern_tag(constants.COLONY_UPGRADE_REQUIRED_SECURITY)
+        self._colony_degrade_mask = intern_tags(
+            [constants.COLONY_DOWNGRADE_SECURITY_TRIGGER] + list(constants.COLONY_DOWNGRADE_ECONOMY_TRIGGER)
+        )
+        self._colony_watch_mask = self._colony_security_bit | self._colony_degrade_mask
+        for mask in self._colony_economy_masks:
+            self._colony_watch_mask |= mask
+
+    # =====================================================================
+    # Public API
+    # =====================================================================
+    def step(self, state) -> None:
+        self.apply(state, self.compute(state))
+
+    def compute(self, state) -> dict:
+        """Run one CA step over every sector and return the new values.
+
+        Only lazily-missing economy thresholds are written to *state*
+        (exactly as the list step does); everything else is returned.
+        """
+        grid = self._grid
+        self._ensure_adjacency(state.world_topology)
+        sector_ids = self._sector_ids
+        n = len(sector_ids)
+
+        node_masks = [TagSet.coerce(state.sector_tags.get(node_id, ())).mask for node_id in self._node_ids]
+        node_groups = np.array([mask & self._group_mask for mask in node_masks], dtype=np.uint64)
+        node_security = _decode(node_groups, self._security_bits, default=1)
+        node_nonempty = np.array([mask != 0 for mask in node_masks], dtype=bool)
+        masks = node_masks[:n]
+        groups = node_groups[:n]
+
+        # --- Per-sector inputs ------------------------------------------
+        occupancy = get_occupancy(state)
+        pirate = np.array([occupancy.role_count(s, "pirate") > 0 for s in sector_ids], dtype=bool)
+        military = np.array([occupancy.role_count(s, "military") > 0 for s in sector_ids], dtype=bool)
+        loaded = np.array([occupancy.loaded_count(s) > 0 for s in sector_ids], dtype=bool)
+        crowded = np.array([occupancy.active_count(s, include_player=False) > 3 for s in sector_ids], dtype=bool)
+        colony_names = [state.colony_levels.get(s, "frontier") for s in sector_ids]
+        disabled = np.array(
+            [state.sector_disabled_until.get(s, 0) > state.sim_tick_count for s in sector_ids], dtype=bool
+        )
+        infested = (groups & np.uint64(self._infested_bit)) != 0
+
+        # --- Economy (sectors x categories) -----------------------------
+        economy = np.stack([_decode(groups, bits, default=1) for bits in self._economy_bits], axis=1)
+        economy_up = np.array(
+            [[state.economy_upgrade_progress.get(s, {}).get(c, 0) for c in grid.CATEGORIES] for s in sector_ids],
+            dtype=np.int64,
+        ).reshape(n, len(grid.CATEGORIES))
+        economy_down = np.array(
+            [[state.economy_downgrade_progress.get(s, {}).get(c, 0) for c in grid.CATEGORIES] for s in sector_ids],
+            dtype=np.int64,
+        ).reshape(n, len(grid.CATEGORIES))
+        economy_threshold = np.array(
+            [[grid._economy_threshold(state, s, c) for c in grid.CATEGORIES] for s in sector_ids],
+            dtype=np.int64,
+        ).reshape(n, len(grid.CATEGORIES))
+
+        is_hub = np.array([name == "hub" for name in colony_names], dtype=bool)
+        is_colony = np.array([name == "colony" for name in colony_names], dtype=bool)
+        raw = grid.CATEGORIES.index("RAW")
+        manufactured = grid.CATEGORIES.index("MANUFACTURED")
+
+        delta = (economy == 0).astype(np.int64) - (economy == 2)
+        world_age = state.world_age or "PROSPERITY"
+        if world_age == "PROSPERITY":
+            delta += (loaded | is_hub | is_colony)[:, None]
+        elif world_age == "DISRUPTION":
+            delta[:, raw] -= 1
+            delta[:, manufactured] -= pirate | infested
+        elif world_age == "RECOVERY":
+            delta += 1
+        delta -= is_hub[:, None]
+        delta[:, raw] -= is_colony
+        delta -= crowded[:, None]
+        delta += loaded[:, None]
+        delta -= pirate[:, None]
+        economy, economy_up, economy_down = _gate(
+            economy, delta, economy_up, economy_down, economy_threshold
+        )
+
+        # --- Security ----------------------------------------------------
+        security = node_security[:n]
+        security_up = np.array([state.security_upgrade_progress.get(s, 0) for s in sector_ids], dtype=np.int64)
+        security_down = np.array([state.security_downgrade_progress.get(s, 0) for s in sector_ids], dtype=np.int64)
+        security_threshold = np.array(
+            [state.security_change_threshold.get(s, constants.SECURITY_CHANGE_TICKS_MIN) for s in sector_ids],
+            dtype=np.int64,
+        )
+
+        delta = (security == 0).astype(np.int64) - (security == 2)
+        if state.world_age == "DISRUPTION":
+            delta -= 1
+        elif state.world_age in ("PROSPERITY", "RECOVERY"):
+            delta += 1
+        delta += military
+        delta -= pirate
+        delta -= infested
+
+        valid = node_nonempty[self._indices]
+        neighbor_count = np.bincount(self._edge_rows, weights=valid, minlength=n).astype(np.int64)
+        neighbor_sum = np.bincount(
+            self._edge_rows, weights=node_security[self._indices] * valid, minlength=n
+        ).astype(np.int64)
+        # avg > idx  <=>  sum > idx * count  (exact in integers)
+        has_neighbors = neighbor_count > 0
+        delta += has_neighbors & (neighbor_sum > security * neighbor_count)
+        delta -= has_neighbors & (neighbor_sum < security * neighbor_count)
+        security, security_up, security_down = _gate(
+            security, delta, security_up, security_down, security_threshold
+        )
+
+        # --- Environment -------------------------------------------------
+        environment = _decode(groups, self._environment_bits, default=2)
+        if state.world_age == "DISRUPTION":
+            environment = np.where(
+                environment == 2, 1, np.where((environment == 1) & (pirate | infested), 0, environment)
+            )
+        elif state.world_age == "RECOVERY":
+            environment = np.minimum(2, environment + 1)
+        environment = np.where(disabled, 0, environment)
+
+        # --- Hostile presence --------------------------------------------
+        hostile_progress = np.array(
+            [state.hostile_infestation_progress.get(s, 0) for s in sector_ids], dtype=np.int64
+        )
+        unguarded = (security == 0) & ~military
+        building = unguarded & ~infested
+        clearing = ~unguarded & infested
+        build_progress = np.maximum(0, hostile_progress) + 1
+        clear_progress = np.maximum(0, -hostile_progress) + 1
+        became_infested = build_progress >= constants.HOSTILE_INFESTATION_TICKS_REQUIRED
+        cleared = clear_progress >= 2
+        infested_now = np.where(building, became_infested, np.where(clearing, ~cleared, infested))
+        hostile_progress = np.where(
+            building,
+            np.where(became_infested, 0, build_progress),
+            np.where(clearing, np.where(cleared, 0, -clear_progress), 0),
+        )
+        threatened = ~infested_now & (security == 1)
+
+        # --- Compose new tag masks ---------------------------------------
+        new_bits = np.take(np.array(self._security_bits, dtype=np.uint64), security)
+        new_bits |= np.take(np.array(self._environment_bits, dtype=np.uint64), environment)
+        for column, bits in enumerate(self._economy_bits):
+            new_bits |= np.take(np.array(bits, dtype=np.uint64), economy[:, column])
+        new_bits |= np.where(infested_now, np.uint64(self._infested_bit), np.uint64(0))
+        new_bits |= np.where(threatened, np.uint64(self._threatened_bit), np.uint64(0))
+
+        cleared_groups = ~(
+            prefix_mask("RAW_")
+            | prefix_mask("MANUFACTURED_")
+            | prefix_mask("CURRENCY_")
+            | SECTOR_SECURITY_MASK
+            | SECTOR_ENVIRONMENT_MASK
+            | SECTOR_HOSTILE_MASK
+        )
+        final_masks = [(mask & cleared_groups) | bits for mask, bits in zip(masks, new_bits.tolist())]
+
+        # --- Colony level ------------------------------------------------
+        levels = constants.COLONY_LEVELS
+        watched = np.array([mask & self._colony_watch_mask for mask in final_masks], dtype=np.uint64)
+        economy_ok = np.ones(n, dtype=bool)
+        for required in self._colony_economy_masks:
+            economy_ok &= (watched & np.uint64(required)) != 0
+        growing = economy_ok & ((watched & np.uint64(self._colony_security_bit)) != 0)
+        shrinking = ~growing & ((watched & np.uint64(self._colony_degrade_mask)) != 0)
+
+        colony = np.array([levels.index(name) if name in levels else -1 for name in colony_names], dtype=np.int64)
+        colony_up = np.array([state.colony_upgrade_progress.get(s, 0) for s in sector_ids], dtype=np.int64)
+        colony_down = np.array([state.colony_downgrade_progress.get(s, 0) for s in sector_ids], dtype=np.int64)
+        colony_up = np.where(growing, colony_up + 1, 0)
+        colony_down = np.where(shrinking, colony_down + 1, 0)
+
+        min_level = constants.COLONY_MINIMUM_LEVEL
+        min_idx = levels.index(min_level) if min_level in levels else 0
+        upgrade = (colony_up >= constants.COLONY_UPGRADE_TICKS_REQUIRED) & (colony >= 0) & (colony < len(levels) - 1)
+        downgrade = ~upgrade & (colony_down >= constants.COLONY_DOWNGRADE_TICKS_REQUIRED) & (colony >= 1)
+        new_colony = np.where(upgrade, colony + 1, np.where(downgrade & (colony - 1 >= min_idx), colony - 1, colony))
+        colony_up = np.where(upgrade, 0, colony_up)
+        colony_down = np.where(downgrade, 0, colony_down)
+
+        # --- Back to per-sector Python values ----------------------------
+        economy_up_rows = economy_up.tolist()
+        economy_down_rows = economy_down.tolist()
+        security_names = [grid.SECURITY_LEVELS[idx] for idx in security.tolist()]
+        return {
+            "sector_tags": {s: TagSet.from_mask(mask) for s, mask in zip(sector_ids, final_masks)},
+            "security_tags": dict(zip(sector_ids, security_names)),
+            "economy_upgrade_progress": {
+                s: dict(zip(grid.CATEGORIES, row)) for s, row in zip(sector_ids, economy_up_rows)
+            },
+            "economy_downgrade_progress": {
+                s: dict(zip(grid.CATEGORIES, row)) for s, row in zip(sector_ids, economy_down_rows)
+            },
+            "security_upgrade_progress": dict(zip(sector_ids, security_up.tolist())),
+            "security_downgrade_progress": dict(zip(sector_ids, security_down.tolist())),
+            "hostile_infestation_progress": dict(zip(sector_ids, hostile_progress.tolist())),
+            "colony_levels": {
+                s: (levels[idx] if idx >= 0 else name)
+                for s, idx, name in zip(sector_ids, new_colony.tolist(), colony_names)
+            },
+            "colony_upgrade_progress": dict(zip(sector_ids, colony_up.tolist())),
+            "colony_downgrade_progress": dict(zip(sector_ids, colony_down.tolist())),
+        }
+
+    def apply(self, state, result: dict) -> None:
+        state.sector_tags = result["sector_tags"]
+        for field in _SECTOR_FIELDS:
+            getattr(state, field).update(result[field])
+        for field in _ECONOMY_FIELDS:
+            target = getattr(state, field)
+            for sector_id, values in result[field].items():
+                target.setdefault(sector_id, {}).update(values)
+        for sector_id, security in result["security_tags"].items():
+            state.grid_dominion.setdefault(sector_id, {})["security_tag"] = security
+
+    def mismatches(self, state, result: dict) -> list:
+        """Differences between *result* and the list-based step already applied to *state*."""
+        problems = []
+        if state.sector_tags != result["sector_tags"]:
+            for sector_id in sorted(set(state.sector_tags) | set(result["sector_tags"])):
+                actual = state.sector_tags.get(sector_id)
+                expected = result["sector_tags"].get(sector_id)
+                if actual != expected:
+                    problems.append(f"sector_tags[{sector_id}]: list={actual!r} vector={expected!r}")
+        for field in _SECTOR_FIELDS + _ECONOMY_FIELDS:
+            current = getattr(state, field)
+            for sector_id, value in result[field].items():
+                if current.get(sector_id) != value:
+                    problems.append(f"{field}[{sector_id}]: list={current.get(sector_id)!r} vector={value!r}")
+        for sector_id, security in result["security_tags"].items():
+            actual = state.grid_dominion.get(sector_id, {}).get("security_tag")
+            if actual != security:
+                problems.append(f"grid_dominion[{sector_id}].security_tag: list={actual!r} vector={security!r}")
+        return problems
+
+    # =====================================================================
+    # Adjacency
+    # =====================================================================
+    def _ensure_adjacency(self, topology: dict) -> None:
+        # Exploration only ever appends sectors and connections, so the
+        # sector and edge counts identify the topology.
+        key = (len(topology), sum(len(data.get("connections", [])) for data in topology.values()))
+        if key == self._topology_key:
+            return
+
+        sector_ids = list(topology)
+        node_index = {sector_id: i for i, sector_id in enumerate(sector_ids)}
+        node_ids = list(sector_ids)
+        indptr = [0]
+        indices = []
+        for sector_id in sector_ids:
+            for neighbor_id in topology[sector_id].get("connections", []):
+                j = node_index.get(neighbor_id)
+                if j is None:
+                    j = node_index[neighbor_id] = len(node_ids)
+                    node_ids.append(neighbor_id)
+                indices.append(j)
+            indptr.append(len(indices))
+
+        self._sector_ids = sector_ids
+        self._node_ids = node_ids
+        self._indices = np.array(indices, dtype=np.int64)
+        self._edge_rows = np.repeat(np.arange(len(sector_ids)), np.diff(np.array(indptr, dtype=np.int64)))
+        self._topology_key = key
+
+
+def _decode(groups, bits: list, default: int):
+    """Index of the first of *bits* set in each mask (list lookup order)."""
+    levels = np.full(groups.shape, default, dtype=np.int64)
+    for level in reversed(range(len(bits))):
+        levels = np.where((groups & np.uint64(bits[level])) != 0, level, levels)
+    return levels
+
+
+def _gate(levels, delta, up, down, threshold):
+    """Progress-counter gating shared by the economy and security steps."""
+    rising = delta >= 1
+    falling = delta <= -1
+    up = np.where(rising, up + 1, 0)
+    down = np.where(falling, down + 1, 0)
+    upgrade = (up >= threshold) & (levels < 2)
+    downgrade = ~upgrade & (down >= threshold) & (levels > 0)
+    levels = levels + upgrade - downgrade
+    return levels, np.where(upgrade, 0, up), np.where(downgrade, 0, down)
@@ -10,6 +10,14 @@
 
 import random
 from autoload import constants
+from core.simulation.affinity_matrix import (
+    SECTOR_ENVIRONMENT_MASK,
+    SECTOR_HOSTILE_MASK,
+    SECTOR_SECURITY_MASK,
+)
+from core.simulation.grid_arrays import GridArrayEngine
+from core.simulation.sector_occupancy import get_occupancy, rebuild_occupancy
+from core.simulation.tag_set import TagSet, prefix_mask
 
 
 class GridLayer:
@@ -17,12 +25,35 @@ class GridLayer:
     SECURITY_LEVELS = ["LAWLESS", "CONTESTED", "SECURE"]
     ENV_LEVELS = ["EXTREME", "HARSH", "MILD"]
     CATEGORIES = ["RAW", "MANUFACTURED", "CURRENCY"]
+    ECONOMY_TAGS = {  # category -> one tag per ECONOMY_LEVELS entry
+        "RAW": ("RAW_POOR", "RAW_ADEQUATE", "RAW_RICH"),
+        "MANUFACTURED": ("MANUFACTURED_POOR", "MANUFACTURED_ADEQUATE", "MANUFACTURED_RICH"),
+        "CURRENCY": ("CURRENCY_POOR", "CURRENCY_ADEQUATE", "CURRENCY_RICH"),
+    }
+    MODES = ("list", "vector", "parity")
+
+    def __init__(self, mode: str = "list"):
+        self.mode = "list"
+        self._array_engine = None
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str) -> None:
+        """Select the CA step: per-sector lists, NumPy arrays, or both + compare.
+
+        ``parity`` runs the list step for real and raises RuntimeError on
+        the first tick where the array step disagrees with it.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown grid mode {mode!r}; expected one of {', '.join(self.MODES)}")
+        if mode != "list" and self._array_engine is None:
+            self._array_engine = GridArrayEngine(self)
+        self.mode = mode
 
     def initialize_grid(self, state) -> None:
         state.colony_levels = state.colony_levels or {}
         for sector_id, data in state.world_topology.items():
             if sector_id not in state.sector_tags:
-                state.sector_tags[sector_id] = ["STATION", "CONTESTED", "MILD", "RAW_ADEQUATE", "MANUFACTURED_ADEQUATE", "CURRENCY_ADEQUATE"]
+                state.sector_tags[sector_id] = TagSet(["STATION", "CONTESTED", "MILD", "RAW_ADEQUATE", "MANUFACTURED_ADEQUATE", "CURRENCY_ADEQUATE"])
             if sector_id not in state.colony_levels:
                 state.colony_levels[sector_id] = data.get("sector_type", "frontier")
             if sector_id not in state.grid_dominion:
@@ -59,30 +90,45 @@ class GridLayer:
                 state.hostile_infestation_progress[sector_id] = 0
 
     def process_tick(self, state, config: dict) -> None:
+        # Resync once per tick; every per-sector agent query below is O(1).
+        rebuild_occupancy(state)
+        if self.mode == "vector":
+            self._array_engine.step(state)
+            return
+
+        expected = self._array_engine.compute(state) if self.mode == "parity" else None
+        self._step_sectors(state)
+        if expected is not None:
+            mismatches = self._array_engine.mismatches(state, expected)
+            if mismatches:
+                raise RuntimeError(
+                    f"Grid parity mismatch at tick {state.sim_tick_count}: " + "; ".join(mismatches[:5])
+                )
+
+    def _step_sectors(self, state) -> None:
         new_tags = {}
         for sector_id in state.world_topology:
-            current = list(state.sector_tags.get(sector_id, []))
+            current = TagSet.coerce(state.sector_tags.get(sector_id, ()))
             neighbors = state.world_topology.get(sector_id, {}).get("connections", [])
-            neighbor_tags = [state.sector_tags.get(n, []) for n in neighbors]
+            neighbor_tags = [TagSet.coerce(state.sector_tags.get(n, ())) for n in neighbors]
 
             tags = self._step_economy(current, neighbor_tags, state, sector_id)
             tags = self._step_security(tags, neighbor_tags, state, sector_id)
             tags = self._step_environment(tags, state, sector_id)
             tags = self._step_hostile_presence(tags, state, sector_id)
             tags = self._step_colony_level(tags, state, sector_id)
-            new_tags[sector_id] = self._unique(tags)
+            new_tags[sector_id] = tags
 
         state.sector_tags = new_tags
         for sector_id, tags in state.sector_tags.items():
             state.grid_dominion.setdefault(sector_id, {})["security_tag"] = self._security_tag(tags)
 
-    def _step_economy(self, tags: list, neighbor_tags: list, state, sector_id: str) -> list:
-        result = list(tags)
+    def _step_economy(self, tags: TagSet, neighbor_tags: list, state, sector_id: str) -> TagSet:
+        result = tags
         world_age = state.world_age or "PROSPERITY"
         role_counts = self._role_counts_for_sector(state, sector_id)
         sector_upgrade_progress = state.economy_upgrade_progress.setdefault(sector_id, {})
         sector_downgrade_progress = state.economy_downgrade_progress.setdefault(sector_id, {})
-        sector_thresholds = state.economy_change_threshold.setdefault(sector_id, {})
         loaded_trade = self._loaded_trade_count_for_sector(state, sector_id)
         colony_level = state.colony_levels.get(sector_id, "frontier")
         has_active_commerce = loaded_trade > 0 or colony_level in ("colony", "hub")
@@ -92,14 +138,7 @@ class GridLayer:
             level = self._economy_level(result, category)
             idx = self.ECONOMY_LEVELS.index(level)
             delta = 0
-            threshold = sector_thresholds.get(category)
-            if threshold is None:
-                thresh_rng = random.Random(f"{state.world_seed}:econ_thresh:{sector_id}:{category}")
-                threshold = thresh_rng.randint(
-                    constants.ECONOMY_CHANGE_TICKS_MIN,
-                    constants.ECONOMY_CHANGE_TICKS_MAX,
-                )
-                sector_thresholds[category] = threshold
+            threshold = self._economy_threshold(state, sector_id, category)
 
             # Homeostatic pressure (corruption / recovery)
             if level == "RICH":
@@ -157,12 +196,12 @@ class GridLayer:
 
             sector_upgrade_progress[category] = up_progress
             sector_downgrade_progress[category] = down_progress
-            result = self._replace_prefix(result, f"{category}_", f"{category}_{self.ECONOMY_LEVELS[idx]}")
+            result = self._replace_prefix(result, f"{category}_", self.ECONOMY_TAGS[category][idx])
 
         return result
 
-    def _step_security(self, tags: list, neighbor_tags: list, state, sector_id: str) -> list:
-        result = list(tags)
+    def _step_security(self, tags: TagSet, neighbor_tags: list, state, sector_id: str) -> TagSet:
+        result = tags
         security = self._security_tag(result)
         idx = self.SECURITY_LEVELS.index(security)
         role_counts = self._role_counts_for_sector(state, sector_id)
@@ -225,11 +264,11 @@ class GridLayer:
         state.security_upgrade_progress[sector_id] = up_progress
         state.security_downgrade_progress[sector_id] = down_progress
 
-        result = self._replace_one_of(result, {"SECURE", "CONTESTED", "LAWLESS"}, self.SECURITY_LEVELS[idx])
+        result = self._replace_one_of(result, SECTOR_SECURITY_MASK, self.SECURITY_LEVELS[idx])
         return result
 
-    def _step_environment(self, tags: list, state, sector_id: str) -> list:
-        result = list(tags)
+    def _step_environment(self, tags: TagSet, state, sector_id: str) -> TagSet:
+        result = tags
         idx = self.ENV_LEVELS.index(self._environment_tag(result))
 
         if state.world_age == "DISRUPTION":
@@ -245,11 +284,11 @@ class GridLayer:
         if self._sector_recently_disabled(state, sector_id):
             idx = 0
 
-        result = self._replace_one_of(result, {"MILD", "HARSH", "EXTREME"}, self.ENV_LEVELS[idx])
+        result = self._replace_one_of(result, SECTOR_ENVIRONMENT_MASK, self.ENV_LEVELS[idx])
         return result
 
-    def _step_hostile_presence(self, tags: list, state, sector_id: str) -> list:
-        result = [tag for tag in tags if tag not in {"HOSTILE_INFESTED", "HOSTILE_THREATENED"}]
+    def _step_hostile_presence(self, tags: TagSet, state, sector_id: str) -> TagSet:
+        result = TagSet.from_mask(tags.mask & ~SECTOR_HOSTILE_MASK)
         role_counts = self._role_counts_for_sector(state, sector_id)
         security = self._security_tag(tags)
         had_infested = "HOSTILE_INFESTED" in tags
@@ -277,12 +316,12 @@ class GridLayer:
         state.hostile_infestation_progress[sector_id] = progress
 
         if infested_now:
-            result.append("HOSTILE_INFESTED")
+            result = result.with_tag("HOSTILE_INFESTED")
         elif security == "CONTESTED":
-            result.append("HOSTILE_THREATENED")
+            result = result.with_tag("HOSTILE_THREATENED")
         return result
 
-    def _step_colony_level(self, tags: list, state, sector_id: str) -> list:
+    def _step_colony_level(self, tags: TagSet, state, sector_id: str) -> TagSet:
         level = state.colony_levels.get(sector_id, "frontier")
         levels = constants.COLONY_LEVELS
         up_progress = state.colony_upgrade_progress.get(sector_id, 0)
@@ -322,43 +361,31 @@ class GridLayer:
         state.colony_downgrade_progress[sector_id] = down_progress
         return tags
 
+    def _economy_threshold(self, state, sector_id: str, category: str) -> int:
+        sector_thresholds = state.economy_change_threshold.setdefault(sector_id, {})
+        threshold = sector_thresholds.get(category)
+        if threshold is None:
+            thresh_rng = random.Random(f"{state.world_seed}:econ_thresh:{sector_id}:{category}")
+            threshold = thresh_rng.randint(
+                constants.ECONOMY_CHANGE_TICKS_MIN,
+                constants.ECONOMY_CHANGE_TICKS_MAX,
+            )
+            sector_thresholds[category] = threshold
+        return threshold
+
     def _loaded_trade_count_for_sector(self, state, sector_id: str) -> int:
         """Count any agent carrying cargo in this sector (not just traders/haulers)."""
-        count = 0
-        for agent in state.agents.values():
-            if agent.get("is_disabled"):
-                continue
-            if agent.get("current_sector_id") != sector_id:
-                continue
-            if agent.get("cargo_tag") == "LOADED":
-                count += 1
-        return count
+        return get_occupancy(state).loaded_count(sector_id)
 
     def _role_counts_for_sector(self, state, sector_id: str) -> dict:
-        counts = {}
-        for agent in state.agents.values():
-            if agent.get("is_disabled"):
-                continue
-            if agent.get("current_sector_id") != sector_id:
-                continue
-            role = agent.get("agent_role", "idle")
-            counts[role] = counts.get(role, 0) + 1
-        return counts
+        return get_occupancy(state).role_counts(sector_id)
 
     def _active_agent_count_in_sector(self, state, sector_id: str) -> int:
-        count = 0
-        for agent_id, agent in state.agents.items():
-            if agent_id == "player":
-                continue
-            if agent.get("is_disabled"):
-                continue
-            if agent.get("current_sector_id") == sector_id:
-                count += 1
-        return count
-
-    def _economy_level(self, tags: list, category: str) -> str:
-        for level in self.ECONOMY_LEVELS:
-            if f"{category}_{level}" in tags:
+        return get_occupancy(state).active_count(sector_id, include_player=False)
+
+    def _economy_level(self, tags: TagSet, category: str) -> str:
+        for level, tag in zip(self.ECONOMY_LEVELS, self.ECONOMY_TAGS[category]):
+            if tag in tags:
                 return level
         return "ADEQUATE"
 
@@ -374,25 +401,13 @@ class GridLayer:
                 return tag
         return "MILD"
 
-    def _replace_prefix(self, tags: list, prefix: str, replacement: str) -> list:
-        base = [tag for tag in tags if not tag.startswith(prefix)]
-        base.append(replacement)
-        return base
+    def _replace_prefix(self, tags: TagSet, prefix: str, replacement: str) -> TagSet:
+        return TagSet.coerce(tags).replace_group(prefix_mask(prefix), replacement)
 
-    def _replace_one_of(self, tags: list, options: set, replacement: str) -> list:
-        base = [tag for tag in tags if tag not in options]
-        base.append(replacement)
-        return base
+    def _replace_one_of(self, tags: TagSet, group_mask: int, replacement: str) -> TagSet:
+        return TagSet.coerce(tags).replace_group(group_mask, replacement)
 
     def _sector_recently_disabled(self, state, sector_id: str) -> bool:
         until = state.sector_disabled_until.get(sector_id, 0)
         return until > state.sim_tick_count
 
-    def _unique(self, tags: list) -> list:
-        seen = set()
-        out = []
-        for tag in tags:
-            if tag not in seen:
-                seen.add(tag)
-                out.append(tag)
-        return out
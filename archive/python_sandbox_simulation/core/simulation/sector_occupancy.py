@@ -0,0 +1,126 @@
+#
+# PROJECT: GDTLancer
+# MODULE: sector_occupancy.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1, §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Per-sector agent occupancy index shared by GridLayer and AgentLayer."""
+
+
+class SectorOccupancy:
+    """Sector -> active agents, role counts and loaded-cargo counts.
+
+    GridLayer resyncs the index once per tick with ``rebuild`` (a single
+    O(agents) pass); AgentLayer then keeps it current with ``sync_agent`` and
+    ``discard_agent`` as agents move, spawn, die or get disabled.  Every
+    per-sector query is O(1) except ``agent_ids``, which is O(k log k) in the
+    number of agents present.
+    """
+
+    def __init__(self):
+        self._members = {}       # sector_id -> set of active agent ids
+        self._role_counts = {}   # sector_id -> {role -> count}
+        self._loaded = {}        # sector_id -> count of LOADED agents
+        self._entries = {}       # agent_id -> (sector_id, role, loaded)
+        self._order = {}         # agent_id -> insertion ordinal (mirrors state.agents order)
+        self._next_order = 0
+
+    def rebuild(self, agents: dict) -> None:
+        self.__init__()
+        for agent_id, agent in agents.items():
+            self.sync_agent(agent_id, agent)
+
+    def sync_agent(self, agent_id: str, agent: dict) -> None:
+        """Re-record one agent after its sector, status or cargo changed."""
+        if agent_id not in self._order:
+            self._order[agent_id] = self._next_order
+            self._next_order += 1
+
+        entry = None
+        if not agent.get("is_disabled"):
+            entry = (
+                agent.get("current_sector_id"),
+                agent.get("agent_role", "idle"),
+                agent.get("cargo_tag") == "LOADED",
+            )
+        previous = self._entries.get(agent_id)
+        if entry == previous:
+            return
+        if previous is not None:
+            self._unrecord(agent_id, previous)
+        if entry is not None:
+            self._record(agent_id, entry)
+
+    def discard_agent(self, agent_id: str) -> None:
+        """Forget an agent that was removed from ``state.agents``."""
+        previous = self._entries.get(agent_id)
+        if previous is not None:
+            self._unrecord(agent_id, previous)
+        self._order.pop(agent_id, None)
+
+    def agent_ids(self, sector_id: str) -> list:
+        """Active agent ids in *sector_id*, in ``state.agents`` order."""
+        members = self._members.get(sector_id)
+        if not members:
+            return []
+        return sorted(members, key=self._order.__getitem__)
+
+    def role_counts(self, sector_id: str) -> dict:
+        return dict(self._role_counts.get(sector_id, {}))
+
+    def role_count(self, sector_id: str, role: str) -> int:
+        return self._role_counts.get(sector_id, {}).get(role, 0)
+
+    def loaded_count(self, sector_id: str) -> int:
+        return self._loaded.get(sector_id, 0)
+
+    def active_count(self, sector_id: str, include_player: bool = True) -> int:
+        members = self._members.get(sector_id)
+        if not members:
+            return 0
+        count = len(members)
+        if not include_player and "player" in members:
+            count -= 1
+        return count
+
+    def _record(self, agent_id: str, entry: tuple) -> None:
+        sector_id, role, loaded = entry
+        self._members.setdefault(sector_id, set()).add(agent_id)
+        roles = self._role_counts.setdefault(sector_id, {})
+        roles[role] = roles.get(role, 0) + 1
+        if loaded:
+            self._loaded[sector_id] = self._loaded.get(sector_id, 0) + 1
+        self._entries[agent_id] = entry
+
+    def _unrecord(self, agent_id: str, entry: tuple) -> None:
+        sector_id, role, loaded = entry
+        self._members[sector_id].discard(agent_id)
+        roles = self._role_counts[sector_id]
+        roles[role] -= 1
+        if roles[role] == 0:
+            del roles[role]
+        if loaded:
+            self._loaded[sector_id] -= 1
+        del self._entries[agent_id]
+
+
+def get_occupancy(state) -> SectorOccupancy:
+    """Return the state's occupancy index, building it on first use."""
+    occupancy = getattr(state, "sector_occupancy", None)
+    if occupancy is None:
+        occupancy = SectorOccupancy()
+        occupancy.rebuild(state.agents)
+        state.sector_occupancy = occupancy
+    return occupancy
+
+
+def rebuild_occupancy(state) -> SectorOccupancy:
+    """Resync the state's occupancy index from ``state.agents``."""
+    occupancy = getattr(state, "sector_occupancy", None)
+    if occupancy is None:
+        occupancy = SectorOccupancy()
+        state.sector_occupancy = occupancy
+    occupancy.rebuild(state.agents)
+    return occupancy
@@ -8,16 +8,23 @@
 
 """Qualitative simulation tick orchestrator."""
 
+import pickle
+import zlib
+
 from autoload.game_state import GameState
 from autoload import constants
 from core.simulation.agent_layer import AgentLayer
 from core.simulation.bridge_systems import BridgeSystems
 from core.simulation.chronicle_layer import ChronicleLayer
 from core.simulation.grid_layer import GridLayer
+from core.simulation.tick_profiler import NULL_PROFILER, TickProfiler
 from core.simulation.world_layer import WorldLayer
 
 
 class SimulationEngine:
+    SNAPSHOT_MAGIC = b"GDTSIM"
+    SNAPSHOT_VERSION = 1
+
     def __init__(self):
         self.state = GameState()
         self.world_layer = WorldLayer()
@@ -29,6 +36,7 @@ class SimulationEngine:
         self._initialized = False
         self._tick_config = {}
         self._build_tick_config()
+        self.profiler = None
 
     def initialize_simulation(self, seed_string: str) -> None:
         self.world_layer.initialize_world(self.state, seed_string)
@@ -48,6 +56,9 @@ class SimulationEngine:
             raise RuntimeError("SimulationEngine is not initialized")
 
         self.state.sim_tick_count += 1
+        if self.profiler is not None:
+            self._process_tick_profiled()
+            return
         self._advance_world_age()
 
         self.grid_layer.process_tick(self.state, self._tick_config)
@@ -55,6 +66,51 @@ class SimulationEngine:
         self.agent_layer.process_tick(self.state, self._tick_config)
         self.chronicle_layer.process_tick(self.state)
 
+    def _process_tick_profiled(self) -> None:
+        profiler = self.profiler
+        with profiler.section("tick"):
+            with profiler.section("world_age"):
+                self._advance_world_age()
+            with profiler.section("grid"):
+                self.grid_layer.process_tick(self.state, self._tick_config)
+            with profiler.section("bridge"):
+                self.bridge_systems.process_tick(self.state, self._tick_config)
+            with profiler.section("agent"):
+                self.agent_layer.process_tick(self.state, self._tick_config)
+            with profiler.section("chronicle"):
+                self.chronicle_layer.process_tick(self.state)
+        profiler.end_tick()
+
+    def enable_profiling(self, profiler: TickProfiler = None) -> TickProfiler:
+        """Start recording per-layer (and per-action) timings each tick."""
+        self.profiler = profiler if profiler is not None else TickProfiler()
+        self.agent_layer.set_profiler(self.profiler)
+        return self.profiler
+
+    def disable_profiling(self) -> None:
+        self.profiler = None
+        self.agent_layer.set_profiler(NULL_PROFILER)
+
+    def iter_ticks(self, ticks: int):
+        """Process *ticks* ticks, yielding ``(tick, events)`` after each one.
+
+        ``events`` holds exactly the chronicle events flushed during that tick.
+        """
+        pending = []
+
+        def collect(tick, events):
+            pending.extend(events)
+
+        self.chronicle_layer.subscribe(collect)
+        try:
+            for _ in range(max(0, ticks)):
+                self.process_tick()
+                events = list(pending)
+                pending.clear()
+                yield self.state.sim_tick_count, events
+        finally:
+            self.chronicle_layer.unsubscribe(collect)
+
     def advance_sub_ticks(self, cost: int) -> int:
         """Advance the simulation by *cost* sub-ticks.
 
@@ -122,6 +178,65 @@ class SimulationEngine:
             "mortal_spawn_blocked_sector_tags": list(constants.MORTAL_SPAWN_BLOCKED_SECTOR_TAGS),
         }
 
+    # =====================================================================
+    # Snapshot / restore / fork
+    # =====================================================================
+    def snapshot(self) -> bytes:
+        """Serialize GameState, the chronicle staging buffer and tick config.
+
+        The blob is a zlib-compressed pickle; only restore blobs this
+        sandbox produced.  Per-tick RNGs are derived from the world seed and
+        tick count, so a restored engine continues exactly like the original.
+        """
+        state_fields = dict(vars(self.state))
+        state_fields["sector_occupancy"] = None   # derived indexes, rebuilt on demand
+        state_fields["graph_distance"] = None
+        payload = {
+            "state": state_fields,
+            "staging_buffer": list(self.chronicle_layer._staging_buffer),
+            "tick_config": dict(self._tick_config),
+            "initialized": self._initialized,
+        }
+        body = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        return self.SNAPSHOT_MAGIC + bytes([self.SNAPSHOT_VERSION]) + body
+
+    def restore(self, blob: bytes) -> None:
+        """Replace this engine's state with the contents of a snapshot blob."""
+        header_len = len(self.SNAPSHOT_MAGIC) + 1
+        if blob[: len(self.SNAPSHOT_MAGIC)] != self.SNAPSHOT_MAGIC:
+            raise ValueError("Not a SimulationEngine snapshot")
+        if blob[len(self.SNAPSHOT_MAGIC)] != self.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {blob[len(self.SNAPSHOT_MAGIC)]}")
+        payload = pickle.loads(zlib.decompress(blob[header_len:]))
+
+        self.state = GameState()
+        self.state.__dict__.update(payload["state"])
+        self.chronicle_layer._staging_buffer = list(payload["staging_buffer"])
+        self._tick_config = dict(payload["tick_config"])
+        self._initialized = payload["initialized"]
+        self.agent_layer.set_chronicle(self.chronicle_layer)
+        self.bridge_systems.invalidate()
+
+    @classmethod
+    def from_snapshot(cls, blob: bytes) -> "SimulationEngine":
+        engine = cls()
+        engine.restore(blob)
+        return engine
+
+    def fork(self, config_overrides: list, blob: bytes = None) -> list:
+        """Branch one engine per override dict from *blob* (default: now).
+
+        Each override dict is applied through ``set_config``.
+        """
+        blob = blob if blob is not None else self.snapshot()
+        engines = []
+        for overrides in config_overrides:
+            engine = SimulationEngine.from_snapshot(blob)
+            for key, value in (overrides or {}).items():
+                engine.set_config(key, value)
+            engines.append(engine)
+        return engines
+
     def get_chronicle(self) -> ChronicleLayer:
         return self.chronicle_layer
 
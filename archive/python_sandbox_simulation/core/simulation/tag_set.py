@@ -0,0 +1,155 @@
+#
+# PROJECT: GDTLancer
+# MODULE: tag_set.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1, §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Compact qualitative tag set backed by an interned integer bitmask."""
+
+
+# -------------------------------------------------------------------------
+# Interning registry (tag name <-> bit position)
+# -------------------------------------------------------------------------
+_TAG_BITS = {}
+_BIT_TAGS = []
+_PREFIX_MASKS = {}
+
+
+def intern_tag(tag: str) -> int:
+    """Return the bit for *tag*, assigning the next free bit on first sight."""
+    bit = _TAG_BITS.get(tag)
+    if bit is None:
+        bit = 1 << len(_BIT_TAGS)
+        _TAG_BITS[tag] = bit
+        _BIT_TAGS.append(tag)
+        _PREFIX_MASKS.clear()
+    return bit
+
+
+def intern_tags(tags) -> int:
+    """Intern every tag in *tags* and return their combined mask."""
+    mask = 0
+    for tag in tags:
+        mask |= intern_tag(tag)
+    return mask
+
+
+def tag_id(tag: str) -> int:
+    """Dense integer id (bit position) of *tag*, interning it if new."""
+    return intern_tag(tag).bit_length() - 1
+
+
+def vocabulary_size() -> int:
+    return len(_BIT_TAGS)
+
+
+def prefix_mask(prefix: str) -> int:
+    """Mask of every interned tag starting with *prefix*."""
+    mask = _PREFIX_MASKS.get(prefix)
+    if mask is None:
+        mask = 0
+        for tag, bit in _TAG_BITS.items():
+            if tag.startswith(prefix):
+                mask |= bit
+        _PREFIX_MASKS[prefix] = mask
+    return mask
+
+
+# -------------------------------------------------------------------------
+# TagSet
+# -------------------------------------------------------------------------
+class TagSet(tuple):
+    """Immutable set of tags with O(1) membership and group replacement.
+
+    A TagSet *is* a tuple of its tag names in interning order, so code
+    written against plain tag lists and ``json.dumps`` of the state keep
+    working; ``mask`` carries the same set as an integer bitmask. Instances
+    are shared per mask, since a mask always names the same tags.
+    """
+
+    _instances = {}
+
+    def __new__(cls, tags=()):
+        return cls.from_mask(intern_tags(tags))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "TagSet":
+        tag_set = cls._instances.get(mask)
+        if tag_set is None:
+            tags = []
+            rest = mask
+            while rest:
+                low = rest & -rest
+                tags.append(_BIT_TAGS[low.bit_length() - 1])
+                rest ^= low
+            tag_set = tuple.__new__(cls, tags)
+            tag_set.mask = mask
+            cls._instances[mask] = tag_set
+        return tag_set
+
+    @classmethod
+    def coerce(cls, tags) -> "TagSet":
+        """Return *tags* unchanged if already a TagSet, else wrap it."""
+        if isinstance(tags, TagSet):
+            return tags
+        return cls(tags)
+
+    # --- Queries ---------------------------------------------------------
+    def has_any(self, mask: int) -> bool:
+        return bool(self.mask & mask)
+
+    def first_of(self, ordered_tags, default: str = "") -> str:
+        """Return the first of *ordered_tags* present, else *default*."""
+        for tag in ordered_tags:
+            bit = _TAG_BITS.get(tag)
+            if bit is not None and self.mask & bit:
+                return tag
+        return default
+
+    # --- Derivations (each is a single mask operation) -------------------
+    def with_tag(self, tag: str) -> "TagSet":
+        return TagSet.from_mask(self.mask | intern_tag(tag))
+
+    def without(self, *tags) -> "TagSet":
+        return TagSet.from_mask(self.mask & ~intern_tags(tags))
+
+    def replace_group(self, group_mask: int, tag: str) -> "TagSet":
+        """Drop every tag in *group_mask* and add *tag* (mutually exclusive groups)."""
+        return TagSet.from_mask((self.mask & ~group_mask) | intern_tag(tag))
+
+    def to_list(self) -> list:
+        return list(self)
+
+    # --- Set semantics over the tuple ------------------------------------
+    def __contains__(self, tag) -> bool:
+        bit = _TAG_BITS.get(tag)
+        return bit is not None and bool(self.mask & bit)
+
+    def __add__(self, other) -> "TagSet":
+        return TagSet.from_mask(self.mask | TagSet.coerce(other).mask)
+
+    __radd__ = __add__
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TagSet):
+            return self.mask == other.mask
+        if isinstance(other, (list, tuple, set, frozenset)):
+            return self.mask == intern_tags(other)
+        return NotImplemented
+
+    def __ne__(self, other) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __reduce__(self):
+        # Bits for tags interned at runtime differ between processes, so
+        # pickle by name rather than by mask.
+        return (TagSet, (self.to_list(),))
+
+    def __repr__(self) -> str:
+        return f"TagSet({self.to_list()!r})"
@@ -0,0 +1,142 @@
+#
+# PROJECT: GDTLancer
+# MODULE: tick_profiler.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6
+# LOG_REF: 2026-10-17
+#
+
+"""Opt-in per-layer tick profiler (wall time + net allocated blocks)."""
+
+import contextlib
+import math
+import sys
+import time
+
+
+class TickProfiler:
+    """Accumulates section timings per tick and summarises them per run.
+
+    Sections may nest (e.g. ``agent.exploration`` inside
+    ``agent.action.affinity_scan``); each is reported independently.
+    Samples are per-tick totals, so memory grows with ticks x sections, not
+    with the number of calls.  Allocation counts are the net change in
+    ``sys.getallocatedblocks()`` across a section.
+    """
+
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        self.ticks = 0
+        self._times = {}      # section -> [seconds per tick]
+        self._blocks = {}     # section -> [net blocks per tick]
+        self._calls = {}      # section -> total calls
+        self._tick_time = {}
+        self._tick_blocks = {}
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        blocks_before = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._tick_time[name] = self._tick_time.get(name, 0.0) + elapsed
+            self._tick_blocks[name] = self._tick_blocks.get(name, 0) + sys.getallocatedblocks() - blocks_before
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    def end_tick(self) -> None:
+        """Commit this tick's accumulated totals as one sample per section."""
+        self.ticks += 1
+        for name, elapsed in self._tick_time.items():
+            self._times.setdefault(name, []).append(elapsed)
+            self._blocks.setdefault(name, []).append(self._tick_blocks[name])
+        self._tick_time.clear()
+        self._tick_blocks.clear()
+
+    def reset(self) -> None:
+        self.__init__()
+
+    # --- Results -----------------------------------------------------------
+    def summary(self) -> dict:
+        """Per-section totals, per-tick percentiles (ms) and mean net blocks."""
+        result = {}
+        for name in sorted(self._times):
+            samples = sorted(self._times[name])
+            blocks = self._blocks[name]
+            entry = {
+                "calls": self._calls.get(name, 0),
+                "ticks": len(samples),
+                "total_s": round(sum(samples), 6),
+                "mean_ms": round(1000 * sum(samples) / len(samples), 4),
+                "max_ms": round(1000 * samples[-1], 4),
+                "mean_net_blocks": round(sum(blocks) / len(blocks), 2),
+            }
+            for pct in self.PERCENTILES:
+                entry[f"p{pct}_ms"] = round(1000 * _percentile(samples, pct), 4)
+            result[name] = entry
+        return result
+
+    def histogram(self, name: str, buckets: int = 8) -> list:
+        """Log-scaled histogram of per-tick times: [(upper_ms, count), ...]."""
+        samples = self._times.get(name, [])
+        if not samples:
+            return []
+        low = max(min(samples), 1e-7)
+        high = max(max(samples), low * 1.0001)
+        ratio = (high / low) ** (1.0 / buckets)
+        edges = [low * ratio ** (i + 1) for i in range(buckets)]
+        counts = [0] * buckets
+        for value in samples:
+            index = 0 if value <= low else min(buckets - 1, int(math.log(value / low) / math.log(ratio)))
+            counts[index] += 1
+        return [(round(1000 * edge, 4), count) for edge, count in zip(edges, counts)]
+
+    def report_lines(self, histograms: bool = True) -> list:
+        summary = self.summary()
+        lines = ["=" * 96, f"TICK PROFILE ({self.ticks} ticks)", "=" * 96]
+        lines.append(
+            f"{'section':<32} {'calls':>8} {'total s':>9} {'mean ms':>9} "
+            f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'blocks':>8}"
+        )
+        for name, entry in summary.items():
+            lines.append(
+                f"{name:<32} {entry['calls']:>8} {entry['total_s']:>9.3f} {entry['mean_ms']:>9.3f} "
+                f"{entry['p50_ms']:>8.3f} {entry['p90_ms']:>8.3f} {entry['p99_ms']:>8.3f} "
+                f"{entry['max_ms']:>8.3f} {entry['mean_net_blocks']:>8.1f}"
+            )
+        if histograms:
+            for name in summary:
+                if "." in name:
+                    continue
+                lines.append(f"\n--- {name}: per-tick ms histogram ---")
+                counts = self.histogram(name)
+                peak = max(count for _, count in counts) or 1
+                for upper, count in counts:
+                    lines.append(f"  <= {upper:>9.3f} | {'#' * max(1 if count else 0, 40 * count // peak):<40} {count}")
+        return lines
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; every section is a no-op."""
+
+    _NULL = contextlib.nullcontext()
+
+    def section(self, name: str):
+        return self._NULL
+
+    def end_tick(self) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def _percentile(sorted_samples: list, pct: float) -> float:
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    rank = (len(sorted_samples) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (rank - lower)
@@ -9,6 +9,8 @@
 """World layer: initialize topology and initial sector tags from templates."""
 
 from autoload.game_state import GameState
+from core.simulation.graph_distance import invalidate_graph_distance
+from core.simulation.tag_set import TagSet
 from database.registry.template_data import LOCATIONS
 
 
@@ -30,7 +32,8 @@ class WorldLayer:
             state.world_hazards[location_id] = {
                 "environment": self._derive_environment(location.get("initial_sector_tags", []))
             }
-            state.sector_tags[location_id] = list(location.get("initial_sector_tags", []))
+            state.sector_tags[location_id] = TagSet(location.get("initial_sector_tags", []))
+        invalidate_graph_distance(state)
 
     def get_neighbors(self, state: GameState, sector_id: str) -> list:
         return list(state.world_topology.get(sector_id, {}).get("connections", []))
@@ -24,8 +24,7 @@ prev_age = engine.state.world_age
 phase_economy_samples = collections.defaultdict(lambda: collections.Counter())
 phase_security_samples = collections.defaultdict(lambda: collections.Counter())
 
-for tick in range(1, 1801):  # 2 full cycles
-    engine.process_tick()
+for tick, events in engine.iter_ticks(1800):  # 2 full cycles
     
     # Track world age transitions
     if engine.state.world_age != prev_age:
@@ -33,15 +32,14 @@ for tick in range(1, 1801):  # 2 full cycles
         prev_age = engine.state.world_age
     
     # Track actions from events
-    for ev in engine.state.chronicle_events:
-        if ev.get("tick") == tick:
-            action_counts[ev["action"]] += 1
-            if ev["action"] == "spawn":
-                mortal_spawns += 1
-            if ev["action"] == "attack":
-                attacks += 1
-            if ev["action"] == "agent_trade":
-                trades += 1
+    for ev in events:
+        action_counts[ev["action"]] += 1
+        if ev["action"] == "spawn":
+            mortal_spawns += 1
+        if ev["action"] == "attack":
+            attacks += 1
+        if ev["action"] == "agent_trade":
+            trades += 1
     
     # Sector state every 10 ticks
     if tick % 10 == 0:
@@ -16,6 +16,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from core.simulation.chronicle_layer import EventLogSink
 from core.simulation.simulation_engine import SimulationEngine
 
 
@@ -30,6 +31,10 @@ def _parse_args():
     parser.add_argument("--viz-interval", type=int, default=10, help="Ticks between viz samples")
     parser.add_argument("--chronicle", action="store_true", help="Narrative chronicle report mode")
     parser.add_argument("--epoch-size", type=int, default=100, help="Ticks per chronicle epoch (default 100)")
+    parser.add_argument("--event-log", type=str, default="", help="Append every chronicle event to this JSONL file (.gz to compress)")
+    parser.add_argument("--profile", action="store_true", help="Print per-layer / per-action tick timings after the run")
+    parser.add_argument("--grid-mode", choices=["list", "vector", "parity"], default="list",
+                        help="GridLayer CA step: per-sector lists, NumPy arrays, or both with a parity check")
     return parser.parse_args()
 
 
@@ -531,18 +536,10 @@ def _run_chronicle(engine, args):
     print("=" * 64)
     print()
 
-    seen_event_ids = set()
-    for tick_num in range(total_ticks):
-        engine.process_tick()
-        # Collect only new, unseen events (dedup by object identity)
-        for e in engine.state.chronicle_events:
-            eid = id(e)
-            if eid not in seen_event_ids:
-                seen_event_ids.add(eid)
-                all_events.append(e)
+    for tick_num, (current_tick, events) in enumerate(engine.iter_ticks(total_ticks)):
+        all_events.extend(events)
 
         # End of epoch?
-        current_tick = engine.state.sim_tick_count
         if current_tick % epoch_size == 0 or tick_num == total_ticks - 1:
             epoch_end = current_tick
             epoch_num += 1
@@ -793,12 +790,8 @@ def _run_viz(engine, args):
     print(_viz_legend())
 
     pending_events = []
-    for tick_num in range(max(0, args.ticks)):
-        engine.process_tick()
-        pending_events.extend(
-            e for e in engine.state.chronicle_events
-            if e.get("tick") == engine.state.sim_tick_count
-        )
+    for tick_num, (_, events) in enumerate(engine.iter_ticks(args.ticks)):
+        pending_events.extend(events)
 
         if engine.state.sim_tick_count % args.viz_interval == 0 or tick_num == args.ticks - 1:
             print(_viz_render_frame(engine.state.sim_tick_count, engine.state, pending_events))
@@ -806,20 +799,7 @@ def _run_viz(engine, args):
             pending_events.clear()
 
 
-def main():
-    args = _parse_args()
-
-    engine = SimulationEngine()
-    engine.initialize_simulation(args.seed)
-
-    if args.viz:
-        _run_viz(engine, args)
-        return
-
-    if args.chronicle:
-        _run_chronicle(engine, args)
-        return
-
+def _run_report(engine, args):
     transient_history = []
     for _ in range(max(0, args.ticks)):
         engine.process_tick()
@@ -834,5 +814,34 @@ def main():
     print(report)
 
 
+def main():
+    args = _parse_args()
+
+    engine = SimulationEngine()
+    engine.grid_layer.set_mode(args.grid_mode)
+    engine.initialize_simulation(args.seed)
+
+    if args.profile:
+        engine.enable_profiling()
+
+    event_log = None
+    if args.event_log:
+        event_log = engine.get_chronicle().subscribe(EventLogSink(args.event_log))
+
+    try:
+        if args.viz:
+            _run_viz(engine, args)
+        elif args.chronicle:
+            _run_chronicle(engine, args)
+        else:
+            _run_report(engine, args)
+    finally:
+        if event_log is not None:
+            event_log.close()
+
+    if args.profile:
+        print("\n".join(engine.profiler.report_lines()))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,65 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_affinity_kernel.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6 + TACTICAL_TODO.md TASK_6
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for the compiled affinity kernel and batch scoring.
+
+Run:
+    python3 -m unittest tests.test_affinity_kernel -v
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.affinity_matrix import AFFINITY_MATRIX, compute_affinity, compute_affinity_batch, np
+from core.simulation.tag_set import TagSet
+
+
+class TestAffinityKernel(unittest.TestCase):
+    def _reference(self, actor_tags, target_tags):
+        score = 0.0
+        for actor_tag in actor_tags:
+            for target_tag in target_tags:
+                score += AFFINITY_MATRIX.get((actor_tag, target_tag), 0.0)
+        return score
+
+    def _random_tag_lists(self, rng, count):
+        vocabulary = sorted({tag for pair in AFFINITY_MATRIX for tag in pair} | {"UNSCORED"})
+        return [rng.sample(vocabulary, rng.randint(0, 8)) for _ in range(count)]
+
+    def test_matches_reference_for_lists_and_tag_sets(self):
+        rng = random.Random("kernel")
+        tag_lists = self._random_tag_lists(rng, 60)
+        for actor in tag_lists[:20]:
+            for target in tag_lists:
+                expected = self._reference(actor, target)
+                self.assertEqual(compute_affinity(actor, target), expected)
+                self.assertEqual(compute_affinity(TagSet(actor), TagSet(target)), self._reference(TagSet(actor), TagSet(target)))
+
+    def test_batch_matches_single_scores(self):
+        rng = random.Random("kernel-batch")
+        actor = TagSet(["PIRATE", "AGGRESSIVE", "GREEDY", "DAMAGED", "BROKE"])
+        targets = [TagSet(tags) for tags in self._random_tag_lists(rng, 80)]
+        expected = [compute_affinity(actor, target) for target in targets]
+        self.assertEqual(compute_affinity_batch(actor, targets, use_numpy=False), expected)
+        self.assertEqual(compute_affinity_batch(actor, [t.to_list() for t in targets]), expected)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_numpy_batch_matches_single_scores(self):
+        rng = random.Random("kernel-numpy")
+        actor = TagSet(["MILITARY", "LOYAL", "BOLD", "HEALTHY"])
+        targets = [TagSet(tags) for tags in self._random_tag_lists(rng, 80)]
+        expected = [compute_affinity(actor, target) for target in targets]
+        self.assertEqual(compute_affinity_batch(actor, targets, use_numpy=True), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_batch.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for the multi-seed batch runner.
+
+Run:
+    python3 -m unittest tests.test_batch -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import batch
+
+
+class TestBatchRunner(unittest.TestCase):
+    def test_results_independent_of_worker_count(self):
+        seeds = batch.parse_seeds("s-a,s-b", "0:2", prefix="s-")
+        self.assertEqual(seeds, ["s-a", "s-b", "s-0", "s-1"])
+        serial = batch.merge_summaries(list(batch.run_batch(seeds, 40, workers=1)))
+        pooled = batch.merge_summaries(list(batch.run_batch(seeds, 40, workers=2)))
+        self.assertEqual(serial, pooled)
+        self.assertEqual(serial["seeds"], 4)
+
+    def test_metrics_spec_limits_summary(self):
+        summary = batch.run_seed("s-metrics", 5, batch.parse_metrics("deaths"))
+        self.assertIn("mortal_deaths", summary)
+        self.assertNotIn("actions", summary)
+        with self.assertRaises(ValueError):
+            batch.parse_metrics("deaths,bogus")
+
+
+if __name__ == "__main__":
+    unittest.main()
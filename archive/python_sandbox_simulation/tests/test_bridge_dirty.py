@@ -0,0 +1,66 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_bridge_dirty.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6 + TACTICAL_TODO.md TASK_9
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for dirty tracking in BridgeSystems tag derivation.
+
+Run:
+    python3 -m unittest tests.test_bridge_dirty -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from autoload.game_state import GameState
+from core.simulation.affinity_matrix import SECTOR_SECURITY_MASK, derive_agent_tags
+from core.simulation.bridge_systems import BridgeSystems
+
+
+class TestBridgeDirtyTracking(unittest.TestCase):
+    def _build_state(self):
+        state = GameState()
+        state.world_topology = {"s1": {"connections": [], "sector_type": "colony"}}
+        state.world_hazards = {"s1": {}}
+        state.grid_dominion = {"s1": {}}
+        state.sector_tags = {"s1": ["STATION", "SECURE", "MILD", "RAW_ADEQUATE", "MANUFACTURED_ADEQUATE", "CURRENCY_ADEQUATE"]}
+        state.agents = {
+            "a1": {"agent_role": "trader", "condition_tag": "HEALTHY", "wealth_tag": "COMFORTABLE", "cargo_tag": "EMPTY"},
+            "a2": {"agent_role": "pirate", "condition_tag": "HEALTHY", "wealth_tag": "BROKE", "cargo_tag": "EMPTY"},
+        }
+        return state
+
+    def test_only_dirty_entities_are_rederived(self):
+        bridge = BridgeSystems()
+        state = self._build_state()
+
+        bridge.process_tick(state, {})
+        self.assertEqual(bridge.last_tick_stats, {"agents_rederived": 2, "sectors_rederived": 1})
+
+        bridge.process_tick(state, {})
+        self.assertEqual(bridge.last_tick_stats, {"agents_rederived": 0, "sectors_rederived": 0})
+
+        state.agents["a1"]["condition_tag"] = "DAMAGED"
+        state.sector_tags["s1"] = state.sector_tags["s1"].replace_group(SECTOR_SECURITY_MASK, "LAWLESS")
+        bridge.process_tick(state, {})
+        self.assertEqual(bridge.last_tick_stats, {"agents_rederived": 1, "sectors_rederived": 1})
+        self.assertIn("DAMAGED", state.agent_tags["a1"])
+        self.assertIn("LAWLESS", state.sector_tags["s1"])
+
+    def test_cached_tags_match_full_derivation(self):
+        bridge = BridgeSystems()
+        state = self._build_state()
+        bridge.process_tick(state, {})
+        bridge.process_tick(state, {})
+        for agent_id, agent in state.agents.items():
+            self.assertEqual(agent["sentiment_tags"], derive_agent_tags({}, agent))
+
+
+if __name__ == "__main__":
+    unittest.main()
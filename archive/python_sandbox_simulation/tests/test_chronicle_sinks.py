@@ -0,0 +1,71 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_chronicle_sinks.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6 + TACTICAL_TODO.md TASK_12
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for chronicle event subscribers and the event log sink.
+
+Run:
+    python3 -m unittest tests.test_chronicle_sinks -v
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.chronicle_layer import EventLogSink, read_event_log
+from core.simulation.simulation_engine import SimulationEngine
+
+
+class TestChronicleSinks(unittest.TestCase):
+    def test_subscriber_sees_each_event_once(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("sink-seed")
+        received = []
+        for tick, events in engine.iter_ticks(300):
+            self.assertTrue(all(event["tick"] == tick for event in events))
+            received.extend(events)
+        self.assertGreater(len(received), len(engine.state.chronicle_events))
+        self.assertEqual(len({id(event) for event in received}), len(received))
+        window = engine.state.chronicle_events
+        self.assertEqual(received[-len(window):], window)
+        self.assertEqual(engine.chronicle_layer._subscribers, [])
+
+    def test_event_log_sink_round_trip(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("sink-log-seed")
+        received = []
+        engine.get_chronicle().subscribe(lambda tick, events: received.extend(events))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            with engine.get_chronicle().subscribe(EventLogSink(path)) as sink:
+                for _ in range(60):
+                    engine.process_tick()
+            self.assertEqual(sink.events_written, len(received))
+            logged = list(read_event_log(path))
+        self.assertEqual([e["action"] for e in logged], [e["action"] for e in received])
+        self.assertEqual([e["tick"] for e in logged], [e["tick"] for e in received])
+
+    def test_closed_sink_is_unsubscribed(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("sink-close-seed")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl.gz")
+            with engine.get_chronicle().subscribe(EventLogSink(path)) as sink:
+                engine.process_tick()
+            written = sink.events_written
+            for _ in range(30):
+                engine.process_tick()
+            self.assertEqual(sink.events_written, written)
+            self.assertEqual(engine.chronicle_layer._subscribers, [])
+            self.assertEqual(len(list(read_event_log(path))), written)
+
+
+if __name__ == "__main__":
+    unittest.main()
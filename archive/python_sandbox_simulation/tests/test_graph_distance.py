@@ -0,0 +1,77 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_graph_distance.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for cached graph distances and multi-hop routing.
+
+Run:
+    python3 -m unittest tests.test_graph_distance -v
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from autoload.game_state import GameState
+from autoload import constants
+from core.simulation.agent_layer import AgentLayer
+from core.simulation.graph_distance import GraphDistance, get_graph_distance
+from core.simulation.tag_set import TagSet
+
+
+class TestGraphDistance(unittest.TestCase):
+    def setUp(self):
+        # a - b - c - d, plus a shortcut a - e - d
+        self.topology = {
+            "a": {"connections": ["b", "e"]},
+            "b": {"connections": ["a", "c"]},
+            "c": {"connections": ["b", "d"]},
+            "d": {"connections": ["c", "e"]},
+            "e": {"connections": ["a", "d"]},
+        }
+
+    def test_distances_and_next_hops(self):
+        graph = GraphDistance(self.topology)
+        self.assertEqual(graph.distances("a"), {"a": 0, "b": 1, "e": 1, "c": 2, "d": 2})
+        self.assertEqual(graph.next_hop("a", "d"), "e")
+        self.assertEqual(graph.next_hop("a", "c"), "b")
+        self.assertIsNone(graph.next_hop("a", "a"))
+        self.assertEqual(graph.path("b", "e"), ["a", "e"])
+        self.assertEqual(graph.nearest("a", lambda sid: sid in ("c", "d")), "c")
+        self.assertIsNone(graph.nearest("a", lambda sid: sid == "d", max_hops=1))
+
+    def test_invalidate_picks_up_new_sector(self):
+        graph = GraphDistance(self.topology)
+        self.assertIsNone(graph.distance("a", "f"))
+        self.topology["f"] = {"connections": ["d"]}
+        self.topology["d"]["connections"].append("f")
+        graph.invalidate()
+        self.assertEqual(graph.distance("a", "f"), 3)
+        self.assertEqual(graph.path("a", "f"), ["e", "d", "f"])
+
+    def test_multi_hop_flee_routes_toward_secure_sector(self):
+        state = GameState()
+        state.world_topology = self.topology
+        state.sector_tags = {sid: TagSet(["LAWLESS"]) for sid in self.topology}
+        state.sector_tags["d"] = TagSet(["SECURE"])
+        agent = {"current_sector_id": "b", "agent_role": "trader", "is_disabled": False}
+        state.agents = {"npc": agent}
+        layer = AgentLayer()
+
+        layer._action_flee_to_safety(state, "npc", agent)
+        self.assertEqual(agent["current_sector_id"], "b")
+        with patch.object(constants, "AGENT_ROUTING_MAX_HOPS", 3):
+            layer._action_flee_to_safety(state, "npc", agent)
+        self.assertEqual(agent["current_sector_id"], "c")
+        self.assertIs(get_graph_distance(state), state.graph_distance)
+
+
+if __name__ == "__main__":
+    unittest.main()
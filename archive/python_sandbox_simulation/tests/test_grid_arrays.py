@@ -0,0 +1,60 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_grid_arrays.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for the GridLayer list/vector/parity step modes.
+
+Run:
+    python3 -m unittest tests.test_grid_arrays -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.grid_arrays import np as grid_np
+from core.simulation.grid_layer import GridLayer
+from core.simulation.simulation_engine import SimulationEngine
+
+
+class TestGridModes(unittest.TestCase):
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            GridLayer(mode="simd")
+
+    @unittest.skipIf(grid_np is not None, "NumPy installed")
+    def test_vector_mode_requires_numpy(self):
+        with self.assertRaises(RuntimeError):
+            GridLayer(mode="vector")
+
+    @unittest.skipIf(grid_np is None, "NumPy not installed")
+    def test_parity_mode_matches_list_step(self):
+        # Parity mode raises on the first tick where the two steps disagree.
+        for seed in ("grid-parity-a", "grid-parity-b"):
+            engine = SimulationEngine()
+            engine.grid_layer.set_mode("parity")
+            engine.initialize_simulation(seed)
+            for _ in range(400):
+                engine.process_tick()
+
+    @unittest.skipIf(grid_np is None, "NumPy not installed")
+    def test_vector_mode_reproduces_list_run(self):
+        runs = {}
+        for mode in ("list", "vector"):
+            engine = SimulationEngine()
+            engine.grid_layer.set_mode(mode)
+            engine.initialize_simulation("grid-vector")
+            for _ in range(300):
+                engine.process_tick()
+            runs[mode] = (engine.state.sector_tags, engine.state.colony_levels, engine.state.chronicle_events)
+        self.assertEqual(runs["list"], runs["vector"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_sector_occupancy.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1, §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for the per-tick sector occupancy index.
+
+Run:
+    python3 -m unittest tests.test_sector_occupancy -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.sector_occupancy import SectorOccupancy
+from core.simulation.simulation_engine import SimulationEngine
+
+
+class TestSectorOccupancy(unittest.TestCase):
+    def test_counts_follow_moves_and_disables(self):
+        agents = {
+            "player": {"current_sector_id": "a", "agent_role": "idle", "cargo_tag": "EMPTY"},
+            "t1": {"current_sector_id": "a", "agent_role": "trader", "cargo_tag": "LOADED"},
+            "p1": {"current_sector_id": "b", "agent_role": "pirate", "cargo_tag": "EMPTY"},
+        }
+        occupancy = SectorOccupancy()
+        occupancy.rebuild(agents)
+        self.assertEqual(occupancy.active_count("a"), 2)
+        self.assertEqual(occupancy.active_count("a", include_player=False), 1)
+        self.assertEqual(occupancy.loaded_count("a"), 1)
+
+        agents["t1"]["current_sector_id"] = "b"
+        occupancy.sync_agent("t1", agents["t1"])
+        agents["p1"]["is_disabled"] = True
+        occupancy.sync_agent("p1", agents["p1"])
+
+        self.assertEqual(occupancy.loaded_count("a"), 0)
+        self.assertEqual(occupancy.loaded_count("b"), 1)
+        self.assertEqual(occupancy.role_counts("b"), {"trader": 1})
+        self.assertEqual(occupancy.agent_ids("b"), ["t1"])
+
+    def test_incremental_index_matches_rebuild_after_ticks(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("occupancy-seed")
+        for _ in range(60):
+            engine.process_tick()
+
+        fresh = SectorOccupancy()
+        fresh.rebuild(engine.state.agents)
+        live = engine.state.sector_occupancy
+        for sector_id in engine.state.world_topology:
+            self.assertEqual(live.agent_ids(sector_id), fresh.agent_ids(sector_id))
+            self.assertEqual(live.role_counts(sector_id), fresh.role_counts(sector_id))
+            self.assertEqual(live.loaded_count(sector_id), fresh.loaded_count(sector_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
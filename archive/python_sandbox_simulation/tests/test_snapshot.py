@@ -0,0 +1,65 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_snapshot.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6 + TACTICAL_TODO.md TASK_11
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for SimulationEngine snapshot, restore and fork.
+
+Run:
+    python3 -m unittest tests.test_snapshot -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.simulation_engine import SimulationEngine
+
+
+class TestEngineSnapshot(unittest.TestCase):
+    @staticmethod
+    def _fingerprint(engine):
+        state = engine.state
+        agents = {
+            agent_id: {key: (sorted(value) if key == "sentiment_tags" else value)
+                       for key, value in agent.items() if key != "event_memory"}
+            for agent_id, agent in state.agents.items()
+        }
+        sectors = {sector_id: sorted(tags) for sector_id, tags in state.sector_tags.items()}
+        return repr((state.sim_tick_count, state.world_age, agents, sectors, state.chronicle_events))
+
+    def test_restored_engine_continues_identically(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("snapshot-seed")
+        for _ in range(150):
+            engine.process_tick()
+        blob = engine.snapshot()
+        restored = SimulationEngine.from_snapshot(blob)
+        for _ in range(150):
+            engine.process_tick()
+            restored.process_tick()
+        self.assertEqual(self._fingerprint(engine), self._fingerprint(restored))
+
+    def test_fork_applies_overrides_per_branch(self):
+        engine = SimulationEngine()
+        engine.initialize_simulation("fork-seed")
+        for _ in range(20):
+            engine.process_tick()
+        plain, capped = engine.fork([{}, {"mortal_global_cap": 3}])
+        self.assertEqual(plain.get_config(), engine.get_config())
+        self.assertEqual(capped.get_config()["mortal_global_cap"], 3)
+        self.assertEqual(capped.state.sim_tick_count, engine.state.sim_tick_count)
+        self.assertIsNot(capped.state.agents, engine.state.agents)
+
+    def test_restore_rejects_foreign_blob(self):
+        with self.assertRaises(ValueError):
+            SimulationEngine().restore(b"not a snapshot")
+
+
+if __name__ == "__main__":
+    unittest.main()
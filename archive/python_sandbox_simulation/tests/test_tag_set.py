@@ -0,0 +1,53 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_tag_set.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §2.1, §3.2
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for bitmask-backed qualitative tag sets.
+
+Run:
+    python3 -m unittest tests.test_tag_set -v
+"""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.affinity_matrix import SECTOR_SECURITY_MASK
+from core.simulation.tag_set import TagSet, prefix_mask
+
+
+class TestTagSet(unittest.TestCase):
+    def test_membership_and_list_view(self):
+        tags = TagSet(["STATION", "SECURE", "RAW_RICH", "STATION"])
+        self.assertIn("SECURE", tags)
+        self.assertNotIn("LAWLESS", tags)
+        self.assertEqual(len(tags), 3)
+        self.assertEqual(sorted(tags.to_list()), ["RAW_RICH", "SECURE", "STATION"])
+        self.assertEqual(tags, ["RAW_RICH", "STATION", "SECURE"])
+
+    def test_group_replacement(self):
+        tags = TagSet(["STATION", "SECURE", "RAW_RICH", "MANUFACTURED_POOR"])
+        tags = tags.replace_group(SECTOR_SECURITY_MASK, "LAWLESS")
+        tags = tags.replace_group(prefix_mask("RAW_"), "RAW_POOR")
+        self.assertEqual(sorted(tags), ["LAWLESS", "MANUFACTURED_POOR", "RAW_POOR", "STATION"])
+
+    def test_unknown_tags_are_interned(self):
+        tags = TagSet(["STATION"]).with_tag("SANDBOX_ONLY_TAG")
+        self.assertIn("SANDBOX_ONLY_TAG", tags)
+        self.assertNotIn("SANDBOX_ONLY_TAG", tags.without("SANDBOX_ONLY_TAG"))
+
+    def test_json_dumps_as_list(self):
+        tags = TagSet(["STATION", "SECURE"])
+        self.assertEqual(json.loads(json.dumps({"a": tags})), {"a": list(tags)})
+        self.assertIs(tags.with_tag("STATION"), tags)
+
+
+if __name__ == "__main__":
+    unittest.main()
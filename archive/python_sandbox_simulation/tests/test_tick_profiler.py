@@ -0,0 +1,51 @@
+#
+# PROJECT: GDTLancer
+# MODULE: test_tick_profiler.py
+# STATUS: [Level 2 - Implementation]
+# TRUTH_LINK: TRUTH_SIMULATION-GRAPH.md §6
+# LOG_REF: 2026-10-17
+#
+
+"""Unit tests for the opt-in per-layer tick profiler.
+
+Run:
+    python3 -m unittest tests.test_tick_profiler -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.simulation.simulation_engine import SimulationEngine
+
+
+class TestTickProfiler(unittest.TestCase):
+    def test_profiling_records_sections_without_changing_results(self):
+        plain = SimulationEngine()
+        plain.initialize_simulation("profile-seed")
+        profiled = SimulationEngine()
+        profiled.initialize_simulation("profile-seed")
+        profiler = profiled.enable_profiling()
+        for _ in range(120):
+            plain.process_tick()
+            profiled.process_tick()
+        self.assertEqual(plain.state.chronicle_events, profiled.state.chronicle_events)
+
+        summary = profiler.summary()
+        self.assertEqual(profiler.ticks, 120)
+        for name in ("tick", "grid", "bridge", "agent", "chronicle", "agent.action.affinity_scan", "agent.spawn"):
+            self.assertIn(name, summary)
+        self.assertEqual(summary["grid"]["ticks"], 120)
+        self.assertLessEqual(summary["grid"]["p50_ms"], summary["grid"]["p99_ms"])
+        self.assertEqual(sum(count for _, count in profiler.histogram("tick")), 120)
+        self.assertTrue(any("TICK PROFILE" in line for line in profiler.report_lines()))
+
+        profiled.disable_profiling()
+        profiled.process_tick()
+        self.assertEqual(profiler.ticks, 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
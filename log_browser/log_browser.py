@@ -1,10 +1,18 @@
+import argparse
+import collections
 import hashlib
 import html
+import io
 import json
 import os
+import queue
+import re
 import sqlite3
 import sys
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlencode, urlparse
 
 
@@ -63,6 +71,44 @@ RELATED_MUTATION_LIMIT = 5
 ENTITY_HISTORY_LIMIT = 6
 DETAIL_CHANGE_LIMIT = 40
 DETAIL_EVENT_LIMIT = 40
+INGEST_CHUNK_SIZE = 5000
+INGEST_PROGRESS_SECONDS = 2.0
+INGEST_CHECKPOINT_SECONDS = 5.0
+FOLLOW_POLL_SECONDS = 1.0
+CURSOR_SIGNATURE_BYTES = 4096
+STATE_KEYFRAME_INTERVAL = 50
+SCHEMA_VERSION = 2
+# Bumped whenever inference stores different mutation rows for the same log;
+# --follow re-ingests a legends.db written by an older inference instead of resuming it.
+# 2: fingerprinted agent/contract diffs no longer store catch-all "value" rows.
+MUTATION_INFERENCE_VERSION = 2
+INDEX_STATEMENTS = (
+    # /events and the home page counts (ORDER BY run_id DESC, tick DESC walks the index backwards).
+    "CREATE INDEX IF NOT EXISTS events_run_tick ON events (run_id, tick, signature)",
+    # /agent event timeline: WHERE run_id = ? AND (actor_id = ? OR target_id = ?) ORDER BY tick, signature.
+    "CREATE INDEX IF NOT EXISTS events_actor ON events (run_id, actor_id, tick, signature)",
+    "CREATE INDEX IF NOT EXISTS events_target ON events (run_id, target_id, tick, signature)",
+    # /sector event timeline.
+    "CREATE INDEX IF NOT EXISTS events_sector ON events (run_id, sector_id, tick, signature)",
+    # /agent, /sector, /agents and /sectors change histories ordered by tick.
+    "CREATE INDEX IF NOT EXISTS mutations_entity ON mutations (run_id, entity_type, entity_id, tick)",
+    # snapshots(run_id, tick) and mutations(run_id, tick, ...) are served by their primary keys.
+)
+QUERY_TRACE = None
+SERVER_POOL_SIZE = 8
+SERVER_POOL_TIMEOUT_SECONDS = 10.0
+PAGE_CACHE_BYTES = 64 * 1024 * 1024
+COUNTED_TABLES = ("snapshots", "events", "mutations", "agents", "sectors")
+PAGE_SEARCH_LIMIT = 50
+SEARCH_RANK_LIMIT = 100000
+SEARCH_MARKS = ("\x02", "\x03")
+# One FTS5 row per event (rowid = events.rowid * 2) and per mutation (mutations.rowid * 2 + 1).
+# run_id and tick are stored unindexed so filters need no join; names and text are searched.
+SEARCH_TABLE_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5("
+    "kind UNINDEXED, run_id UNINDEXED, tick UNINDEXED, names, text, tokenize = 'unicode61 remove_diacritics 2')"
+)
+SQL_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
 LOW_SIGNAL_AGENT_FIELDS = {"goal_archetype", "rest_ticks_remaining", "sentiment_tags", "dynamic_tags"}
 GENERIC_AGENT_EVENT_FIELDS = {
     "condition_tag",
@@ -136,9 +182,103 @@ ACTION_OUTCOME_PRIORITY = {
 def connect_db():
     conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
+    if QUERY_TRACE is not None:
+        conn.set_trace_callback(QUERY_TRACE)
     return conn
 
 
+def connect_db_readonly(db_file=None):
+    """Read-only shared-cache connection; safe to hand between server threads (one user at a time)."""
+    path = os.path.abspath(db_file or DB_FILE)
+    conn = sqlite3.connect(f"file:{path}?mode=ro&cache=shared", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    if QUERY_TRACE is not None:
+        conn.set_trace_callback(QUERY_TRACE)
+    return conn
+
+
+class ConnectionPool:
+    """Bounded pool of read-only connections, opened lazily up to *size*."""
+
+    def __init__(self, db_file=None, size=SERVER_POOL_SIZE, timeout=SERVER_POOL_TIMEOUT_SECONDS):
+        self.db_file = db_file or DB_FILE
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Return an idle connection, opening one if under the bound; raises queue.Empty after *timeout*."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+        if open_new:
+            try:
+                return connect_db_readonly(self.db_file)
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn):
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class PageCache:
+    """Thread-safe LRU of rendered pages, bounded by total bytes.
+
+    Keys include the metadata generation, which every ingest checkpoint bumps,
+    so pages rendered before new rows arrived are never served again and age out.
+    """
+
+    def __init__(self, max_bytes=PAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._pages = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key, page):
+        if len(page) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._pages.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._pages[key] = page
+            self.size += len(page)
+            while self.size > self.max_bytes:
+                _key, evicted = self._pages.popitem(last=False)
+                self.size -= len(evicted)
+
+
 def init_db(conn):
     c = conn.cursor()
     c.executescript(
@@ -149,6 +289,11 @@ def init_db(conn):
         DROP TABLE IF EXISTS mutations;
         DROP TABLE IF EXISTS agents;
         DROP TABLE IF EXISTS sectors;
+        DROP TABLE IF EXISTS ingest_cursor;
+        DROP TABLE IF EXISTS run_cursors;
+        DROP TABLE IF EXISTS state_frames;
+        DROP TABLE IF EXISTS metadata;
+        DROP TABLE IF EXISTS search;
 
         CREATE TABLE runs (
             run_id TEXT PRIMARY KEY,
@@ -209,8 +354,36 @@ def init_db(conn):
             data TEXT,
             PRIMARY KEY (run_id, sector_id)
         );
+
+        CREATE TABLE ingest_cursor (
+            log_path TEXT PRIMARY KEY,
+            byte_offset INTEGER,
+            signature TEXT
+        );
+
+        CREATE TABLE run_cursors (
+            run_id TEXT PRIMARY KEY,
+            previous_state BLOB
+        );
+
+        CREATE TABLE state_frames (
+            run_id TEXT,
+            tick INTEGER,
+            kind TEXT,
+            data BLOB,
+            PRIMARY KEY (run_id, tick)
+        );
+
+        CREATE TABLE metadata (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        );
+
+        PRAGMA user_version = 0;
         """
     )
+    c.execute("INSERT INTO metadata (key, value) VALUES ('mutation_inference', ?)", (MUTATION_INFERENCE_VERSION,))
+    create_search_table(conn)
     conn.commit()
 
 
@@ -592,11 +765,76 @@ def infer_world_mutation(previous_state, current_state):
     }
 
 
-def infer_agent_mutations(previous_state, current_state):
+def branch_fingerprints(branch, field_names):
+    """Per-entity fingerprint: the values of *field_names* only, as a tuple.
+
+    Equal fingerprints mean no interesting field changed, so the entity is
+    skipped without comparing the rest of it (event_memory and the like).
+    Fingerprints are compared, never hashed, so they are exact and need no
+    freezing; every snapshot is freshly parsed, so nothing is shared between
+    ticks.
+    """
+    fingerprints = {}
+    for entity_id, entity in (branch or {}).items():
+        fingerprints[entity_id] = tuple(map(entity.get, field_names)) if isinstance(entity, dict) else entity
+    return fingerprints
+
+
+def sector_fingerprints(game_state):
+    roots = [game_state.get(root_name) or {} for root_name, _label in SECTOR_ROOTS]
+    sector_ids = set()
+    for root in roots:
+        sector_ids.update(root.keys())
+    return {sector_id: tuple(root.get(sector_id) for root in roots) for sector_id in sector_ids}
+
+
+def state_fingerprints(game_state):
+    return {
+        "agents": branch_fingerprints(game_state.get("agents"), INTERESTING_AGENT_FIELDS),
+        "contracts": branch_fingerprints(game_state.get("runtime_contract_occurrences"), INTERESTING_CONTRACT_FIELDS),
+        "sectors": sector_fingerprints(game_state),
+    }
+
+
+def diff_fingerprinted_branch(previous_branch, current_branch, previous_fingerprints, current_fingerprints, key_field_names):
+    """diff_indexed_branch restricted to entities whose fingerprint changed (plus creations and removals).
+
+    Unlike diff_indexed_branch there is no catch-all "value" row: an entity whose
+    changes all fall outside *key_field_names* (e.g. only event_memory) is skipped.
+    """
+    rows = []
+    previous_branch = previous_branch or {}
+    current_branch = current_branch or {}
+    changed_ids = {
+        entity_id
+        for entity_id, fingerprint in current_fingerprints.items()
+        if previous_fingerprints.get(entity_id) != fingerprint
+    }
+    changed_ids.update(previous_fingerprints.keys() - current_fingerprints.keys())
+    for entity_id in sorted(changed_ids):
+        previous_value = previous_branch.get(entity_id)
+        current_value = current_branch.get(entity_id)
+        if previous_value is None and current_value is None:
+            continue
+        if previous_value is None:
+            changes = {"created": build_change(None, current_value)}
+        elif current_value is None:
+            changes = {"removed": build_change(previous_value, None)}
+        else:
+            changes = diff_selected_fields(previous_value, current_value, key_field_names)
+            if not changes:
+                continue
+        rows.append((entity_id, changes))
+    return rows
+
+
+def infer_agent_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints):
     mutations = []
     previous_agents = previous_state.get("agents", {})
     current_agents = current_state.get("agents", {})
-    for agent_id, changes in diff_indexed_branch(previous_agents, current_agents, INTERESTING_AGENT_FIELDS):
+    for agent_id, changes in diff_fingerprinted_branch(
+        previous_agents, current_agents, previous_fingerprints["agents"], current_fingerprints["agents"], INTERESTING_AGENT_FIELDS
+    ):
         mutations.append(
             {
                 "entity_type": "agent",
@@ -608,13 +846,16 @@ def infer_agent_mutations(previous_state, current_state):
     return mutations
 
 
-def infer_sector_mutations(previous_state, current_state):
+def infer_sector_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints):
+    previous_sectors = previous_fingerprints["sectors"]
+    current_sectors = current_fingerprints["sectors"]
+    changed_ids = {sector_id for sector_id, fingerprint in current_sectors.items() if previous_sectors.get(sector_id) != fingerprint}
+    changed_ids.update(set(previous_sectors) - set(current_sectors))
     per_sector = {}
     for root_name, label in SECTOR_ROOTS:
         previous_branch = previous_state.get(root_name, {})
         current_branch = current_state.get(root_name, {})
-        sector_ids = sorted(set(previous_branch.keys()) | set(current_branch.keys()))
-        for sector_id in sector_ids:
+        for sector_id in sorted(changed_ids):
             before = previous_branch.get(sector_id)
             after = current_branch.get(sector_id)
             if before == after:
@@ -633,11 +874,13 @@ def infer_sector_mutations(previous_state, current_state):
     return mutations
 
 
-def infer_contract_mutations(previous_state, current_state):
+def infer_contract_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints):
     mutations = []
     previous_contracts = previous_state.get("runtime_contract_occurrences", {})
     current_contracts = current_state.get("runtime_contract_occurrences", {})
-    for occurrence_id, changes in diff_indexed_branch(previous_contracts, current_contracts, INTERESTING_CONTRACT_FIELDS):
+    for occurrence_id, changes in diff_fingerprinted_branch(
+        previous_contracts, current_contracts, previous_fingerprints["contracts"], current_fingerprints["contracts"], INTERESTING_CONTRACT_FIELDS
+    ):
         mutations.append(
             {
                 "entity_type": "contract",
@@ -649,16 +892,21 @@ def infer_contract_mutations(previous_state, current_state):
     return mutations
 
 
-def infer_tick_mutations(previous_state, current_state):
+def infer_tick_mutations(previous_state, current_state, previous_fingerprints=None, current_fingerprints=None):
+    """Mutations between consecutive snapshots; pass cached fingerprints to avoid recomputing them."""
     if not previous_state:
         return []
+    if previous_fingerprints is None:
+        previous_fingerprints = state_fingerprints(previous_state)
+    if current_fingerprints is None:
+        current_fingerprints = state_fingerprints(current_state)
     mutations = []
     world_mutation = infer_world_mutation(previous_state, current_state)
     if world_mutation is not None:
         mutations.append(world_mutation)
-    mutations.extend(infer_agent_mutations(previous_state, current_state))
-    mutations.extend(infer_sector_mutations(previous_state, current_state))
-    mutations.extend(infer_contract_mutations(previous_state, current_state))
+    mutations.extend(infer_agent_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints))
+    mutations.extend(infer_sector_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints))
+    mutations.extend(infer_contract_mutations(previous_state, current_state, previous_fingerprints, current_fingerprints))
     return mutations
 
 
@@ -724,8 +972,28 @@ def upsert_snapshot(c, run_id, record, mutation_count):
     )
 
 
-def insert_events(c, run_id, tick, events):
-    for chronicle_index, event in enumerate(events):
+def chronicle_tail_start(previous_events, current_events):
+    """Index of the first event in *current_events* not already in *previous_events*.
+
+    The chronicle buffer only appends and drops from the front, so the previous
+    buffer's surviving tail must be a prefix of the current one.  Returns 0 (every
+    event goes through signature dedupe) when the buffers do not line up.
+    """
+    if not previous_events or not current_events:
+        return 0
+    first_event = current_events[0]
+    previous_count = len(previous_events)
+    for dropped, event in enumerate(previous_events):
+        if event != first_event:
+            continue
+        kept = previous_count - dropped
+        if kept <= len(current_events) and current_events[:kept] == previous_events[dropped:]:
+            return kept
+    return 0
+
+
+def insert_events(c, run_id, tick, events, start_index=0):
+    for chronicle_index, event in enumerate(events[start_index:], start_index):
         metadata = event.get("metadata") if isinstance(event.get("metadata"), dict) else {}
         target_id = metadata.get("target")
         signature = stable_signature({
@@ -770,81 +1038,557 @@ def insert_mutations(c, run_id, tick, mutations):
         )
 
 
-def upsert_latest_state(c, run_id, game_state):
-    for agent_id, agent_data in (game_state.get("agents") or {}).items():
+def remember_latest_state(latest, game_state):
+    """Fold one tick into a run's last-seen agents/sectors (written once by write_latest_state)."""
+    latest["agents"].update(game_state.get("agents") or {})
+    sector_ids = set()
+    for root_name, _label in SECTOR_ROOTS:
+        sector_ids.update((game_state.get(root_name) or {}).keys())
+    for sector_id in sector_ids:
+        latest["sectors"][sector_id] = sector_snapshot(game_state, sector_id)
+
+
+def write_latest_state(c, run_id, latest):
+    for agent_id, agent_data in latest["agents"].items():
         c.execute(
             "INSERT OR REPLACE INTO agents (run_id, agent_id, data) VALUES (?, ?, ?)",
             (run_id, agent_id, stable_json(agent_data)),
         )
-
-    sector_ids = set()
-    for root_name, _label in SECTOR_ROOTS:
-        sector_ids.update((game_state.get(root_name) or {}).keys())
-    for sector_id in sorted(sector_ids):
+    for sector_id in sorted(latest["sectors"]):
         c.execute(
             "INSERT OR REPLACE INTO sectors (run_id, sector_id, data) VALUES (?, ?, ?)",
-            (run_id, sector_id, stable_json(sector_snapshot(game_state, sector_id))),
+            (run_id, sector_id, stable_json(latest["sectors"][sector_id])),
         )
 
 
-def parse_log(filepath):
-    conn = connect_db()
-    init_db(conn)
-    c = conn.cursor()
-    previous_state_by_run = {}
+class BatchedWriter:
+    """Cursor stand-in for bulk loads: buffers execute() calls per statement and flushes them with executemany.
 
-    with open(filepath, "r", encoding="utf-8") as handle:
-        for raw_line in handle:
-            line = raw_line.strip()
-            if not line.startswith("{"):
-                continue
+    Every table is written by a single statement, so keeping each statement's
+    rows in order preserves the INSERT OR IGNORE / OR REPLACE outcome of
+    row-at-a-time execution.
+    """
 
-            try:
-                record = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+    def __init__(self, conn, chunk_size=INGEST_CHUNK_SIZE, progress=True):
+        self.conn = conn
+        self.chunk_size = max(1, int(chunk_size))
+        self.progress = progress
+        self.rows_written = 0
+        self._pending = {}
+        self._pending_count = 0
+        self._started = time.perf_counter()
+        self._last_report = self._started
+
+    def execute(self, sql, params):
+        self._pending.setdefault(sql, []).append(params)
+        self._pending_count += 1
+        if self._pending_count >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        for sql, rows in self._pending.items():
+            self.conn.executemany(sql, rows)
+        self.conn.commit()
+        self.rows_written += self._pending_count
+        self._pending = {}
+        self._pending_count = 0
+        if self.progress and time.perf_counter() - self._last_report >= INGEST_PROGRESS_SECONDS:
+            self.report()
+
+    def report(self, label="ingested"):
+        now = time.perf_counter()
+        self._last_report = now
+        elapsed = max(now - self._started, 1e-9)
+        print(f"  {label} {self.rows_written} rows in {elapsed:.1f}s ({self.rows_written / elapsed:,.0f} rows/s)", flush=True)
+
+
+def begin_bulk_load(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+
+
+def end_bulk_load(conn):
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def create_indexes(conn):
+    """Build the secondary indexes (after the bulk load, so inserts skip index upkeep) and stamp the schema version."""
+    for statement in INDEX_STATEMENTS:
+        conn.execute(statement)
+    if has_table(conn, "search"):
+        # Merge the segments written by per-checkpoint indexing into one b-tree.
+        conn.execute("INSERT INTO search (search) VALUES ('optimize')")
+    conn.execute("ANALYZE")
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
 
-            record_type = record.get("record_type")
-            if record_type == "run_started":
-                run_id = upsert_run(c, record)
-                previous_state_by_run[run_id] = None
-                continue
 
-            if record_type == "run_finished":
-                upsert_run(c, record)
-                continue
+def ensure_schema(conn):
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        create_indexes(conn)
 
-            if record_type != "tick_snapshot":
-                continue
 
-            run_id = record.get("run_id") or "unknown"
-            if run_id not in previous_state_by_run:
-                upsert_run(
-                    c,
-                    {
-                        "record_type": "run_started",
-                        "run_id": run_id,
-                        "world_seed": record.get("world_seed"),
-                        "stream_mode": record.get("stream_mode"),
-                        "tick_start": record.get("sim_tick"),
-                        "tick_count_requested": None,
-                    },
-                )
-                previous_state_by_run[run_id] = None
+def stored_inference_version(conn):
+    try:
+        row = conn.execute("SELECT value FROM metadata WHERE key = 'mutation_inference'").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
 
-            tick = safe_int(record.get("sim_tick"))
-            game_state = record.get("game_state") if isinstance(record.get("game_state"), dict) else {}
-            mutations = infer_tick_mutations(previous_state_by_run.get(run_id), game_state)
-            upsert_snapshot(c, run_id, record, len(mutations))
-            insert_events(c, run_id, tick, game_state.get("chronicle_events") or [])
-            insert_mutations(c, run_id, tick, mutations)
-            upsert_latest_state(c, run_id, game_state)
-            previous_state_by_run[run_id] = game_state
 
+def refresh_metadata(conn):
+    """Store row counts for the paged tables and bump the generation that keys the server's page cache."""
+    rows = [(f"rows:{table}", conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]) for table in COUNTED_TABLES]
+    conn.executemany("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", rows)
+    conn.execute("INSERT INTO metadata (key, value) VALUES ('generation', 1) ON CONFLICT (key) DO UPDATE SET value = value + 1")
     conn.commit()
+
+
+def read_metadata(c):
+    try:
+        c.execute("SELECT key, value FROM metadata")
+    except sqlite3.OperationalError:
+        return {}
+    return {row[0]: row[1] for row in c.fetchall()}
+
+
+def has_table(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def create_search_table(conn):
+    """Create the full-text index; False when this SQLite build lacks FTS5 (search is then unavailable)."""
+    try:
+        conn.execute(SEARCH_TABLE_SQL)
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def update_search_index(conn):
+    """Index events and mutations added since the last call; committed by the refresh_metadata that follows.
+
+    Rows past the stored rowid watermarks are copied with one INSERT ... SELECT
+    each.  A mutation replaced on replay gets a new rowid and is indexed again;
+    its old entry no longer joins to a row and is skipped by search_rows.
+    """
+    if not has_table(conn, "search"):
+        return
+    watermarks = {row[0]: row[1] for row in conn.execute("SELECT key, value FROM metadata WHERE key LIKE 'search:%'")}
+    conn.execute(
+        """
+        INSERT INTO search (rowid, kind, run_id, tick, names, text)
+        SELECT rowid * 2, 'event', run_id, tick,
+               trim(ifnull(action, '') || ' ' || ifnull(actor_id, '') || ' ' || ifnull(target_id, '') || ' ' || ifnull(sector_id, '')),
+               (SELECT group_concat(value, ' ') FROM json_each(events.data, '$.metadata'))
+        FROM events
+        WHERE rowid > ?
+        """,
+        (watermarks.get("search:events", 0),),
+    )
+    conn.execute(
+        """
+        INSERT INTO search (rowid, kind, run_id, tick, names, text)
+        SELECT rowid * 2 + 1, 'mutation', run_id, tick, entity_type || ' ' || entity_id, summary
+        FROM mutations
+        WHERE rowid > ?
+        """,
+        (watermarks.get("search:mutations", 0),),
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+        [(f"search:{table}", conn.execute(f"SELECT ifnull(MAX(rowid), 0) FROM {table}").fetchone()[0]) for table in ("events", "mutations")],
+    )
+
+
+def fts_query(text):
+    """Turn search-box text into an FTS5 query: every word (or "quoted phrase") must match; a trailing * matches a prefix."""
+    terms = []
+    for term in re.findall(r'"[^"]*"|\S+', text or ""):
+        prefix = term.endswith("*") and not term.startswith('"')
+        term = term.strip('"').rstrip("*")
+        if not term.strip():
+            continue
+        terms.append('"' + term.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search_rows(c, match, run_id=None, tick_from=None, tick_to=None, limit=PAGE_SEARCH_LIMIT, offset=0, ranked=True):
+    """Events and mutations for an FTS5 *match*, joined back to their source rows.
+
+    Ranked results are best bm25 first, which scores every match; unranked
+    ones are newest first and stream straight out of the index.
+    """
+    filters, params = [], list(SEARCH_MARKS) * 2 + [match]
+    if run_id:
+        filters.append("AND search.run_id = ?")
+        params.append(run_id)
+    if tick_from is not None:
+        filters.append("AND search.tick >= ?")
+        params.append(tick_from)
+    if tick_to is not None:
+        filters.append("AND search.tick <= ?")
+        params.append(tick_to)
+    c.execute(
+        f"""
+        SELECT search.kind, search.run_id, search.tick,
+               highlight(search, 3, ?, ?) AS names, highlight(search, 4, ?, ?) AS text,
+               events.data AS event_data, mutations.entity_type, mutations.entity_id
+        FROM search
+        LEFT JOIN events ON search.kind = 'event' AND events.rowid = search.rowid / 2
+        LEFT JOIN mutations ON search.kind = 'mutation' AND mutations.rowid = search.rowid / 2
+        WHERE search MATCH ? {' '.join(filters)}
+          AND (events.rowid IS NOT NULL OR mutations.rowid IS NOT NULL)
+        ORDER BY {'rank' if ranked else 'search.rowid DESC'}
+        LIMIT ? OFFSET ?
+        """,
+        params + [limit, offset],
+    )
+    return c.fetchall()
+
+
+def highlighted_html(text):
+    return html.escape(text or "").replace(SEARCH_MARKS[0], "<mark>").replace(SEARCH_MARKS[1], "</mark>")
+
+
+def table_count(c, metadata, table):
+    """Row count from the metadata table, counted live only before the first checkpoint has stored it."""
+    count = metadata.get(f"rows:{table}")
+    if count is None:
+        c.execute(f"SELECT COUNT(*) FROM {table}")
+        count = c.fetchone()[0]
+    return count
+
+
+def state_delta(previous_state, current_state):
+    """Everything needed to turn *previous_state* into *current_state*.
+
+    Dict branches (agents, sector roots, contracts, ...) are diffed per entity
+    with diff_indexed_branch; lists that only append and drop from the front
+    (chronicle_events) store just the new tail; anything else is replaced whole.
+    """
+    delta = {}
+    removed = sorted(set(previous_state) - set(current_state))
+    if removed:
+        delta["del"] = removed
+    for key, value in current_state.items():
+        if key not in previous_state:
+            delta.setdefault("set", {})[key] = value
+            continue
+        before = previous_state[key]
+        if before == value:
+            continue
+        if isinstance(before, dict) and isinstance(value, dict):
+            changed_ids = {entity_id for entity_id, _changes in diff_indexed_branch(before, value)}
+            changed_ids.update(before.keys() ^ value.keys())
+            branch = {"set": {}, "del": []}
+            for entity_id in sorted(changed_ids):
+                if entity_id in value:
+                    branch["set"][entity_id] = value[entity_id]
+                else:
+                    branch["del"].append(entity_id)
+            delta.setdefault("branches", {})[key] = branch
+            continue
+        if isinstance(before, list) and isinstance(value, list):
+            kept = chronicle_tail_start(before, value)
+            if kept:
+                delta.setdefault("lists", {})[key] = {"drop": len(before) - kept, "append": value[kept:]}
+                continue
+        delta.setdefault("set", {})[key] = value
+    return delta
+
+
+def apply_state_delta(state, delta):
+    for key in delta.get("del", ()):
+        state.pop(key, None)
+    state.update(delta.get("set", {}))
+    for key, branch in delta.get("branches", {}).items():
+        entities = state[key]
+        for entity_id in branch["del"]:
+            entities.pop(entity_id, None)
+        entities.update(branch["set"])
+    for key, tail in delta.get("lists", {}).items():
+        state[key] = state[key][tail["drop"]:] + tail["append"]
+    return state
+
+
+def pack_frame(value):
+    return zlib.compress(stable_json(value).encode("utf-8"), 6)
+
+
+def unpack_frame(blob):
+    return json.loads(zlib.decompress(blob))
+
+
+def load_state(c, run_id, tick):
+    """Rebuild a run's game_state at the latest stored frame <= *tick*.
+
+    Returns (frame_tick, keyframe_tick, state), or None if no keyframe precedes *tick*.
+    """
+    c.execute(
+        "SELECT tick, data FROM state_frames WHERE run_id = ? AND tick <= ? AND kind = 'key' ORDER BY tick DESC LIMIT 1",
+        (run_id, tick),
+    )
+    key_row = c.fetchone()
+    if key_row is None:
+        return None
+    state = unpack_frame(key_row["data"])
+    frame_tick = key_row["tick"]
+    c.execute(
+        "SELECT tick, data FROM state_frames WHERE run_id = ? AND tick > ? AND tick <= ? ORDER BY tick ASC",
+        (run_id, key_row["tick"], tick),
+    )
+    for row in c.fetchall():
+        apply_state_delta(state, unpack_frame(row["data"]))
+        frame_tick = row["tick"]
+    return frame_tick, key_row["tick"], state
+
+
+def log_signature(log_path, byte_offset):
+    """Hash of the bytes just before *byte_offset*; detects a replaced or rewritten log on resume."""
+    start = max(0, byte_offset - CURSOR_SIGNATURE_BYTES)
+    with open(log_path, "rb") as handle:
+        handle.seek(start)
+        return hashlib.sha1(handle.read(byte_offset - start)).hexdigest()
+
+
+class LogIngester:
+    """Incremental log-to-SQLite ingest that checkpoints everything needed to resume.
+
+    A checkpoint stores the byte offset of the last consumed line and each run's
+    previous game_state in the same commit as the rows they produced.  Records
+    replayed after a crash are harmless (snapshots and mutations are replaced,
+    events deduplicated), so chunk flushes between checkpoints need no care.
+    """
+
+    def __init__(self, conn, log_path, chunk_size=INGEST_CHUNK_SIZE, progress=True, keyframe_interval=None):
+        self.conn = conn
+        self.log_path = os.path.abspath(log_path)
+        self.writer = BatchedWriter(conn, chunk_size, progress)
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_tick_by_run = {}
+        self.byte_offset = 0
+        self.signature = log_signature(self.log_path, 0)
+        self.previous_state_by_run = {}
+        self.fingerprints_by_run = {}
+        self.latest_state_by_run = {}
+        self._dirty_runs = set()
+        self._last_checkpoint = time.perf_counter()
+
+    def resume(self):
+        """Load this log's checkpoint; False if there is none or the log no longer matches it."""
+        try:
+            row = self.conn.execute(
+                "SELECT byte_offset, signature FROM ingest_cursor WHERE log_path = ?",
+                (self.log_path,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+        if row is None or not self.log_matches(row[0], row[1]):
+            return False
+        if stored_inference_version(self.conn) < MUTATION_INFERENCE_VERSION:
+            print("legends.db was ingested by an older version with different mutation rows; ingesting the log again.", flush=True)
+            return False
+        self.byte_offset, self.signature = row[0], row[1]
+        # Databases written before the metadata and search tables existed get them on resume.
+        self.conn.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value INTEGER)")
+        create_search_table(self.conn)
+        for run_id, blob in self.conn.execute("SELECT run_id, previous_state FROM run_cursors"):
+            self.previous_state_by_run[run_id] = None if blob is None else json.loads(zlib.decompress(blob))
+        return True
+
+    def log_matches(self, byte_offset, signature):
+        try:
+            if os.path.getsize(self.log_path) < byte_offset:
+                return False
+            return log_signature(self.log_path, byte_offset) == signature
+        except OSError:
+            return False
+
+    def restart_from_top(self):
+        """Forget the offset and per-run state (the log was truncated or replaced); stored rows are kept."""
+        self.byte_offset = 0
+        self.signature = log_signature(self.log_path, 0)
+        self._dirty_runs.update(self.previous_state_by_run)
+        self.previous_state_by_run = {run_id: None for run_id in self.previous_state_by_run}
+        self.fingerprints_by_run = {}
+        self.keyframe_tick_by_run = {}
+
+    def ingest_available(self, final=False):
+        """Ingest complete lines appended since the last call; returns the number of bytes consumed.
+
+        A trailing line without a newline may still be mid-write, so the offset
+        never moves past it.  With *final* it is ingested anyway (and will be
+        replayed harmlessly if ingest resumes later).
+        """
+        consumed = 0
+        with open(self.log_path, "rb") as handle:
+            handle.seek(self.byte_offset)
+            for raw_line in handle:
+                if not raw_line.endswith(b"\n"):
+                    if final:
+                        self.ingest_line(raw_line)
+                    break
+                self.ingest_line(raw_line)
+                self.byte_offset += len(raw_line)
+                consumed += len(raw_line)
+                if time.perf_counter() - self._last_checkpoint >= INGEST_CHECKPOINT_SECONDS:
+                    self.checkpoint()
+        return consumed
+
+    def ingest_line(self, raw_line):
+        line = raw_line.strip()
+        if not line.startswith(b"{"):
+            return
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return
+        self.ingest_record(record)
+
+    def ingest_record(self, record):
+        c = self.writer
+        previous_state_by_run = self.previous_state_by_run
+        record_type = record.get("record_type")
+        if record_type == "run_started":
+            run_id = upsert_run(c, record)
+            previous_state_by_run[run_id] = None
+            self.fingerprints_by_run.pop(run_id, None)
+            self._dirty_runs.add(run_id)
+            return
+
+        if record_type == "run_finished":
+            upsert_run(c, record)
+            return
+
+        if record_type != "tick_snapshot":
+            return
+
+        run_id = record.get("run_id") or "unknown"
+        if run_id not in previous_state_by_run:
+            upsert_run(
+                c,
+                {
+                    "record_type": "run_started",
+                    "run_id": run_id,
+                    "world_seed": record.get("world_seed"),
+                    "stream_mode": record.get("stream_mode"),
+                    "tick_start": record.get("sim_tick"),
+                    "tick_count_requested": None,
+                },
+            )
+            previous_state_by_run[run_id] = None
+
+        tick = safe_int(record.get("sim_tick"))
+        game_state = record.get("game_state") if isinstance(record.get("game_state"), dict) else {}
+        # Fingerprints ride alongside the previous state; after a resume they are rebuilt from it once.
+        current_fingerprints = state_fingerprints(game_state)
+        previous_fingerprints = self.fingerprints_by_run.get(run_id)
+        mutations = infer_tick_mutations(previous_state_by_run.get(run_id), game_state, previous_fingerprints, current_fingerprints)
+        self.fingerprints_by_run[run_id] = current_fingerprints
+        upsert_snapshot(c, run_id, record, len(mutations))
+        previous_state = previous_state_by_run.get(run_id) or {}
+        events = game_state.get("chronicle_events") or []
+        insert_events(c, run_id, tick, events, chronicle_tail_start(previous_state.get("chronicle_events"), events))
+        insert_mutations(c, run_id, tick, mutations)
+        latest = self.latest_state_by_run.setdefault(run_id, {"agents": {}, "sectors": {}})
+        remember_latest_state(latest, game_state)
+        if self.keyframe_interval:
+            self.store_state_frame(run_id, tick, previous_state_by_run.get(run_id), game_state)
+        previous_state_by_run[run_id] = game_state
+        self._dirty_runs.add(run_id)
+
+    def store_state_frame(self, run_id, tick, previous_state, game_state):
+        """Keyframe on a run's first stored tick and every keyframe_interval ticks after; deltas in between.
+
+        After a resume the first frame of each run is a keyframe, so a gap in the
+        store (ticks ingested without it) can never be bridged by a delta.
+        """
+        keyframe_tick = self.keyframe_tick_by_run.get(run_id)
+        if previous_state is None or keyframe_tick is None or tick - keyframe_tick >= self.keyframe_interval or tick <= keyframe_tick:
+            self.keyframe_tick_by_run[run_id] = tick
+            kind, data = "key", game_state
+        else:
+            kind, data = "delta", state_delta(previous_state, game_state)
+        self.writer.execute(
+            "INSERT OR REPLACE INTO state_frames (run_id, tick, kind, data) VALUES (?, ?, ?, ?)",
+            (run_id, tick, kind, pack_frame(data)),
+        )
+
+    def checkpoint(self):
+        c = self.writer
+        for run_id, latest in self.latest_state_by_run.items():
+            write_latest_state(c, run_id, latest)
+        self.latest_state_by_run = {}
+        for run_id in sorted(self._dirty_runs):
+            previous_state = self.previous_state_by_run.get(run_id)
+            blob = None if previous_state is None else zlib.compress(stable_json(previous_state).encode("utf-8"), 1)
+            c.execute("INSERT OR REPLACE INTO run_cursors (run_id, previous_state) VALUES (?, ?)", (run_id, blob))
+        self._dirty_runs.clear()
+        self.signature = log_signature(self.log_path, self.byte_offset)
+        c.execute(
+            "INSERT OR REPLACE INTO ingest_cursor (log_path, byte_offset, signature) VALUES (?, ?, ?)",
+            (self.log_path, self.byte_offset, self.signature),
+        )
+        c.flush()
+        update_search_index(self.conn)
+        refresh_metadata(self.conn)
+        self._last_checkpoint = time.perf_counter()
+
+
+def parse_log(filepath, chunk_size=INGEST_CHUNK_SIZE, progress=True, keyframe_interval=None):
+    conn = connect_db()
+    init_db(conn)
+    begin_bulk_load(conn)
+    ingester = LogIngester(conn, filepath, chunk_size, progress, keyframe_interval)
+    ingester.ingest_available(final=True)
+    ingester.checkpoint()
+    ensure_schema(conn)
+    end_bulk_load(conn)
+    if progress:
+        ingester.writer.report("done:")
     conn.close()
 
 
+def follow_log(filepath, stop_event, ready_event, chunk_size=INGEST_CHUNK_SIZE, poll_seconds=FOLLOW_POLL_SECONDS, keyframe_interval=None):
+    """Resume (or start) ingest of *filepath* and keep tailing it until *stop_event* is set.
+
+    Runs in a background thread; *ready_event* is set once the database has its
+    tables, so pages can be served while the backlog is still being ingested.
+    """
+    conn = connect_db()
+    ingester = LogIngester(conn, filepath, chunk_size, keyframe_interval=keyframe_interval)
+    if ingester.resume():
+        print(f"Resuming {ingester.log_path} at byte {ingester.byte_offset}.", flush=True)
+    else:
+        init_db(conn)
+        ingester = LogIngester(conn, filepath, chunk_size, keyframe_interval=keyframe_interval)
+    ready_event.set()
+
+    try:
+        begin_bulk_load(conn)
+        ingester.ingest_available()
+        ingester.checkpoint()
+        ensure_schema(conn)
+        end_bulk_load(conn)
+        ingester.writer.report("caught up:")
+        ingester.writer.progress = False
+
+        while not stop_event.wait(poll_seconds):
+            if not os.path.exists(ingester.log_path):
+                continue
+            if not ingester.log_matches(ingester.byte_offset, ingester.signature):
+                print("Log was truncated or replaced; ingesting it again from the top.", flush=True)
+                ingester.restart_from_top()
+            if ingester.ingest_available():
+                ingester.checkpoint()
+    finally:
+        conn.close()
+
+
 def format_event(event_data):
     action = event_data.get("action", "unknown")
     actor = html.escape(str(event_data.get("actor_id", "Someone")))
@@ -899,6 +1643,114 @@ def page_offset(page, per_page):
     return max(0, (page - 1) * per_page)
 
 
+class KeysetListing:
+    """A listing ordered by a unique key, paged by seeking past a boundary row instead of OFFSET.
+
+    Prev/Next links carry the key of the boundary row (before/after), so they
+    cost the same anywhere in the table and stay put while --follow adds rows.
+    Numbered links still use OFFSET, counted from whichever end is nearer.
+    """
+
+    def __init__(self, table, columns, key):
+        self.table = table
+        self.columns = columns
+        self.key = key  # ((column, descending), ...)
+
+    def order_sql(self, reverse=False):
+        return ", ".join(f"{column} {'ASC' if descending == reverse else 'DESC'}" for column, descending in self.key)
+
+    def seek_sql(self, reverse=False):
+        """WHERE clause for rows strictly after the cursor, and the cursor index behind each placeholder.
+
+        Columns sharing a direction are compared as one row value, so the
+        leading group becomes an index range (mixed directions add a filter).
+        """
+        groups = []
+        for index, (column, descending) in enumerate(self.key):
+            if groups and groups[-1][2] == descending:
+                groups[-1][0].append(column)
+                groups[-1][1].append(index)
+            else:
+                groups.append(([column], [index], descending))
+        clause, indexes = None, []
+        for columns, group_indexes, descending in reversed(groups):
+            operator = ">" if descending == reverse else "<"
+            row_value = f"({', '.join(columns)})"
+            placeholders = f"({', '.join('?' for _ in columns)})"
+            if clause is None:
+                clause, indexes = f"{row_value} {operator} {placeholders}", list(group_indexes)
+            else:
+                clause = f"{row_value} {operator}= {placeholders} AND ({row_value} {operator} {placeholders} OR {clause})"
+                indexes = group_indexes + group_indexes + indexes
+        return clause, indexes
+
+    def cursor(self, row):
+        return json.dumps([row[column] for column, _descending in self.key], separators=(",", ":"))
+
+    def parse_cursor(self, value):
+        if not value:
+            return None
+        try:
+            cursor = json.loads(value)
+        except ValueError:
+            return None
+        if not isinstance(cursor, list) or len(cursor) != len(self.key):
+            return None
+        return cursor
+
+    def query(self, c, limit, offset=0, cursor=None, reverse=False):
+        where, params = "", []
+        if cursor is not None:
+            where, indexes = self.seek_sql(reverse)
+            where = f"WHERE {where}"
+            params = [cursor[index] for index in indexes]
+        c.execute(
+            f"SELECT {self.columns} FROM {self.table} {where} ORDER BY {self.order_sql(reverse)} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        rows = c.fetchall()
+        return rows[::-1] if reverse else rows
+
+    def fetch(self, c, query, page, per_page, total_count):
+        """Rows of *page*: seek from an after/before cursor in *query* when present, else offset from the nearer end."""
+        after = self.parse_cursor(query_value(query, "after"))
+        if after is not None:
+            return self.query(c, per_page, cursor=after)
+        before = self.parse_cursor(query_value(query, "before"))
+        if before is not None:
+            return self.query(c, per_page, cursor=before, reverse=True)
+        offset = page_offset(page, per_page)
+        tail_offset = total_count - offset - per_page
+        if offset > 0 and tail_offset < offset:
+            return self.query(c, per_page + min(tail_offset, 0), offset=max(tail_offset, 0), reverse=True)
+        return self.query(c, per_page, offset=offset)
+
+    def cursor_params(self, rows):
+        """Extra Prev/Next link parameters for a page of *rows*."""
+        if not rows:
+            return None
+        return {"prev": {"before": self.cursor(rows[0])}, "next": {"after": self.cursor(rows[-1])}}
+
+
+SNAPSHOT_LISTING = KeysetListing(
+    "snapshots",
+    "run_id, tick, tick_index, discovered_sectors, deaths, world_age, active_contracts, chronicle_event_count, mutation_count",
+    (("run_id", True), ("tick", True)),
+)
+EVENT_LISTING = KeysetListing(
+    "events",
+    "run_id, tick, signature, action, actor_id, target_id, sector_id, data",
+    (("run_id", True), ("tick", True), ("signature", True)),
+)
+MUTATION_LISTING = KeysetListing(
+    "mutations",
+    "run_id, tick, entity_type, entity_id, summary, data",
+    (("run_id", True), ("tick", True), ("entity_type", False), ("entity_id", False)),
+)
+AGENT_LISTING = KeysetListing("agents", "run_id, agent_id, data", (("run_id", True), ("agent_id", False)))
+SECTOR_LISTING = KeysetListing("sectors", "run_id, sector_id, data", (("run_id", True), ("sector_id", False)))
+
+
 def build_url(path, params=None):
     filtered = {}
     for key, value in (params or {}).items():
@@ -911,25 +1763,27 @@ def build_url(path, params=None):
     return f"{path}?{query_string}"
 
 
-def pagination_html(path, current_page, per_page, total_count, base_params=None, param_name="page"):
+def pagination_html(path, current_page, per_page, total_count, base_params=None, param_name="page", cursor_params=None):
     total_page_count = total_pages(total_count, per_page)
     if total_page_count <= 1:
         return ""
 
     current_page = clamp_page(current_page, total_count, per_page)
     base_params = dict(base_params or {})
+    cursor_params = cursor_params or {}
     links = []
 
-    def link_html(label, page_number, current=False):
+    def link_html(label, page_number, current=False, extra_params=None):
         if current:
             return f"<span class='current-page'>{html.escape(str(label))}</span>"
         params = dict(base_params)
         params[param_name] = page_number
+        params.update(extra_params or {})
         return f"<a class='page-link' href='{html.escape(build_url(path, params))}'>{html.escape(str(label))}</a>"
 
     if current_page > 1:
         links.append(link_html("First", 1))
-        links.append(link_html("Prev", current_page - 1))
+        links.append(link_html("Prev", current_page - 1, extra_params=cursor_params.get("prev")))
 
     start_page = max(1, current_page - 2)
     end_page = min(total_page_count, current_page + 2)
@@ -943,7 +1797,7 @@ def pagination_html(path, current_page, per_page, total_count, base_params=None,
         links.append("<span class='muted'>...</span>")
 
     if current_page < total_page_count:
-        links.append(link_html("Next", current_page + 1))
+        links.append(link_html("Next", current_page + 1, extra_params=cursor_params.get("next")))
         links.append(link_html("Last", total_page_count))
 
     return (
@@ -954,29 +1808,69 @@ def pagination_html(path, current_page, per_page, total_count, base_params=None,
     )
 
 
-def fetch_related_mutations(c, run_id, tick, actor_id, target_id, sector_id, limit):
+def fetch_related_mutations(c, event_rows, limit):
+    """Candidate outcome mutations for a page of events, fetched in one query.
+
+    Returns one list per event row: that tick's mutations for the event's actor,
+    target and sector plus all contract and world changes, ordered agent,
+    contract, sector, world and capped at *limit*.
+    """
+    if not event_rows:
+        return []
+    ticks_by_run = {}
+    for row in event_rows:
+        ticks_by_run.setdefault(row["run_id"], set()).add(row["tick"])
+    agent_ids = sorted({row[field] or "" for row in event_rows for field in ("actor_id", "target_id")})
+    sector_ids = sorted({row["sector_id"] or "" for row in event_rows})
+    tick_clauses = []
+    params = []
+    for run_id, ticks in sorted(ticks_by_run.items()):
+        tick_clauses.append(f"(run_id = ? AND tick IN ({', '.join(['?'] * len(ticks))}))")
+        params.append(run_id)
+        params.extend(sorted(ticks))
+    params.extend(agent_ids)
+    params.extend(sector_ids)
     c.execute(
-        """
-        SELECT entity_type, entity_id, summary, data, tick
+        f"""
+        SELECT run_id, entity_type, entity_id, summary, data, tick
         FROM mutations
-        WHERE run_id = ? AND tick = ? AND (
-            (entity_type = 'agent' AND entity_id IN (?, ?)) OR
-            (entity_type = 'sector' AND entity_id = ?) OR
+        WHERE ({" OR ".join(tick_clauses)}) AND (
+            (entity_type = 'agent' AND entity_id IN ({", ".join(["?"] * len(agent_ids))})) OR
+            (entity_type = 'sector' AND entity_id IN ({", ".join(["?"] * len(sector_ids))})) OR
             entity_type = 'contract' OR
             entity_type = 'world'
         )
-        ORDER BY CASE entity_type
+        ORDER BY run_id, tick, CASE entity_type
             WHEN 'agent' THEN 0
             WHEN 'contract' THEN 1
             WHEN 'sector' THEN 2
             WHEN 'world' THEN 3
             ELSE 4
         END, entity_id ASC
-        LIMIT ?
         """,
-        [run_id, tick, actor_id or "", target_id or "", sector_id or "", limit],
+        params,
     )
-    return c.fetchall()
+    by_tick = {}
+    for mutation_row in c.fetchall():
+        by_tick.setdefault((mutation_row["run_id"], mutation_row["tick"]), []).append(mutation_row)
+
+    related = []
+    for row in event_rows:
+        agent_ids = (row["actor_id"] or "", row["target_id"] or "")
+        sector_id = row["sector_id"] or ""
+        candidates = []
+        for mutation_row in by_tick.get((row["run_id"], row["tick"]), ()):
+            entity_type = mutation_row["entity_type"]
+            if (
+                (entity_type == "agent" and mutation_row["entity_id"] in agent_ids)
+                or (entity_type == "sector" and mutation_row["entity_id"] == sector_id)
+                or entity_type in ("contract", "world")
+            ):
+                candidates.append(mutation_row)
+                if len(candidates) >= limit:
+                    break
+        related.append(candidates)
+    return related
 
 
 def event_list_html(c, rows, empty_text, related_limit=RELATED_MUTATION_LIMIT):
@@ -984,17 +1878,8 @@ def event_list_html(c, rows, empty_text, related_limit=RELATED_MUTATION_LIMIT):
         return f"<span class='muted'><i>{html.escape(empty_text)}</i></span>"
 
     items = []
-    for row in rows:
+    for row, candidate_rows in zip(rows, fetch_related_mutations(c, rows, related_limit * 4)):
         event_data = json.loads(row["data"])
-        candidate_rows = fetch_related_mutations(
-            c,
-            row["run_id"],
-            row["tick"],
-            row["actor_id"],
-            row["target_id"],
-            row["sector_id"],
-            related_limit * 4,
-        )
         related_rows = scoped_event_mutations(event_data, candidate_rows, related_limit + 1)
         items.append(
             "<li class='history-entry'>"
@@ -1046,6 +1931,9 @@ def page_shell(title, body):
             .event-fail {{ color: #ffa657; }}
             .event-default {{ color: #d7dae0; }}
             small {{ color: #8b949e; }}
+            mark {{ background: #bb800966; color: inherit; }}
+            form input, form select, form button {{ background: #161b22; color: #d7dae0; border: 1px solid #2d3440; border-radius: 6px; padding: 4px 8px; margin-right: 6px; }}
+            pre {{ background: #161b22; border: 1px solid #2d3440; padding: 12px; overflow-x: auto; font-size: 0.85em; }}
         </style>
     </head>
     <body>
@@ -1057,6 +1945,8 @@ def page_shell(title, body):
             <a href='/mutations'>Mutations</a>
             <a href='/agents'>Agents</a>
             <a href='/sectors'>Sectors</a>
+            <a href='/state'>State</a>
+            <a href='/search'>Search</a>
         </div>
         {body}
     </body>
@@ -1066,33 +1956,56 @@ def page_shell(title, body):
 
 class LegendsHandler(BaseHTTPRequestHandler):
     def do_GET(self):
-        conn = connect_db()
+        started = time.perf_counter()
+        self._status = "-"
+        pool = getattr(getattr(self, "server", None), "connection_pool", None)
+        try:
+            conn = pool.acquire() if pool is not None else connect_db()
+        except queue.Empty:
+            self.send_error(503, "All database connections are busy")
+        else:
+            try:
+                self.handle_page(conn)
+            finally:
+                if pool is not None:
+                    pool.release(conn)
+                else:
+                    conn.close()
+        self.log_message('"%s" %s %.1fms', self.requestline, self._status, 1000 * (time.perf_counter() - started))
+
+    def log_request(self, code="-", size="-"):
+        # The access line is written by do_GET once the page is rendered, so it can carry the timing.
+        self._status = getattr(code, "value", code)
+
+    def handle_page(self, conn):
         c = conn.cursor()
         parsed = urlparse(self.path)
         path = parsed.path
         query = parse_qs(parsed.query)
 
+        if path == "/state" and query_value(query, "format") == "json":
+            self.send_state_json(c, query)
+            return
+
         self.send_response(200)
         self.send_header("Content-type", "text/html; charset=utf-8")
         self.end_headers()
 
+        metadata = read_metadata(c)
+        page_cache = getattr(getattr(self, "server", None), "page_cache", None)
+        cache_key = (metadata.get("generation"), self.path)
+        if page_cache is not None and cache_key[0] is not None:
+            cached = page_cache.get(cache_key)
+            if cached is not None:
+                self.wfile.write(cached)
+                return
+
         if path == "/snapshots":
             requested_page = query_page(query)
-            c.execute("SELECT COUNT(*) FROM snapshots")
-            total_count = c.fetchone()[0]
+            total_count = table_count(c, metadata, "snapshots")
             page = clamp_page(requested_page, total_count, PAGE_SNAPSHOT_LIMIT)
-            c.execute(
-                """
-                SELECT run_id, tick, tick_index, discovered_sectors, deaths, world_age, active_contracts, chronicle_event_count, mutation_count
-                FROM snapshots
-                ORDER BY run_id DESC, tick DESC
-                LIMIT ?
-                OFFSET ?
-                """,
-                (PAGE_SNAPSHOT_LIMIT, page_offset(page, PAGE_SNAPSHOT_LIMIT)),
-            )
-            rows = c.fetchall()
-            pager = pagination_html("/snapshots", page, PAGE_SNAPSHOT_LIMIT, total_count)
+            rows = SNAPSHOT_LISTING.fetch(c, query, page, PAGE_SNAPSHOT_LIMIT, total_count)
+            pager = pagination_html("/snapshots", page, PAGE_SNAPSHOT_LIMIT, total_count, cursor_params=SNAPSHOT_LISTING.cursor_params(rows))
             body = [
                 "<h2>Timeline Snapshots</h2>",
                 f"<p class='hint'>Browse the full snapshot timeline page by page. Newest snapshots stay first here; use pagination to walk older history.</p>",
@@ -1103,7 +2016,7 @@ class LegendsHandler(BaseHTTPRequestHandler):
                 body.append(
                     "<tr>"
                     f"<td>{html.escape(row['run_id'])}</td>"
-                    f"<td><b>t{row['tick']}</b><br><small>tick index {row['tick_index']}</small></td>"
+                    f"<td><b><a href='{html.escape(build_url('/state', {'run': row['run_id'], 'tick': row['tick']}))}'>t{row['tick']}</a></b><br><small>tick index {row['tick_index']}</small></td>"
                     f"<td>{html.escape(snapshot_summary(row))}</td>"
                     "</tr>"
                 )
@@ -1113,39 +2026,18 @@ class LegendsHandler(BaseHTTPRequestHandler):
 
         elif path == "/events":
             requested_page = query_page(query)
-            c.execute("SELECT COUNT(*) FROM events")
-            total_count = c.fetchone()[0]
+            total_count = table_count(c, metadata, "events")
             page = clamp_page(requested_page, total_count, PAGE_EVENT_LIMIT)
-            c.execute(
-                """
-                SELECT run_id, tick, action, actor_id, target_id, sector_id, data
-                FROM events
-                ORDER BY run_id DESC, tick DESC
-                LIMIT ?
-                OFFSET ?
-                """
-                ,
-                (PAGE_EVENT_LIMIT, page_offset(page, PAGE_EVENT_LIMIT))
-            )
-            rows = c.fetchall()
-            pager = pagination_html("/events", page, PAGE_EVENT_LIMIT, total_count)
+            rows = EVENT_LISTING.fetch(c, query, page, PAGE_EVENT_LIMIT, total_count)
+            pager = pagination_html("/events", page, PAGE_EVENT_LIMIT, total_count, cursor_params=EVENT_LISTING.cursor_params(rows))
             body = [
                 "<h2>Chronicle Events</h2>",
                 f"<p class='hint'>Browse chronicle events page by page. Each row pairs the event with the most relevant event-scoped outcome summaries.</p>",
                 pager,
                 "<table><tr><th>Tick</th><th>Event</th><th>Observed Outcome</th></tr>",
             ]
-            for row in rows:
+            for row, candidate_rows in zip(rows, fetch_related_mutations(c, rows, RELATED_MUTATION_LIMIT * 4)):
                 event_data = json.loads(row["data"])
-                candidate_rows = fetch_related_mutations(
-                    c,
-                    row["run_id"],
-                    row["tick"],
-                    row["actor_id"],
-                    row["target_id"],
-                    row["sector_id"],
-                    RELATED_MUTATION_LIMIT * 4,
-                )
                 related = scoped_event_mutations(event_data, candidate_rows, RELATED_MUTATION_LIMIT + 1)
                 mutation_block = mutation_list_html(
                     related,
@@ -1165,22 +2057,10 @@ class LegendsHandler(BaseHTTPRequestHandler):
 
         elif path == "/mutations":
             requested_page = query_page(query)
-            c.execute("SELECT COUNT(*) FROM mutations")
-            total_count = c.fetchone()[0]
+            total_count = table_count(c, metadata, "mutations")
             page = clamp_page(requested_page, total_count, PAGE_MUTATION_LIMIT)
-            c.execute(
-                """
-                SELECT run_id, tick, entity_type, entity_id, summary, data
-                FROM mutations
-                ORDER BY run_id DESC, tick DESC, entity_type ASC, entity_id ASC
-                LIMIT ?
-                OFFSET ?
-                """
-                ,
-                (PAGE_MUTATION_LIMIT, page_offset(page, PAGE_MUTATION_LIMIT))
-            )
-            rows = c.fetchall()
-            pager = pagination_html("/mutations", page, PAGE_MUTATION_LIMIT, total_count)
+            rows = MUTATION_LISTING.fetch(c, query, page, PAGE_MUTATION_LIMIT, total_count)
+            pager = pagination_html("/mutations", page, PAGE_MUTATION_LIMIT, total_count, cursor_params=MUTATION_LISTING.cursor_params(rows))
             body = [
                 "<h2>Mutations</h2>",
                 f"<p class='hint'>Browse inferred changes page by page. This remains the highest-signal outcome view when you want history without raw snapshot noise.</p>",
@@ -1383,15 +2263,10 @@ class LegendsHandler(BaseHTTPRequestHandler):
 
         elif path == "/agents":
             requested_page = query_page(query)
-            c.execute("SELECT COUNT(*) FROM agents")
-            total_count = c.fetchone()[0]
+            total_count = table_count(c, metadata, "agents")
             page = clamp_page(requested_page, total_count, PAGE_AGENT_LIMIT)
-            c.execute(
-                "SELECT run_id, agent_id, data FROM agents ORDER BY run_id DESC, agent_id ASC LIMIT ? OFFSET ?",
-                (PAGE_AGENT_LIMIT, page_offset(page, PAGE_AGENT_LIMIT)),
-            )
-            rows = c.fetchall()
-            pager = pagination_html("/agents", page, PAGE_AGENT_LIMIT, total_count)
+            rows = AGENT_LISTING.fetch(c, query, page, PAGE_AGENT_LIMIT, total_count)
+            pager = pagination_html("/agents", page, PAGE_AGENT_LIMIT, total_count, cursor_params=AGENT_LISTING.cursor_params(rows))
             body = [
                 "<h2>Agents</h2>",
                 f"<p class='hint'>Browse agents page by page. Open any row to inspect the full change and event history from start to finish.</p>",
@@ -1434,15 +2309,10 @@ class LegendsHandler(BaseHTTPRequestHandler):
 
         elif path == "/sectors":
             requested_page = query_page(query)
-            c.execute("SELECT COUNT(*) FROM sectors")
-            total_count = c.fetchone()[0]
+            total_count = table_count(c, metadata, "sectors")
             page = clamp_page(requested_page, total_count, PAGE_SECTOR_LIMIT)
-            c.execute(
-                "SELECT run_id, sector_id, data FROM sectors ORDER BY run_id DESC, sector_id ASC LIMIT ? OFFSET ?",
-                (PAGE_SECTOR_LIMIT, page_offset(page, PAGE_SECTOR_LIMIT)),
-            )
-            rows = c.fetchall()
-            pager = pagination_html("/sectors", page, PAGE_SECTOR_LIMIT, total_count)
+            rows = SECTOR_LISTING.fetch(c, query, page, PAGE_SECTOR_LIMIT, total_count)
+            pager = pagination_html("/sectors", page, PAGE_SECTOR_LIMIT, total_count, cursor_params=SECTOR_LISTING.cursor_params(rows))
             body = [
                 "<h2>Sectors</h2>",
                 f"<p class='hint'>Browse sectors page by page. Open any row to inspect the full sector change and event history from start to finish.</p>",
@@ -1483,6 +2353,12 @@ class LegendsHandler(BaseHTTPRequestHandler):
             body.append(pager)
             html_body = "".join(body)
 
+        elif path == "/state":
+            html_body = self.state_page_html(c, query)
+
+        elif path == "/search":
+            html_body = self.search_page_html(c, query)
+
         else:
             c.execute(
                 """
@@ -1515,26 +2391,289 @@ class LegendsHandler(BaseHTTPRequestHandler):
             body.append("</table>")
             html_body = "".join(body)
 
-        self.wfile.write(page_shell("Legends Browser", html_body).encode("utf-8"))
-        conn.close()
+        page_bytes = page_shell("Legends Browser", html_body).encode("utf-8")
+        if page_cache is not None and cache_key[0] is not None:
+            page_cache.put(cache_key, page_bytes)
+        self.wfile.write(page_bytes)
+
+    def send_state_json(self, c, query):
+        loaded = load_state(c, query_value(query, "run"), safe_int(query_value(query, "tick")))
+        if loaded is None:
+            self.send_error(404, "No stored state at or before that tick")
+            return
+        payload = stable_json({"run_id": query_value(query, "run"), "tick": loaded[0], "game_state": loaded[2]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def search_page_html(self, c, query):
+        text = query_value(query, "q")
+        run_id = query_value(query, "run")
+        tick_from = safe_int(query_value(query, "from"), None)
+        tick_to = safe_int(query_value(query, "to"), None)
+        page = query_page(query)
+        c.execute("SELECT run_id FROM runs ORDER BY run_id DESC")
+        run_options = "".join(
+            f"<option value='{html.escape(row[0])}'{' selected' if row[0] == run_id else ''}>{html.escape(row[0])}</option>"
+            for row in c.fetchall()
+        )
+        body = [
+            "<h2>Search</h2>",
+            "<p class='hint'>Every word must match an event (action, actor, target, sector, details) or a change (entity and summary). "
+            "Quote a phrase with \"...\"; end a word with * to match its prefix. Best matches come first.</p>",
+            "<form method='get' action='/search'>"
+            f"<input type='search' name='q' size='40' value='{html.escape(text)}' placeholder='agent_npc_default destroyed'>"
+            f"<select name='run'><option value=''>All runs</option>{run_options}</select>"
+            f"<input type='number' name='from' placeholder='from tick' value='{'' if tick_from is None else tick_from}'>"
+            f"<input type='number' name='to' placeholder='to tick' value='{'' if tick_to is None else tick_to}'>"
+            "<button type='submit'>Search</button>"
+            "</form>",
+        ]
+        match = fts_query(text)
+        if not match:
+            return "".join(body)
+
+        try:
+            # Counting matches is cheap next to ranking them; past the limit, show the newest instead.
+            c.execute("SELECT COUNT(*) FROM search WHERE search MATCH ?", (match,))
+            match_count = c.fetchone()[0]
+            ranked = match_count <= SEARCH_RANK_LIMIT
+            rows = search_rows(c, match, run_id, tick_from, tick_to, PAGE_SEARCH_LIMIT + 1, page_offset(page, PAGE_SEARCH_LIMIT), ranked)
+        except sqlite3.OperationalError as exc:
+            if not has_table(c.connection, "search"):
+                body.append("<p class='hint'>This SQLite build has no FTS5, so the search index was not built.</p>")
+            else:
+                body.append(f"<p class='hint'>Search failed: {html.escape(str(exc))}</p>")
+            return "".join(body)
+        has_next = len(rows) > PAGE_SEARCH_LIMIT
+        rows = rows[:PAGE_SEARCH_LIMIT]
+
+        base_params = {"q": text, "run": run_id, "from": tick_from, "to": tick_to}
+        links = [f"<span class='muted'>Page {page}{'' if rows else ' (no matches)'}</span>"]
+        if page > 1:
+            links.append(f"<a class='page-link' href='{html.escape(build_url('/search', dict(base_params, page=page - 1)))}'>Prev</a>")
+        if has_next:
+            links.append(f"<a class='page-link' href='{html.escape(build_url('/search', dict(base_params, page=page + 1)))}'>Next</a>")
+        pager = "<div class='pagination'>" + "".join(links) + "</div>"
+        if not ranked:
+            body.append(f"<p class='hint'>{match_count} matches are too many to rank, so the newest come first. Add words to narrow the search.</p>")
+        body.extend([pager, "<table><tr><th>Tick</th><th>Match</th><th>Matched Text</th></tr>"])
+        for row in rows:
+            if row["kind"] == "event":
+                match_html = format_event(json.loads(row["event_data"]))
+            else:
+                match_html = f"{mutation_badge(row['entity_type'])}<b>{html.escape(row['entity_id'])}</b>"
+            body.append(
+                "<tr>"
+                f"<td>{row['tick']}<br><small>{html.escape(row['run_id'])}</small></td>"
+                f"<td>{match_html}</td>"
+                f"<td><small>{highlighted_html(row['names'])}</small><br>{highlighted_html(row['text'])}</td>"
+                "</tr>"
+            )
+        body.append("</table>")
+        body.append(pager)
+        return "".join(body)
+
+    def state_page_html(self, c, query):
+        run_id = query_value(query, "run")
+        tick = safe_int(query_value(query, "tick"))
+        c.execute("SELECT 1 FROM state_frames LIMIT 1")
+        if c.fetchone() is None:
+            return (
+                "<h2>Game State</h2>"
+                "<p class='hint'>No snapshot store in this database. Start the browser with --state-store to keep keyframes and per-tick deltas.</p>"
+            )
+        if not run_id:
+            return (
+                "<h2>Game State</h2>"
+                "<p class='hint'>Pick a tick from the Snapshots page to rebuild the full game state at that point.</p>"
+            )
+        loaded = load_state(c, run_id, tick)
+        if loaded is None:
+            return (
+                f"<h2>Game State: {html.escape(run_id)}</h2>"
+                f"<p class='hint'>No stored state at or before tick {tick}.</p>"
+            )
+        frame_tick, keyframe_tick, state = loaded
+        c.execute("SELECT MAX(tick) FROM state_frames WHERE run_id = ? AND tick < ?", (run_id, frame_tick))
+        previous_tick = c.fetchone()[0]
+        c.execute("SELECT MIN(tick) FROM state_frames WHERE run_id = ? AND tick > ?", (run_id, frame_tick))
+        next_tick = c.fetchone()[0]
+        links = [
+            f"<a href='{html.escape(build_url('/state', {'run': run_id, 'tick': linked_tick}))}'>{label}</a>"
+            for label, linked_tick in (("Previous tick", previous_tick), ("Next tick", next_tick))
+            if linked_tick is not None
+        ]
+        links.append(f"<a href='{html.escape(build_url('/state', {'run': run_id, 'tick': frame_tick, 'format': 'json'}))}'>Raw JSON</a>")
+        overview = [(field_label(field_name), readable_value(state.get(field_name))) for field_name in WORLD_FIELDS]
+        overview.extend(
+            (label, f"{len(state.get(root_name) or {})} entries")
+            for root_name, label in (("agents", "Agents"), ("runtime_contract_occurrences", "Contracts"), ("sector_tags", "Sectors"))
+        )
+        overview.append(("Chronicle buffer", f"{len(state.get('chronicle_events') or [])} events"))
+        return "".join(
+            [
+                f"<h2>Game State: t{frame_tick}</h2>",
+                f"<p class='hint'>Run {html.escape(run_id)} | Rebuilt from the keyframe at t{keyframe_tick} plus {frame_tick - keyframe_tick} ticks of deltas. | {' | '.join(links)}</p>",
+                "<h3>Overview</h3>",
+                summary_list_html(overview),
+                "<h3>Full State</h3>",
+                f"<pre>{html.escape(json.dumps(state, sort_keys=True, indent=2, ensure_ascii=False))}</pre>",
+            ]
+        )
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python log_browser.py <path_to_log.txt>")
-        sys.exit(1)
+class LegendsServer(ThreadingHTTPServer):
+    """Threaded server; page queries share a bounded pool of read-only connections and an LRU of rendered pages."""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, pool_size=SERVER_POOL_SIZE, page_cache_bytes=PAGE_CACHE_BYTES):
+        super().__init__(server_address, LegendsHandler)
+        self.connection_pool = ConnectionPool(DB_FILE, pool_size)
+        self.page_cache = PageCache(page_cache_bytes) if page_cache_bytes > 0 else None
+
+    def server_close(self):
+        super().server_close()
+        self.connection_pool.close()
+
+
+class BenchmarkHandler(LegendsHandler):
+    """Renders one page in-process (no socket) so page queries can be timed and explained."""
+
+    def __init__(self, path):
+        self.path = path
+        self.command = "GET"
+        self.request_version = "HTTP/1.0"
+        self.requestline = f"GET {path} HTTP/1.0"
+        self.client_address = ("benchmark", 0)
+        self.wfile = io.BytesIO()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def benchmark_paths(conn):
+    """Representative URLs for every page, using the busiest run, agent and sector."""
+    paths = ["/", "/snapshots", "/events", "/mutations", "/agents", "/sectors"]
+    for listing, per_page in ((SNAPSHOT_LISTING, PAGE_SNAPSHOT_LIMIT), (EVENT_LISTING, PAGE_EVENT_LIMIT), (MUTATION_LISTING, PAGE_MUTATION_LIMIT)):
+        # A middle page by number (OFFSET) and the same depth reached through a Next link (keyset seek).
+        middle_page = max(1, total_pages(table_count(conn.cursor(), read_metadata(conn.cursor()), listing.table), per_page) // 2)
+        boundary = listing.query(conn.cursor(), 1, offset=page_offset(middle_page, per_page) - 1) if middle_page > 1 else []
+        paths.append(build_url(f"/{listing.table}", {"page": middle_page}))
+        if boundary:
+            paths.append(build_url(f"/{listing.table}", {"page": middle_page, "after": listing.cursor(boundary[0])}))
+    for entity_type, key in (("agent", "agent_id"), ("sector", "sector_id")):
+        row = conn.execute(
+            "SELECT run_id, entity_id, COUNT(*) AS n FROM mutations WHERE entity_type = ? GROUP BY run_id, entity_id ORDER BY n DESC LIMIT 1",
+            (entity_type,),
+        ).fetchone()
+        if row is not None:
+            paths.append(build_url(f"/{entity_type}", {"run_id": row["run_id"], key: row["entity_id"]}))
+            paths.append(build_url(f"/{entity_type}", {"run_id": row["run_id"], key: row["entity_id"], "events_page": 2, "changes_page": 2}))
+            if entity_type == "agent" and has_table(conn, "search"):
+                paths.append(build_url("/search", {"q": row["entity_id"]}))
+                paths.append(build_url("/search", {"q": f"{row['entity_id']} {entity_type}", "run": row["run_id"], "from": 100, "to": 200, "page": 2}))
+    return paths
+
+
+def benchmark_pages(repeat=5):
+    """Time each page render and print the EXPLAIN QUERY PLAN of every distinct query shape it issues.
+
+    Plans that fall back to a full table scan are flagged.
+    """
+    global QUERY_TRACE
+    conn = connect_db()
+    ensure_schema(conn)
+    paths = benchmark_paths(conn)
+    statements = {}
+    for path in paths:
+        traced = []
+        QUERY_TRACE = traced.append
+        try:
+            BenchmarkHandler(path).do_GET()
+        finally:
+            QUERY_TRACE = None
+        # Statements run inside another (FTS5 reading its shadow tables) are traced as "-- ..." comments.
+        traced = [statement for statement in traced if not statement.startswith("--") and "'main'." not in statement]
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            BenchmarkHandler(path).do_GET()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"{1000 * timings[len(timings) // 2]:9.2f} ms  {len(traced):4d} queries  {path}")
+        for statement in traced:
+            statement = " ".join(statement.split())
+            statements.setdefault(SQL_LITERAL_PATTERN.sub("?", statement), (path, statement))
+
+    print("\nQuery plans:")
+    for shape, (path, statement) in statements.items():
+        plan = [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + statement)]
+        # metadata holds one row per counted table plus the generation; scanning it is the cheap path.
+        flagged = any(detail.startswith("SCAN ") and "INDEX" not in detail and detail != "SCAN metadata" for detail in plan)
+        print(f"\n[{'FULL SCAN' if flagged else 'ok'}] {path}\n  {shape}")
+        for detail in plan:
+            print(f"    {detail}")
+    conn.close()
 
-    if DB_FILE != ":memory:" and os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
 
-    print("Parsing log stream to SQLite database...")
-    parse_log(sys.argv[1])
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Legends browser for GDTLancer log streams")
+    parser.add_argument("log_path", help="Path to the Godot log stream (log.txt)")
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE, help="Rows per executemany batch during ingest")
+    parser.add_argument("--benchmark", action="store_true", help="Time every page and print query plans instead of serving")
+    parser.add_argument("--pool-size", type=int, default=SERVER_POOL_SIZE, help="Read-only SQLite connections shared by server threads")
+    parser.add_argument("--single-threaded", action="store_true", help="Serve one request at a time with a connection per request")
+    parser.add_argument("--page-cache-mb", type=int, default=PAGE_CACHE_BYTES // (1024 * 1024), help="Memory for cached rendered pages (0 disables)")
+    parser.add_argument("--follow", action="store_true", help="Keep legends.db, resume from the last ingested byte and tail the log while serving")
+    parser.add_argument("--state-store", action="store_true", help="Keep compressed keyframes and per-tick deltas so /state can rebuild any tick")
+    parser.add_argument("--keyframe-interval", type=int, default=STATE_KEYFRAME_INTERVAL, help="Ticks between state-store keyframes")
+    args = parser.parse_args()
+    keyframe_interval = max(1, args.keyframe_interval) if args.state_store else None
+
+    stop_event = threading.Event()
+    follower = None
+    if args.follow:
+        ready_event = threading.Event()
+        follower = threading.Thread(
+            target=follow_log,
+            args=(args.log_path, stop_event, ready_event, args.chunk_size, FOLLOW_POLL_SECONDS, keyframe_interval),
+            name="log-follower",
+        )
+        follower.start()
+        while not ready_event.wait(0.1):
+            if not follower.is_alive():
+                sys.exit(1)
+    else:
+        if DB_FILE != ":memory:":
+            for stale_path in (DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"):
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+
+        print("Parsing log stream to SQLite database...")
+        parse_log(args.log_path, chunk_size=args.chunk_size, keyframe_interval=keyframe_interval)
+
+    if args.benchmark:
+        if follower is not None:
+            stop_event.set()
+            follower.join()
+        benchmark_pages()
+        sys.exit(0)
 
     port = 8080
-    server = HTTPServer(("localhost", port), LegendsHandler)
+    if args.single_threaded:
+        server = HTTPServer(("localhost", port), LegendsHandler)
+    else:
+        server = LegendsServer(("localhost", port), args.pool_size, args.page_cache_mb * 1024 * 1024)
     print(f"Database ready. Web interface running at: http://localhost:{port}")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
+    stop_event.set()
+    if follower is not None:
+        follower.join()
     server.server_close()
@@ -0,0 +1 @@
+# tests/ — unit tests for the legends browser, run against log_stream_sample.txt.
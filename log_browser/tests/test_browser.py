@@ -0,0 +1,263 @@
+"""Unit tests for page queries and caching, run against the ingested sample log.
+
+Run:
+    python3 -m unittest tests.test_browser -v
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import log_browser
+from log_browser import (
+    AGENT_LISTING, EVENT_LISTING, INTERESTING_AGENT_FIELDS, MUTATION_LISTING, SEARCH_MARKS, SECTOR_LISTING, SNAPSHOT_LISTING,
+    LogIngester, PageCache, branch_fingerprints, chronicle_tail_start, diff_fingerprinted_branch,
+    diff_indexed_branch, ensure_schema, fts_query, has_table, init_db, refresh_metadata, search_rows,
+    update_search_index,
+)
+
+SAMPLE_LOG = os.path.join(os.path.dirname(__file__), "..", "log_stream_sample.txt")
+LISTINGS = (SNAPSHOT_LISTING, EVENT_LISTING, MUTATION_LISTING, AGENT_LISTING, SECTOR_LISTING)
+
+
+class SampleDatabaseTest(unittest.TestCase):
+    """Ingests log_stream_sample.txt once per class into a temporary legends.db."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.db_path = os.path.join(cls.tmp, "legends.db")
+        cls.conn = sqlite3.connect(cls.db_path)
+        cls.conn.row_factory = sqlite3.Row
+        init_db(cls.conn)
+        ingester = LogIngester(cls.conn, SAMPLE_LOG, progress=False)
+        ingester.ingest_available(final=True)
+        ingester.checkpoint()
+        ensure_schema(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        shutil.rmtree(cls.tmp)
+
+    def render(self, path, page_cache=None):
+        """Body of the page at *path*, rendered without a socket."""
+        handler = log_browser.BenchmarkHandler(path)
+        handler.server = types.SimpleNamespace(page_cache=page_cache)
+        with mock.patch.object(log_browser, "DB_FILE", self.db_path):
+            handler.do_GET()
+        return handler.wfile.getvalue().partition(b"\r\n\r\n")[2]
+
+
+class TestKeysetListing(SampleDatabaseTest):
+    PER_PAGE = 5
+
+    def keys(self, listing, rows):
+        return [tuple(row[column] for column, _descending in listing.key) for row in rows]
+
+    def all_rows(self, listing):
+        return self.keys(listing, listing.query(self.conn.cursor(), -1))
+
+    def test_next_links_walk_every_row_once(self):
+        for listing in LISTINGS:
+            with self.subTest(table=listing.table):
+                expected = self.all_rows(listing)
+                walked, rows = [], listing.query(self.conn.cursor(), self.PER_PAGE)
+                while rows:
+                    walked.extend(self.keys(listing, rows))
+                    rows = listing.query(self.conn.cursor(), self.PER_PAGE, cursor=listing.parse_cursor(listing.cursor(rows[-1])))
+                self.assertEqual(walked, expected)
+
+    def test_prev_links_walk_back_every_row_once(self):
+        for listing in LISTINGS:
+            with self.subTest(table=listing.table):
+                expected = self.all_rows(listing)
+                walked, rows = [], listing.query(self.conn.cursor(), self.PER_PAGE, reverse=True)
+                while rows:
+                    walked[:0] = self.keys(listing, rows)
+                    rows = listing.query(self.conn.cursor(), self.PER_PAGE, cursor=listing.parse_cursor(listing.cursor(rows[0])), reverse=True)
+                self.assertEqual(walked, expected)
+
+    def test_seek_across_tied_sort_keys(self):
+        # Mutations share (run_id, tick) and break ties on entity_type, entity_id ascending,
+        # so the seek must mix directions inside a run of equal ticks.
+        expected = self.all_rows(MUTATION_LISTING)
+        ticks = [key[1] for key in expected]
+        self.assertGreater(len(ticks), len(set(ticks)) * 2)
+        for index in range(len(expected) - 1):
+            cursor = list(expected[index])
+            rows = MUTATION_LISTING.query(self.conn.cursor(), 3, cursor=cursor)
+            self.assertEqual(self.keys(MUTATION_LISTING, rows), expected[index + 1:index + 4])
+
+    def test_numbered_pages_match_offsets_from_either_end(self):
+        for listing in LISTINGS:
+            with self.subTest(table=listing.table):
+                expected = self.all_rows(listing)
+                pages = -(-len(expected) // self.PER_PAGE)
+                for page in range(1, pages + 1):
+                    rows = listing.fetch(self.conn.cursor(), {}, page, self.PER_PAGE, len(expected))
+                    start = (page - 1) * self.PER_PAGE
+                    self.assertEqual(self.keys(listing, rows), expected[start:start + self.PER_PAGE])
+
+    def test_malformed_cursor_is_ignored(self):
+        self.assertIsNone(MUTATION_LISTING.parse_cursor("not json"))
+        self.assertIsNone(MUTATION_LISTING.parse_cursor("[1, 2]"))
+
+
+class TestPageCache(SampleDatabaseTest):
+    def test_page_served_from_cache_until_generation_changes(self):
+        cache = PageCache()
+        first = self.render("/mutations", cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(self.render("/mutations", cache), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # New rows without a checkpoint: the cached page is still what is served
+        self.conn.execute("DELETE FROM mutations WHERE rowid = (SELECT MIN(rowid) FROM mutations)")
+        self.conn.commit()
+        self.assertEqual(self.render("/mutations", cache), first)
+
+        # The checkpoint bumps the generation, so the stale page is never served again
+        refresh_metadata(self.conn)
+        fresh = self.render("/mutations", cache)
+        self.assertNotEqual(fresh, first)
+        self.assertEqual(fresh, self.render("/mutations"))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        cache = PageCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertEqual(cache.size, 8)
+        cache.put("huge", b"x" * 11)
+        self.assertIsNone(cache.get("huge"))
+
+
+class TestChronicleTail(SampleDatabaseTest):
+    def test_each_event_stored_once_at_the_tick_it_appeared(self):
+        counts = dict(self.conn.execute("SELECT tick, COUNT(*) FROM events GROUP BY tick ORDER BY tick").fetchall())
+        self.assertEqual(counts, {3: 27, 4: 8, 5: 8, 6: 3})
+
+    def test_buffer_that_drops_from_the_front(self):
+        self.assertEqual(chronicle_tail_start(["a", "b", "c", "d"], ["c", "d", "e"]), 2)
+        self.assertEqual(chronicle_tail_start(["a", "b"], ["a", "b", "c"]), 2)
+
+    def test_repeated_event_aligns_on_the_surviving_tail(self):
+        self.assertEqual(chronicle_tail_start(["x", "x"], ["x", "y"]), 1)
+        self.assertEqual(chronicle_tail_start(["x", "y", "x"], ["x", "y", "x", "z"]), 3)
+
+    def test_unaligned_or_empty_buffers_start_at_zero(self):
+        self.assertEqual(chronicle_tail_start(["a", "b"], ["c", "d"]), 0)
+        self.assertEqual(chronicle_tail_start(None, ["a"]), 0)
+        self.assertEqual(chronicle_tail_start(["a"], []), 0)
+
+
+class TestFingerprintedMutations(SampleDatabaseTest):
+    def diff(self, previous, current):
+        return diff_fingerprinted_branch(
+            previous, current,
+            branch_fingerprints(previous, INTERESTING_AGENT_FIELDS), branch_fingerprints(current, INTERESTING_AGENT_FIELDS),
+            INTERESTING_AGENT_FIELDS,
+        )
+
+    def test_untracked_change_is_skipped(self):
+        previous = {"p": {"wealth_tag": "COMFORTABLE", "event_memory": [1]}}
+        current = {"p": {"wealth_tag": "COMFORTABLE", "event_memory": [1, 2]}}
+        self.assertEqual(self.diff(previous, current), [])
+        # The unfingerprinted diff still reports it as a catch-all row
+        self.assertEqual([changes.keys() for _id, changes in diff_indexed_branch(previous, current, INTERESTING_AGENT_FIELDS)], [{"value"}])
+
+    def test_tracked_change_creation_and_removal(self):
+        previous = {"p": {"wealth_tag": "COMFORTABLE", "event_memory": [1]}, "gone": {"wealth_tag": "BROKE"}}
+        current = {"p": {"wealth_tag": "WEALTHY", "event_memory": [1, 2]}, "new": {"wealth_tag": "BROKE"}}
+        rows = dict(self.diff(previous, current))
+        self.assertEqual(rows["p"], {"wealth_tag": {"before": "COMFORTABLE", "after": "WEALTHY"}})
+        self.assertEqual(rows["gone"].keys(), {"removed"})
+        self.assertEqual(rows["new"].keys(), {"created"})
+
+    def test_sample_has_no_catch_all_rows(self):
+        allowed = set(INTERESTING_AGENT_FIELDS) | {"created", "removed"}
+        rows = self.conn.execute("SELECT data FROM mutations WHERE entity_type = 'agent'").fetchall()
+        self.assertTrue(rows)
+        for row in rows:
+            self.assertLessEqual(json.loads(row["data"]).keys(), allowed)
+        counted = self.conn.execute("SELECT SUM(mutation_count) FROM snapshots").fetchone()[0]
+        self.assertEqual(counted, self.conn.execute("SELECT COUNT(*) FROM mutations").fetchone()[0])
+        self.assertEqual(counted, 54)
+
+    def test_database_from_older_inference_is_not_resumed(self):
+        self.assertTrue(LogIngester(self.conn, SAMPLE_LOG, progress=False).resume())
+        self.conn.execute("DELETE FROM metadata WHERE key = 'mutation_inference'")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(LogIngester(self.conn, SAMPLE_LOG, progress=False).resume())
+        finally:
+            self.conn.rollback()
+
+
+class TestSearch(SampleDatabaseTest):
+    def setUp(self):
+        if not has_table(self.conn, "search"):
+            self.skipTest("this SQLite build has no FTS5")
+
+    def search(self, text, **filters):
+        return search_rows(self.conn.cursor(), fts_query(text), limit=1000, **filters)
+
+    def test_query_syntax(self):
+        self.assertEqual(fts_query('persist* "rest ticks" x'), '"persist"* "rest ticks" "x"')
+        self.assertEqual(fts_query(' "" * '), "")
+
+    def test_name_matches_events_and_mutations(self):
+        rows = self.search("persistent_milo")
+        self.assertEqual({row["kind"] for row in rows}, {"event", "mutation"})
+        for row in rows:
+            self.assertIn(SEARCH_MARKS[0], row["names"] + row["text"])
+            if row["kind"] == "mutation":
+                self.assertEqual(row["entity_id"], "persistent_milo")
+
+    def test_every_word_must_match(self):
+        rows = self.search("attack persistent_vera")
+        self.assertTrue(rows)
+        self.assertLess(len(rows), len(self.search("attack")))
+        for row in rows:
+            event = json.loads(row["event_data"])
+            self.assertEqual(event["action"], "attack")
+            self.assertIn("persistent_vera", row["event_data"])
+
+    def test_tick_and_run_filters(self):
+        run_id = self.conn.execute("SELECT run_id FROM runs").fetchone()[0]
+        rows = self.search("persistent*", run_id=run_id, tick_from=4, tick_to=4)
+        self.assertTrue(rows)
+        self.assertEqual({row["tick"] for row in rows}, {4})
+        self.assertEqual(self.search("persistent*", run_id="no such run"), [])
+
+    def test_index_update_is_incremental(self):
+        indexed = self.conn.execute("SELECT COUNT(*) FROM search").fetchone()[0]
+        stored = sum(self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("events", "mutations"))
+        self.assertEqual(indexed, stored)
+        update_search_index(self.conn)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM search").fetchone()[0], indexed)
+        self.conn.rollback()
+
+    def test_search_page_highlights_matches(self):
+        page = self.render(log_browser.build_url("/search", {"q": "persistent_milo"})).decode("utf-8")
+        self.assertIn("<mark>", page)
+        self.assertNotIn("no matches", page)
+
+
+if __name__ == "__main__":
+    unittest.main()
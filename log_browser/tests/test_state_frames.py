@@ -0,0 +1,116 @@
+"""Unit tests for the keyframe + delta state store behind /state.
+
+Run:
+    python3 -m unittest tests.test_state_frames -v
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import log_browser
+from log_browser import LogIngester, apply_state_delta, ensure_schema, init_db, load_state, state_delta
+
+SAMPLE_LOG = os.path.join(os.path.dirname(__file__), "..", "log_stream_sample.txt")
+
+
+def logged_states(log_path):
+    """{(run_id, tick): game_state} for every tick_snapshot in the log."""
+    states = {}
+    with open(log_path, "rb") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line.startswith(b"{"):
+                continue
+            record = json.loads(line)
+            if record.get("record_type") == "tick_snapshot":
+                states[(record["run_id"], record["sim_tick"])] = record["game_state"]
+    return states
+
+
+class TestStateFrames(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.logged = logged_states(SAMPLE_LOG)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "legends.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ingest(self, keyframe_interval):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        self.addCleanup(conn.close)
+        init_db(conn)
+        ingester = LogIngester(conn, SAMPLE_LOG, progress=False, keyframe_interval=keyframe_interval)
+        ingester.ingest_available(final=True)
+        ingester.checkpoint()
+        ensure_schema(conn)
+        return conn
+
+    def test_every_tick_rebuilds_the_logged_state(self):
+        for interval in (1, 2, 3, 50):
+            with self.subTest(keyframe_interval=interval):
+                conn = self.ingest(interval)
+                for (run_id, tick), game_state in self.logged.items():
+                    frame_tick, _keyframe_tick, state = load_state(conn.cursor(), run_id, tick)
+                    self.assertEqual(frame_tick, tick)
+                    self.assertEqual(state, game_state)
+
+    def test_keyframes_fall_on_the_interval(self):
+        conn = self.ingest(2)
+        frames = [tuple(row) for row in conn.execute("SELECT tick, kind FROM state_frames ORDER BY tick")]
+        self.assertEqual(frames, [(3, "key"), (4, "delta"), (5, "key"), (6, "delta")])
+        run_id = next(iter(self.logged))[0]
+        # Either side of the boundary at tick 5: a delta on the old keyframe, then the new keyframe alone
+        self.assertEqual(load_state(conn.cursor(), run_id, 4)[:2], (4, 3))
+        self.assertEqual(load_state(conn.cursor(), run_id, 5)[:2], (5, 5))
+
+    def test_tick_between_frames_uses_latest_earlier_frame(self):
+        conn = self.ingest(2)
+        run_id = next(iter(self.logged))[0]
+        self.assertIsNone(load_state(conn.cursor(), run_id, 2))
+        frame_tick, keyframe_tick, state = load_state(conn.cursor(), run_id, 1000)
+        self.assertEqual((frame_tick, keyframe_tick), (6, 5))
+        self.assertEqual(state, self.logged[(run_id, 6)])
+
+    def test_state_json_endpoint(self):
+        self.ingest(2)
+        run_id, tick = sorted(self.logged)[1]
+        handler = log_browser.BenchmarkHandler(log_browser.build_url("/state", {"run": run_id, "tick": tick, "format": "json"}))
+        with mock.patch.object(log_browser, "DB_FILE", self.db_path):
+            handler.do_GET()
+        head, _, body = handler.wfile.getvalue().partition(b"\r\n\r\n")
+        self.assertIn(b" 200 ", head.split(b"\r\n")[0])
+        payload = json.loads(body)
+        self.assertEqual(payload["tick"], tick)
+        self.assertEqual(payload["game_state"], self.logged[(run_id, tick)])
+
+    def test_delta_round_trip_with_removals(self):
+        before = {
+            "agents": {"a": {"hp": 1}, "b": {"hp": 2}},
+            "chronicle_events": [1, 2, 3],
+            "gone": True,
+            "clock": 1,
+        }
+        after = {
+            "agents": {"a": {"hp": 5}, "c": {"hp": 3}},
+            "chronicle_events": [2, 3, 4],
+            "clock": 2,
+        }
+        delta = state_delta(before, after)
+        self.assertEqual(delta["lists"]["chronicle_events"], {"drop": 1, "append": [4]})
+        self.assertEqual(apply_state_delta(json.loads(json.dumps(before)), delta), after)
+
+
+if __name__ == "__main__":
+    unittest.main()
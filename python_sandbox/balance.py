@@ -0,0 +1,285 @@
+"""Monte Carlo balance runs over the headless engine.
+
+    python3 balance.py --policy greedy --sessions 5000 --route "Korr Anchorage,Orin's Reach,New Eden"
+    python3 balance.py --policy cautious --replay 1042
+
+Each session is seeded (seed = --seed + index), so any outlier in the report
+can be replayed move by move with --replay.
+"""
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from models import Tool
+from oracles import TOOLS_LIBRARY, get_action_tracks
+from engine import (Policy, ACTIONS, setup_game, generate_sector_hooks, best_track, route_distance,
+                    perform_action, travel, converse, send_message, resolve_message, advance_goal, resolve_goal)
+
+TRACK_CHANGE = re.compile(r'\[(Health|Wealth|Morale|Supplies) ([+-]\d+)\]')
+BOND_STRENGTHS = ["SEVERED", "FRAGILE", "STABLE", "DEEP"]
+DEFEATS = ["EXILED", "STRANDED", "HOME COLLAPSED"]
+
+
+class Strategy(Policy):
+    """A simulated player: the engine's decisions plus the turn-level choices the CLI leaves to a human."""
+    name = None
+
+    def __init__(self, rng, echo=False):
+        self.rng = rng
+        self.echo = echo
+
+    def show(self, text, tone=None):
+        if self.echo:
+            print(text)
+
+    def approach(self, game, track_name):
+        return "cautious"
+
+    def pick_action(self, game, hook):
+        """(action, track) for this turn's action check."""
+        actions = [a for p in hook.paths for a in p[1]] if hook else ACTIONS
+        tracks = {a: best_track(game, a) for a in actions}
+        mods = {t: game.player.get_track_modifier(t)[0] for t in set(tracks.values())}
+        action = max(actions, key=lambda a: mods[tracks[a]])
+        return action, tracks[action]
+
+    def pick_bond(self, game):
+        deep = [b for b in game.player.bonds if b.strength == "DEEP"]
+        return deep[0] if deep else None
+
+    def pick_tool(self, game):
+        return next((t for t in game.player.tools if t.is_usable()), None)
+
+
+class GreedyStrategy(Strategy):
+    """Takes the option worth the most track points (double weight near a tier floor) and every bond gain."""
+    name = "greedy"
+
+    def score(self, game, option):
+        score = 0
+        for track, amount in TRACK_CHANGE.findall(option):
+            weight = 2 if game.player.tracks[track].tier_idx <= 1 else 1
+            score += int(amount) * weight
+        if "[Strengthen one bond" in option:
+            score += 1
+        if "[Weaken one bond" in option:
+            score -= 1
+        return score
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        scores = [self.score(game, o) for o in options]
+        return scores.index(max(scores))
+
+    def choose_bond(self, game, prompt):
+        ranks = [BOND_STRENGTHS.index(b.strength) for b in game.player.bonds]
+        # Shore up the weakest bond; sacrifice the strongest
+        return ranks.index(min(ranks) if "Strengthen" in prompt else max(ranks))
+
+    def confirm(self, game, question):
+        return "Strengthen" in question
+
+    def approach(self, game, track_name):
+        return "risky" if game.player.get_track_modifier(track_name)[0] >= 1 else "cautious"
+
+
+class CautiousStrategy(GreedyStrategy):
+    """Greedy choices, but never rolls risky."""
+    name = "cautious"
+
+    def approach(self, game, track_name):
+        return "cautious"
+
+
+class RandomStrategy(Strategy):
+    """Uniformly random at every decision point."""
+    name = "random"
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        return self.rng.randrange(len(options))
+
+    def choose_bond(self, game, prompt):
+        return self.rng.randrange(len(game.player.bonds))
+
+    def confirm(self, game, question):
+        return self.rng.random() < 0.5
+
+    def approach(self, game, track_name):
+        return self.rng.choice(["cautious", "risky"])
+
+    def pick_action(self, game, hook):
+        action = self.rng.choice([a for p in hook.paths for a in p[1]] if hook else ACTIONS)
+        return action, self.rng.choice(get_action_tracks(action))
+
+    def pick_bond(self, game):
+        return self.rng.choice(game.player.bonds + [None])
+
+    def pick_tool(self, game):
+        return self.rng.choice(game.player.tools + [None])
+
+
+STRATEGIES = {s.name: s for s in (GreedyStrategy, CautiousStrategy, RandomStrategy)}
+
+
+def take_turn(game, strategy, route, stats):
+    """One player turn: answer requests, cash in goals, follow the route, otherwise act."""
+    here = game.current_sector.name
+
+    for n in [n for n in game.notifications if not n.resolved]:
+        npc_here = any(npc.name == n.source for npc in game.get_npcs_at_sector(here))
+        if npc_here:
+            converse(game, strategy, n.source)
+        else:
+            send_message(game, strategy, n.source, "Answering your request")
+        return
+
+    arrived = next((m for m in game.message_queue if m.status == "ARRIVED"), None)
+    if arrived:
+        resolve_message(game, strategy, arrived.id, strategy.approach(game, "Morale"))
+        return
+
+    done = next((g for g in game.player.goals if g.progress >= 10), None)
+    if done:
+        result = resolve_goal(game, strategy, done.id, strategy.approach(game, "Morale"))
+        if result.fulfilled:
+            stats["goals"].append((done.rank, game.clock))
+        return
+
+    if route:
+        result = travel(game, strategy, route.pop(0))
+        stats["jumps"] += 1
+        if result.arrived and not route and not game.game_over:
+            stats["route_done"] = True
+        return
+
+    anchor = next((g.anchor for g in game.player.goals if g.anchor in game.sectors), None)
+    if anchor and anchor != here and route_distance(game, anchor) is not None:
+        travel(game, strategy, anchor)
+        return
+
+    hook = next((h for h in game.current_sector.hooks if not h.resolved), None)
+    action, track_name = strategy.pick_action(game, hook)
+    approach = strategy.approach(game, track_name)
+    result = perform_action(game, strategy, action, track_name, approach, hook=hook,
+                            bond=strategy.pick_bond(game), tool=strategy.pick_tool(game))
+    if not result.failed:
+        # Stands in for the player declaring that the action served a goal
+        goal = next((g for g in game.player.goals if g.anchor in (None, here) and g.progress < 10), None)
+        if goal:
+            advance_goal(game, strategy, goal.id, 2, is_risky_success=approach == "risky" and result.succeeded)
+
+
+def play_session(seed, policy="greedy", ticks=60, start=None, route=(), echo=False):
+    """Play one seeded session to defeat or *ticks*; returns a plain dict for aggregation."""
+    random.seed(seed)
+    strategy = STRATEGIES[policy](random.Random(seed), echo=echo)
+    game = setup_game(write_log=False, verbose=echo)
+    if start:
+        game.current_sector = game.sectors[start]
+    # Session zero: one personal tool
+    game.player.tools.append(Tool(*strategy.rng.choice(TOOLS_LIBRARY)))
+
+    route = list(route)
+    stats = {"goals": [], "jumps": 0, "route_done": not route}
+    while not game.game_over and game.clock < ticks:
+        generate_sector_hooks(game)
+        take_turn(game, strategy, route, stats)
+
+    defeat = next((d for alert in game.pending_alerts for d in DEFEATS if f"[GAME OVER: {d}]" in alert), None)
+    return {
+        "seed": seed,
+        "ticks": game.clock,
+        "defeat": defeat,
+        "defeat_during_route": defeat is not None and not stats["route_done"],
+        "mutinies": sum("Mutiny occurred" in e for e in game.chronicle),
+        "tiers": {name: t.tier_name for name, t in game.player.tracks.items()},
+        "bonds": [b.strength for b in game.player.bonds],
+        "goals": stats["goals"],
+        "jumps": stats["jumps"],
+        "route_done": stats["route_done"],
+    }
+
+
+def run_batch(seeds, policy, ticks, start, route):
+    return [play_session(seed, policy, ticks, start, route) for seed in seeds]
+
+
+def run(sessions, policy="greedy", seed=0, ticks=60, start=None, route=(), workers=None, chunk=250):
+    seeds = list(range(seed, seed + sessions))
+    batches = [seeds[i:i + chunk] for i in range(0, len(seeds), chunk)]
+    if workers == 1:
+        return [r for b in batches for r in run_batch(b, policy, ticks, start, route)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_batch, b, policy, ticks, start, route) for b in batches]
+        return [r for f in futures for r in f.result()]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(results, policy, elapsed, show_seeds=5):
+    n = len(results)
+    print(f"{policy}: {n} sessions in {elapsed:.2f}s ({n / elapsed:.0f}/s)")
+
+    print("\nDEFEATS (from check_clock_events):")
+    defeats = Counter(r["defeat"] for r in results)
+    for d in DEFEATS:
+        seeds = [r["seed"] for r in results if r["defeat"] == d][:show_seeds]
+        during = sum(r["defeat"] == d and r["defeat_during_route"] for r in results)
+        print(f"  {d:<15} {defeats[d] / n:7.2%}  ({during} before the route was done)  seeds: {seeds}")
+    print(f"  {'survived':<15} {defeats[None] / n:7.2%}")
+    mutinous = [r["seed"] for r in results if r["mutinies"]]
+    print(f"  {'mutiny (any)':<15} {len(mutinous) / n:7.2%}  seeds: {mutinous[:show_seeds]}")
+    if any(r["jumps"] for r in results):
+        print(f"  {'route done':<15} {sum(r['route_done'] for r in results) / n:7.2%}")
+
+    print("\nFINAL TIERS:")
+    for track in results[0]["tiers"]:
+        counts = Counter(r["tiers"][track] for r in results)
+        print(f"  {track:<9} " + "  ".join(f"{tier} {c / n:.1%}" for tier, c in counts.most_common()))
+    counts = Counter(s for r in results for s in r["bonds"])
+    total = sum(counts.values())
+    print(f"  {'Bonds':<9} " + "  ".join(f"{s} {counts[s] / total:.1%}" for s in BOND_STRENGTHS))
+
+    print("\nGOAL COMPLETION (tick fulfilled):")
+    by_rank = {}
+    for r in results:
+        for rank, tick in r["goals"]:
+            by_rank.setdefault(rank, []).append((tick, r["seed"]))
+    if not by_rank:
+        print("  none fulfilled")
+    for rank, done in sorted(by_rank.items()):
+        ticks = [t for t, _ in done]
+        slowest = sorted(done, reverse=True)[:show_seeds]
+        print(f"  {rank:<6} {len(done) / n:6.1%} of sessions  median T{percentile(ticks, 0.5)}  "
+              f"p90 T{percentile(ticks, 0.9)}  slowest seeds: {[s for _, s in slowest]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policy", choices=sorted(STRATEGIES), default="greedy")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="first seed; session i uses seed + i")
+    parser.add_argument("--ticks", type=int, default=60, help="world clock limit per session")
+    parser.add_argument("--start", help="starting sector (default Elace Station)")
+    parser.add_argument("--route", default="", help="comma-separated sectors to travel to, in order, before free play")
+    parser.add_argument("--workers", type=int, help="processes (default: CPU count; 1 runs in-process)")
+    parser.add_argument("--replay", type=int, metavar="SEED", help="replay one session with full narration")
+    args = parser.parse_args()
+    route = [s.strip() for s in args.route.split(",") if s.strip()]
+
+    if args.replay is not None:
+        result = play_session(args.replay, args.policy, args.ticks, args.start, route, echo=True)
+        print(f"\n{result}")
+        return
+
+    started = time.perf_counter()
+    results = run(args.sessions, args.policy, args.seed, args.ticks, args.start, route, args.workers)
+    report(results, args.policy, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,679 @@
+"""Headless game engine: the rules shared by the CLI (main.py) and the TUI (tui.py).
+
+Nothing here reads input or prints. Every decision point is a call on a Policy
+object and every flow returns a result object, so a whole session can be
+scripted in-process (see epic_session.py --headless).
+"""
+import heapq
+import random
+from models import GameState, Sector, NPC, Vessel, Hook, Goal, Message
+from oracles import (get_complication, get_opportunity, get_community_cost, get_pre_flight_crew,
+                     roll_3d6, roll_disposition, roll_conversation_seed, get_action_tracks,
+                     generate_dynamic_hook)
+
+ACTIONS = ["command", "navigate", "endure", "overcome", "scavenge", "repair", "barter", "acquire", "petition", "convince", "investigate", "scan"]
+KINETIC_ACTIONS = ["command", "navigate", "scavenge", "repair"]
+GOAL_ADVANCE_LIMITS = {"MINOR": 2, "MAJOR": 1, "EPIC": 1}
+
+
+class Policy:
+    """Answers the engine's decision points.
+
+    The defaults take the first option and the first bond, decline every
+    yes/no question and write no reflections. Front-ends override them.
+    """
+    def show(self, text, tone=None):
+        """Narration for a human reader. tone is None, "good", "warning" or "fail"."""
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        """Index of the oracle/hook option to apply."""
+        return 0
+
+    def choose_bond(self, game, prompt):
+        """Index into game.player.bonds."""
+        return 0
+
+    def confirm(self, game, question):
+        return False
+
+    def reflect(self, game, prompt):
+        """Free text for chronicle.md, or "" to skip."""
+        return ""
+
+
+class ScriptedPolicy(Policy):
+    """Replays queued answers, falling back to the Policy defaults when a queue runs dry."""
+    def __init__(self, options=(), bonds=(), confirms=(), reflections=()):
+        self.options = list(options)
+        self.bonds = list(bonds)
+        self.confirms = list(confirms)
+        self.reflections = list(reflections)
+        self.transcript = []
+
+    def show(self, text, tone=None):
+        self.transcript.append(text)
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        return self.options.pop(0) if self.options else 0
+
+    def choose_bond(self, game, prompt):
+        return self.bonds.pop(0) if self.bonds else 0
+
+    def confirm(self, game, question):
+        return self.confirms.pop(0) if self.confirms else False
+
+    def reflect(self, game, prompt):
+        return self.reflections.pop(0) if self.reflections else ""
+
+
+class ActionResult:
+    def __init__(self, track, approach, roll, mod, total, outcome, is_crisis):
+        self.track = track
+        self.approach = approach
+        self.roll = roll
+        self.mod = mod
+        self.total = total
+        self.outcome = outcome
+        self.is_crisis = is_crisis
+        self.applied = []   # (label, option, [result strings]) per option applied
+        self.changes = []   # bond and tool consequences
+
+    @property
+    def succeeded(self):
+        return "Success" in self.outcome
+
+    @property
+    def failed(self):
+        return self.outcome in ["Setback", "Crisis"]
+
+
+class TravelResult:
+    def __init__(self, destination):
+        self.destination = destination
+        self.distance = None
+        self.applied = []      # community cost and crew check options
+        self.encounters = []   # (step, "Hazard"/"Opportunity", name)
+        self.hails = []        # ConverseResult per vessel hailed en route
+        self.arrived = False
+        self.error = None
+
+
+class ConverseResult:
+    def __init__(self, npc_name):
+        self.npc_name = npc_name
+        self.seed = None
+        self.mood = None        # disposition for NPCs, morale for crew
+        self.is_crew = False
+        self.reflection = ""
+        self.resolved = []      # sources of notifications resolved by this conversation
+        self.error = None
+
+
+class GoalResult:
+    def __init__(self, goal_id):
+        self.goal_id = goal_id
+        self.goal = None
+        self.action = None
+        self.fulfilled = False
+        self.error = None
+
+
+def setup_game(write_log=True, verbose=True):
+    game = GameState(write_log=write_log)
+    game.verbose = verbose
+
+    # Initialize Sectors with randomized tracks
+    def rt(): return random.randint(2, 8)
+    game.sectors["Elace Station"] = Sector("Elace Station", "Planet", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
+    game.sectors["Korr Anchorage"] = Sector("Korr Anchorage", "Moon", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
+    game.sectors["Veyra Hub"] = Sector("Veyra Hub", "Star", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
+    game.sectors["The Scatter"] = Sector("The Scatter", "Field", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
+    game.sectors["Orin's Reach"] = Sector("Orin's Reach", "Deep Space", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
+    game.sectors["New Eden"] = Sector("New Eden", "Deep Space", wealth=0, security=0, morale=0, supplies=0) # Keeps dead sector theme
+
+    game.routes = {
+        "Elace Station": {"Korr Anchorage": 1, "Veyra Hub": 2},
+        "Korr Anchorage": {"Elace Station": 1, "The Scatter": 1, "Orin's Reach": 3},
+        "Veyra Hub": {"Elace Station": 2, "The Scatter": 2, "New Eden": 4},
+        "The Scatter": {"Korr Anchorage": 1, "Veyra Hub": 2, "Orin's Reach": 1},
+        "Orin's Reach": {"Korr Anchorage": 3, "The Scatter": 1, "New Eden": 2},
+        "New Eden": {"Veyra Hub": 4, "Orin's Reach": 2}
+    }
+
+    # Initialize NPCs
+    game.npcs = {
+        "npc_kaelen": NPC("npc_kaelen", "Kaelen", "Kin", "Calm", home_sector="Elace Station"),
+        "npc_relt": NPC("npc_relt", "Overseer Relt", "Administrator", "Worried", home_sector="Elace Station"),
+        "npc_tyra": NPC("npc_tyra", "Dockmaster Tyra", "Logistics", "Frustrated", home_sector="Korr Anchorage"),
+        "npc_voss": NPC("npc_voss", "Voss", "Mentor", "Hopeful", vessel_id="ves_lantern"),
+        "npc_sera": NPC("npc_sera", "Sera", "Debtor", "Distant", vessel_id="ves_ember"),
+        "npc_daro": NPC("npc_daro", "Daro", "Captain", "Calm", vessel_id="ves_ironweed"),
+        "npc_maren": NPC("npc_maren", "Maren", "Captain", "Eager", vessel_id="ves_kestrel"),
+        "npc_fen": NPC("npc_fen", "Fen", "Captain", "Worried", vessel_id="ves_hull07"),
+        "npc_lia": NPC("npc_lia", "Lia", "Captain", "Hopeful", vessel_id="ves_dustwren")
+    }
+
+    # Initialize Vessels
+    game.vessels = {
+        "ves_lantern": Vessel("ves_lantern", "Stray Lantern", "Light hauler", "Voss", ["npc_voss"], "Korr Anchorage", "Korr Anchorage", "supply_run"),
+        "ves_ember": Vessel("ves_ember", "Quiet Ember", "Survey platform", "Sera", ["npc_sera"], "Veyra Hub", "Veyra Hub", "survey"),
+        "ves_ironweed": Vessel("ves_ironweed", "Ironweed", "Tanker", "Daro", ["npc_daro"], "Elace Station", "Elace Station", "supply_run"),
+        "ves_kestrel": Vessel("ves_kestrel", "Kestrel", "Patrol craft", "Maren", ["npc_maren"], "Veyra Hub", "Veyra Hub", "patrol"),
+        "ves_hull07": Vessel("ves_hull07", "Hull 07", "Repair tender", "Fen", ["npc_fen"], "Korr Anchorage", "Korr Anchorage", "repair_tender"),
+        "ves_dustwren": Vessel("ves_dustwren", "Dust Wren", "Light hauler", "Lia", ["npc_lia"], "Orin's Reach", "Orin's Reach", "supply_run")
+    }
+
+    # Randomize Player Initial State
+    for track_name, track in game.player.tracks.items():
+        track.value = random.randint(3, 8)
+        # change(0) fixes the tier name after the value is modified
+        track.change(0)
+
+    bond_strengths = ["FRAGILE", "STABLE", "DEEP"]
+    for b in game.player.bonds:
+        b.strength = random.choice(bond_strengths)
+
+    game.current_sector = game.sectors["Elace Station"]
+    game.phase = "Encounter"
+    return game
+
+def generate_sector_hooks(game):
+    # Only generate hooks for Encounter phase
+    if game.phase == "Encounter":
+        game.current_sector.hooks = [h for h in game.current_sector.hooks if not h.resolved]
+
+        # Fill hooks up to 2, tracking used sentences to avoid duplicates
+        current_npcs = game.get_npcs_at_sector(game.current_sector.name)
+        used_sentences = {h.name for h in game.current_sector.hooks}
+        while len(game.current_sector.hooks) < 2 and current_npcs:
+            provider = random.choice(current_npcs)
+            name, htype, paths, succ, fail = generate_dynamic_hook(game.current_sector, provider, used_sentences)
+            game.current_sector.hooks.append(Hook(name, htype, provider.name, paths, success_opt=succ, fail_opt=fail))
+
+def roll_check(approach, mod, roll=None):
+    """Resolve a 3d6 + mod check. Returns (roll, total, outcome, is_crisis)."""
+    if roll is None:
+        roll = roll_3d6()
+    total = roll + mod
+    is_crisis = False
+    is_outstanding = False
+
+    if approach == "risky":
+        if roll <= 5:
+            total = 6
+            is_crisis = True
+        elif roll >= 16:
+            total = 15
+            is_outstanding = True
+
+    if total <= 6:
+        outcome = "Crisis" if is_crisis else "Setback"
+    elif total <= 10:
+        outcome = "Partial"
+    elif total <= 14:
+        outcome = "Success"
+    else:
+        outcome = "Success (Outstanding)" if is_outstanding else "Success"
+    return roll, total, outcome, is_crisis
+
+def route_distance(game, dest_name):
+    """Shortest route length (Dijkstra over game.routes), or None if unreachable."""
+    distances = {s: float('inf') for s in game.sectors}
+    distances[game.current_sector.name] = 0
+    pq = [(0, game.current_sector.name)]
+
+    while pq:
+        d, current = heapq.heappop(pq)
+        if d > distances[current]:
+            continue
+        if current == dest_name:
+            break
+        for neighbor, weight in game.routes.get(current, {}).items():
+            dist = d + weight
+            if dist < distances[neighbor]:
+                distances[neighbor] = dist
+                heapq.heappush(pq, (dist, neighbor))
+
+    distance = distances[dest_name]
+    return None if distance == float('inf') else distance
+
+def best_track(game, action_name):
+    """The action's track with the higher modifier (the first one on ties)."""
+    valid_tracks = get_action_tracks(action_name)
+    track_name = valid_tracks[0]
+    for other in valid_tracks[1:]:
+        if game.player.get_track_modifier(other)[0] > game.player.get_track_modifier(track_name)[0]:
+            track_name = other
+    return track_name
+
+def action_modifier(game, track_name, tags=(), bond=None, tool=None):
+    """Total roll modifier and a description of each contribution."""
+    mod = game.player.tracks[track_name].modifier
+    notes = []
+    for t in tags:
+        mod += t.modifier_value
+        notes.append(f"{t.name} ({t.modifier_value:+d})")
+    if bond:
+        b_mod = 1 if bond.strength == "DEEP" else (-1 if bond.strength == "SEVERED" else 0)
+        mod += b_mod
+        notes.append(f"{bond.name} bond ({b_mod:+d})")
+    if tool and tool.bonus() > 0:
+        mod += tool.bonus()
+        notes.append(f"{tool.name} (+{tool.bonus()})")
+
+    # Sector context
+    sector_tracks = list(game.current_sector.tracks.values())
+    avg_sector = sum(t.value for t in sector_tracks) / 4.0
+    if avg_sector > 6:
+        mod += 1
+        notes.append("Sector Conditions (+1)")
+    elif avg_sector < 4:
+        mod -= 1
+        notes.append("Sector Conditions (-1)")
+
+    return max(-4, min(4, mod)), notes
+
+def apply_options(game, policy, options_to_pick, is_crisis=False):
+    """Let the policy pick one option from each (label, options) pair and apply it."""
+    applied = []
+    for opt_type, opt_list in options_to_pick:
+        selected = opt_list[policy.choose_option(game, opt_type, opt_list, is_crisis)]
+        results = game.player.apply_option(selected, is_crisis=is_crisis, current_sector_name=game.current_sector.name)
+        policy.show(f"Applied: {selected}")
+        outcomes = []
+        for res in results:
+            if "choose a bond to STRENGTHEN" in res or "choose a bond to WEAKEN" in res:
+                if not game.player.bonds:
+                    continue
+                if "STRENGTHEN" in res:
+                    b = game.player.bonds[policy.choose_bond(game, "Strengthen which bond?")]
+                    res = b.modify(1)
+                else:
+                    b = game.player.bonds[policy.choose_bond(game, "Weaken which bond?")]
+                    res = b.modify(-1)
+                game.reflection_pending = True
+            elif "Shifted from" in res:
+                game.reflection_pending = True
+            policy.show(f" -> {res}")
+            game.log(res)
+            outcomes.append(res)
+        applied.append((opt_type, selected, outcomes))
+    return applied
+
+def roll_action(game, policy, track_name, approach, mod, hook=None, used_bond=None, used_tool=None):
+    roll, total, outcome, is_crisis = roll_check(approach, mod)
+    result = ActionResult(track_name, approach, roll, mod, total, outcome, is_crisis)
+
+    policy.show(f"\n[ACTION CHECK] Rolled 3d6: {roll} + Mod: {mod} = Total: {roll + mod}")
+    policy.show(f"Outcome: {outcome.upper()}")
+
+    in_space = game.phase == "Travel"
+    options_to_pick = []
+
+    if hook:
+        if "Success" in outcome:
+            policy.show(f"\n[HOOK SUCCESS] {hook.success_opt}")
+            options_to_pick.append(("Hook Success", [hook.success_opt]))
+        elif outcome == "Partial":
+            policy.show(f"\n[HOOK SUCCESS] {hook.success_opt}")
+            policy.show(f"[HOOK FAILURE] {hook.fail_opt}")
+            options_to_pick.append(("Hook Success", [hook.success_opt]))
+            options_to_pick.append(("Hook Failure", [hook.fail_opt]))
+        else:
+            policy.show(f"\n[HOOK FAILURE] {hook.fail_opt}")
+            if is_crisis:
+                policy.show("CRISIS ACTIVE: Any negative track hits in your choice will be doubled (-2)!")
+            options_to_pick.append(("Hook Failure", [hook.fail_opt]))
+    else:
+        if "Success" in outcome:
+            opp_name, adv_options = get_opportunity(in_space)
+            policy.show(f"\n[OPPORTUNITY] {opp_name}")
+            options_to_pick.append(("Advantage", adv_options))
+
+        elif outcome == "Partial":
+            opp_name, adv_options = get_opportunity(in_space)
+            comp_name, dis_options = get_complication()
+            policy.show(f"\n[OPPORTUNITY] {opp_name}")
+            policy.show(f"[COMPLICATION] {comp_name}")
+            options_to_pick.append(("Advantage", adv_options))
+            options_to_pick.append(("Disadvantage", dis_options))
+
+        elif outcome in ["Setback", "Crisis"]:
+            comp_name, dis_options = get_complication()
+            policy.show(f"\n[COMPLICATION] {comp_name}")
+            if is_crisis:
+                policy.show("CRISIS ACTIVE: Any negative track hits in your choice will be doubled (-2)!")
+            options_to_pick.append(("Disadvantage", dis_options))
+
+    result.applied = apply_options(game, policy, options_to_pick, is_crisis=is_crisis)
+
+    # Bond consequences — applied after oracle options
+    if used_bond:
+        res = None
+        if "Success" in outcome:
+            # On success: offer bond strengthen as an option
+            policy.show(f"\n[BOND] You acted with {used_bond.name} in mind.", "good")
+            if policy.confirm(game, f"  Strengthen bond with {used_bond.name}? [Y/N]"):
+                res = used_bond.modify(1)
+                policy.show(f" -> {res}")
+        elif outcome == "Partial":
+            # On partial: offer strengthen but also show the risk of -1
+            policy.show(f"\n[BOND] You called on {used_bond.name}'s trust to get through this.", "warning")
+            if policy.confirm(game, f"  Strengthen bond with {used_bond.name}? [Y/N]"):
+                res = used_bond.modify(1)
+                policy.show(f" -> {res}")
+            else:
+                policy.show(f"  (Bond unchanged.)")
+        elif approach == "risky":
+            # On failure: weaken is optional (cautious) or enforced (risky)
+            policy.show(f"\n[BOND] You put {used_bond.name}'s trust on the line — and it cost them.", "fail")
+            res = used_bond.modify(-1)
+            policy.show(f" -> {res} (Risky — enforced)")
+        else:
+            policy.show(f"\n[BOND] {used_bond.name} was involved. Did this damage the relationship?", "warning")
+            if policy.confirm(game, f"  Weaken bond with {used_bond.name}? [Y/N]"):
+                res = used_bond.modify(-1)
+                policy.show(f" -> {res}")
+            else:
+                policy.show(f"  (Bond unchanged — noted for narrative.)")
+        if res:
+            game.log(res)
+            game.reflection_pending = True
+            result.changes.append(res)
+
+    # Tool consequences — applied after bond consequences
+    if used_tool:
+        res = None
+        if "Success" in outcome:
+            # Success: tool is fine, note its contribution
+            policy.show(f"\n[TOOL] {used_tool.name} performed well. Condition: {used_tool.condition}.", "good")
+        elif outcome == "Partial":
+            # Partial: optional wear on cautious, enforced wear on risky
+            if approach == "risky":
+                policy.show(f"\n[TOOL] The {used_tool.name} took strain from that approach.", "warning")
+                res = used_tool.wear()
+                policy.show(f" -> {res} (Risky — enforced)")
+            else:
+                policy.show(f"\n[TOOL] Did the {used_tool.name} take wear from this?", "warning")
+                if policy.confirm(game, f"  Mark {used_tool.name} as Worn? [Y/N]"):
+                    res = used_tool.wear()
+                    policy.show(f" -> {res}")
+        elif approach == "risky":
+            # Failure: wear on cautious, damaged on risky
+            policy.show(f"\n[TOOL] The {used_tool.name} was pushed too hard — it is now Damaged.", "fail")
+            res = used_tool.damage()
+            policy.show(f" -> {res} (Risky — enforced)")
+        else:
+            policy.show(f"\n[TOOL] Did the {used_tool.name} get damaged in this?", "warning")
+            if policy.confirm(game, f"  Mark {used_tool.name} as Worn? [Y/N]"):
+                res = used_tool.wear()
+                policy.show(f" -> {res}")
+            else:
+                policy.show(f"  (Tool unchanged — noted for narrative.)")
+        if res:
+            game.log(res)
+            result.changes.append(res)
+
+    return result
+
+def perform_action(game, policy, action_name, track_name, approach, hook=None, tags=(), bond=None, tool=None):
+    """Roll an action with the modifiers already chosen, then expire tags and advance the clock."""
+    if tool is not None and tool.bonus() <= 0:
+        tool = None
+    mod, _ = action_modifier(game, track_name, tags, bond, tool)
+
+    if action_name in KINETIC_ACTIONS:
+        marker = f"[KINETIC STUB: PILOTING/EVA — {action_name.upper()}]"
+        policy.show(f"\n{marker}")
+        game.log(marker)
+
+    for t in tags:
+        game.player.remove_tag(t.name)
+        policy.show(f"Used and expired tag: {t.name}")
+
+    result = roll_action(game, policy, track_name, approach, mod, hook=hook, used_bond=bond, used_tool=tool)
+
+    if hook and not result.failed:
+        hook.resolved = True
+
+    next_action_tags = [t for t in game.player.tags if t.expiry_type == "next_action"]
+    for t in next_action_tags:
+        game.player.tags.remove(t)
+        policy.show(f"Tag expired (next_action): {t.name}")
+
+    game.advance_clock(1)
+    return result
+
+def travel(game, policy, dest_name):
+    result = TravelResult(dest_name)
+    if dest_name not in game.sectors:
+        result.error = f"Unknown destination: {dest_name}"
+        policy.show(result.error)
+        policy.show(f"Available: {list(game.sectors.keys())}")
+        return result
+
+    distance = route_distance(game, dest_name)
+    if distance is None:
+        result.error = f"No known route to {dest_name}."
+        policy.show(result.error)
+        return result
+    result.distance = distance
+
+    game.phase = "Travel"
+    game.log(f"Initiated travel to {dest_name} (Distance: {distance})")
+    policy.show(f"\n--- PRE-DEPARTURE SEQUENCE (Distance {distance}) ---")
+
+    # 1. Community Cost & Crew Checks (Batched)
+    cost_name, cost_opts = get_community_cost()
+    policy.show(f"\n[COMMUNITY COST] {cost_name}")
+
+    crew_opts = []
+    if random.random() < 0.5:
+        crew_name, crew_opts, ctype = get_pre_flight_crew()
+        policy.show(f"[PRE-FLIGHT CREW CHECK] {ctype}: {crew_name}")
+    else:
+        policy.show("[PRE-FLIGHT CREW CHECK] All crew report ready.")
+
+    options_to_pick = [("Community Cost Option", cost_opts)]
+    if crew_opts:
+        options_to_pick.append(("Crew Check Option", crew_opts))
+    result.applied = apply_options(game, policy, options_to_pick)
+
+    # 2. Kinetic Stub & Travel Transit
+    policy.show(f"\n[KINETIC STUB: FLIGHT MODE — {game.current_sector.name} → {dest_name}]")
+    game.log(f"[KINETIC STUB: FLIGHT MODE — {game.current_sector.name} → {dest_name}]")
+
+    # 3. Travel Transit
+    policy.show(f"\n--- TRAVELING TO {dest_name} ---")
+
+    current_path_sector = game.current_sector.name
+    # Since we don't store the exact path in this simple Dijkstra, we'll just simulate passing through distance number of sectors.
+
+    for step in range(distance):
+        game.player.tracks["Supplies"].change(-1)
+        game.log("Consumed 1 Supplies during travel.")
+
+        # Encounter Phase Check
+        enc = random.randint(1, 6)
+        if enc == 1:
+            policy.show("\n[TRAVEL ENCOUNTER] Hazard! Rolled 1 on Encounter die.")
+            comp_name, dis_opts = get_complication()
+            policy.show(f"Hazard: {comp_name}")
+            result.encounters.append((step, "Hazard", comp_name))
+            result.applied += apply_options(game, policy, [("Hazard Disadvantage", dis_opts)])
+        elif enc == 2:
+            policy.show("\n[TRAVEL ENCOUNTER] Opportunity! Rolled 2 on Encounter die.")
+            opp_name, adv_opts = get_opportunity(in_space=True)
+            policy.show(f"Discovery: {opp_name}")
+            result.encounters.append((step, "Opportunity", opp_name))
+            result.applied += apply_options(game, policy, [("Discovery Advantage", adv_opts)])
+        else:
+            policy.show("Transit sector passed peacefully.")
+
+        # Vessel encounter stub check
+        for v in game.get_vessels_at_sector(current_path_sector):
+            if policy.confirm(game, f"\n[KINETIC STUB: Encountered {v.name} (Captain: {v.captain}) in {current_path_sector}. Hail? [Y/N]]"):
+                if v.captain:
+                    result.hails.append(converse(game, policy, v.captain, override_sector=current_path_sector))
+                else:
+                    policy.show(f"Vessel {v.name} is derelict or has no captain.")
+
+        game.advance_clock(1)
+
+    game.current_sector = game.sectors[dest_name]
+    game.phase = "Encounter"
+    result.arrived = True
+    policy.show(f"\nARRIVED at {dest_name}. Phase: {game.phase}")
+    game.log(f"Arrived at {dest_name}")
+
+    next_travel_tags = [t for t in game.player.tags if t.expiry_type == "next_travel"]
+    for t in next_travel_tags:
+        game.player.tags.remove(t)
+        policy.show(f"Tag expired (next_travel): {t.name}")
+
+    game.reflection_pending = True
+    return result
+
+def converse(game, policy, npc_name, override_sector=None):
+    result = ConverseResult(npc_name)
+
+    # Check crew first
+    crew_member = next((c for c in game.player.crew if c.name.lower() == npc_name.lower()), None)
+    if crew_member:
+        result.npc_name = crew_member.name
+        result.is_crew = True
+        result.seed = roll_conversation_seed()
+        result.mood = crew_member.morale
+        policy.show(f"\n--- CONVERSATION WITH {crew_member.name} (Crew) ---")
+        policy.show(f"{crew_member.name} ({crew_member.role}) — Morale: {crew_member.morale} — Topic: {result.seed}")
+
+        result.reflection = policy.reflect(game, "[Reflect?] (Type your free-text narrative, or press Enter to skip)")
+        game.log(f"Spoke with crew {crew_member.name}. Morale: {crew_member.morale}. Topic: {result.seed}.")
+        if result.reflection:
+            game.log_reflection(result.reflection)
+        policy.show("Conversation logged.")
+        return result
+
+    # Fallback to local NPCs
+    npc = next((n for n in game.get_all_npcs() if n.name.lower() == npc_name.lower()), None)
+    if not npc:
+        result.error = f"Unknown NPC: {npc_name}"
+        policy.show(result.error)
+        return result
+
+    npc_loc = npc.get_location(game)
+    check_loc = override_sector if override_sector else game.current_sector.name
+    if npc_loc != check_loc:
+        vessel_str = f" aboard {npc.vessel_id}" if npc.vessel_id else ""
+        result.error = f"{npc.name} is not here. They are{vessel_str} at {npc_loc}."
+        policy.show(result.error)
+        return result
+
+    result.npc_name = npc.name
+    result.seed = roll_conversation_seed()
+    result.mood = npc.disposition = roll_disposition()
+    policy.show(f"\n--- CONVERSATION WITH {npc.name} ---")
+    policy.show(f"{npc.name} ({npc.role}) — Mood: {result.mood} — Topic: {result.seed}")
+
+    result.reflection = policy.reflect(game, "[Reflect?] (Type your free-text narrative, or press Enter to skip)")
+    game.log(f"Spoke with {npc.name}. Mood: {result.mood}. Topic: {result.seed}.")
+    if result.reflection:
+        game.log_reflection(result.reflection)
+    policy.show("Conversation logged.")
+
+    # Resolve any pending notifications from this NPC
+    for n in game.notifications:
+        if not n.resolved and n.source.lower() == npc.name.lower():
+            n.resolved = True
+            result.resolved.append(n.source)
+            policy.show(f"[SYSTEM] Pending notification from {n.source} resolved.")
+    return result
+
+def send_message(game, policy, to_npc, subject):
+    """Queue a tight-beam message (arrives two ticks later); it also answers pending requests from to_npc."""
+    arr_tick = game.clock + 2
+    msg = Message(f"M{game.msg_counter}", to_npc, game.clock, arr_tick, subject)
+    game.message_queue.append(msg)
+    game.msg_counter += 1
+    game.log(f"Sent tight-beam to {to_npc}. Subject: {subject}")
+    policy.show(f"Message sent. Will arrive at T{arr_tick}.")
+
+    # Resolve any pending notifications from this NPC
+    for n in game.notifications:
+        if not n.resolved and n.source.lower() == to_npc.lower():
+            n.resolved = True
+            policy.show(f"[SYSTEM] Pending notification from {n.source} resolved by sending message.")
+    return msg
+
+def resolve_message(game, policy, msg_id, approach="cautious"):
+    """Roll the petition for an ARRIVED message; None if there is no such message."""
+    for m in game.message_queue:
+        if m.id == msg_id and m.status == "ARRIVED":
+            policy.show(f"Resolving reply for message {m.id} to {m.to_npc}")
+            mod, _ = game.player.get_track_modifier("Morale")
+            result = roll_action(game, policy, "Morale", approach, mod)
+            m.status = "RESOLVED"
+            game.log(f"Resolved message {m.id} with outcome: {result.outcome}")
+            return result
+    policy.show("No pending ARRIVED message found with that ID.")
+    return None
+
+def add_goal(game, statement, rank="MAJOR", anchor=None):
+    goal = Goal(statement, anchor=anchor, rank=rank)
+    game.player.goals.append(goal)
+    game.log(f"Added {rank} goal: {statement}")
+    return goal
+
+def advance_goal(game, policy, goal_id, amount=1, is_risky_success=False):
+    """Advance a goal, capped per action by its rank; None if the id is unknown."""
+    g = next((g for g in game.player.goals if g.id == goal_id), None)
+    if not g:
+        policy.show("Invalid goal ID.")
+        return None
+    max_amt = GOAL_ADVANCE_LIMITS.get(g.rank, 1)
+    if amount > max_amt:
+        policy.show(f"Cannot advance {g.rank} goal by more than {max_amt} per action.")
+        amount = max_amt
+    res = g.advance(amount, is_risky_success=is_risky_success)
+    policy.show(res)
+    game.log(res)
+    return g
+
+def resolve_goal(game, policy, goal_id, approach="cautious"):
+    result = GoalResult(goal_id)
+    g = next((g for g in game.player.goals if g.id == goal_id), None)
+    if not g:
+        result.error = "Invalid goal ID."
+        policy.show(result.error)
+        return result
+    result.goal = g
+    if g.progress < 10:
+        result.error = "Goal must reach 10 progress to resolve."
+        policy.show(result.error)
+        return result
+    policy.show(f"Attempting to resolve goal: {g.statement}")
+    mod, _ = game.player.get_track_modifier("Morale")
+    result.action = roll_action(game, policy, "Morale", approach, mod)
+    if result.action.succeeded:
+        policy.show("Goal FULFILLED!")
+        game.player.goals.remove(g)
+        game.log(f"Goal fulfilled: {g.statement}")
+        game.reflection_pending = True
+        result.fulfilled = True
+    else:
+        policy.show("Goal resolution hit a snag. Retain it or abandon it.")
+        game.log(f"Goal resolution failed: {g.statement}")
+    game.advance_clock(1)
+    return result
+
+def wait(game, policy, ticks=1):
+    """Advance the clock, stopping early when a notification expires. Returns the ticks waited."""
+    waited = 0
+    for _ in range(ticks):
+        will_expire = any(not n.resolved and n.expiry_tick == game.clock + 1 for n in game.notifications)
+        game.advance_clock(1)
+        waited += 1
+        if will_expire:
+            policy.show("\n[!] Wait interrupted! A notification has expired.")
+            break
+    return waited
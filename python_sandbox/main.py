@@ -1,10 +1,10 @@
 import sys
-import random
-from models import GameState, Sector, Goal, Message, NPC, Hook, TempTag, Tool
-from oracles import (get_complication, get_opportunity, get_community_cost, get_pre_flight_crew,
-                     roll_3d6, roll_disposition, roll_conversation_seed, get_action_tracks,
-                     generate_dynamic_hook, get_theme_focus, scene_context,
-                     TOOLS_LIBRARY, STARTING_GOALS)
+from models import Goal, Tool, UndoHistory, UNDO_DEPTH, install_flush_handlers
+from oracles import (get_complication, get_opportunity, roll_disposition, roll_conversation_seed,
+                     get_action_tracks, get_theme_focus, scene_context, TOOLS_LIBRARY, STARTING_GOALS)
+from engine import (Policy, ACTIONS, setup_game, generate_sector_hooks, action_modifier, perform_action,
+                    travel, converse, send_message, resolve_message, add_goal, advance_goal, wait)
+import engine
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -16,80 +16,51 @@ class Colors:
     BOLD = '\033[1m'
     DIM = '\033[2m'
 
-def setup_game():
-    game = GameState()
-    
-    # Initialize Sectors with randomized tracks
-    def rt(): return random.randint(2, 8)
-    game.sectors["Elace Station"] = Sector("Elace Station", "Planet", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
-    game.sectors["Korr Anchorage"] = Sector("Korr Anchorage", "Moon", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
-    game.sectors["Veyra Hub"] = Sector("Veyra Hub", "Star", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
-    game.sectors["The Scatter"] = Sector("The Scatter", "Field", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
-    game.sectors["Orin's Reach"] = Sector("Orin's Reach", "Deep Space", wealth=rt(), security=rt(), morale=rt(), supplies=rt())
-    game.sectors["New Eden"] = Sector("New Eden", "Deep Space", wealth=0, security=0, morale=0, supplies=0) # Keeps dead sector theme
-    
-    game.routes = {
-        "Elace Station": {"Korr Anchorage": 1, "Veyra Hub": 2},
-        "Korr Anchorage": {"Elace Station": 1, "The Scatter": 1, "Orin's Reach": 3},
-        "Veyra Hub": {"Elace Station": 2, "The Scatter": 2, "New Eden": 4},
-        "The Scatter": {"Korr Anchorage": 1, "Veyra Hub": 2, "Orin's Reach": 1},
-        "Orin's Reach": {"Korr Anchorage": 3, "The Scatter": 1, "New Eden": 2},
-        "New Eden": {"Veyra Hub": 4, "Orin's Reach": 2}
-    }
-    
-    # Initialize NPCs
-    game.npcs = {
-        "npc_kaelen": NPC("npc_kaelen", "Kaelen", "Kin", "Calm", home_sector="Elace Station"),
-        "npc_relt": NPC("npc_relt", "Overseer Relt", "Administrator", "Worried", home_sector="Elace Station"),
-        "npc_tyra": NPC("npc_tyra", "Dockmaster Tyra", "Logistics", "Frustrated", home_sector="Korr Anchorage"),
-        "npc_voss": NPC("npc_voss", "Voss", "Mentor", "Hopeful", vessel_id="ves_lantern"),
-        "npc_sera": NPC("npc_sera", "Sera", "Debtor", "Distant", vessel_id="ves_ember"),
-        "npc_daro": NPC("npc_daro", "Daro", "Captain", "Calm", vessel_id="ves_ironweed"),
-        "npc_maren": NPC("npc_maren", "Maren", "Captain", "Eager", vessel_id="ves_kestrel"),
-        "npc_fen": NPC("npc_fen", "Fen", "Captain", "Worried", vessel_id="ves_hull07"),
-        "npc_lia": NPC("npc_lia", "Lia", "Captain", "Hopeful", vessel_id="ves_dustwren")
-    }
-    
-    # Initialize Vessels
-    from models import Vessel
-    game.vessels = {
-        "ves_lantern": Vessel("ves_lantern", "Stray Lantern", "Light hauler", "Voss", ["npc_voss"], "Korr Anchorage", "Korr Anchorage", "supply_run"),
-        "ves_ember": Vessel("ves_ember", "Quiet Ember", "Survey platform", "Sera", ["npc_sera"], "Veyra Hub", "Veyra Hub", "survey"),
-        "ves_ironweed": Vessel("ves_ironweed", "Ironweed", "Tanker", "Daro", ["npc_daro"], "Elace Station", "Elace Station", "supply_run"),
-        "ves_kestrel": Vessel("ves_kestrel", "Kestrel", "Patrol craft", "Maren", ["npc_maren"], "Veyra Hub", "Veyra Hub", "patrol"),
-        "ves_hull07": Vessel("ves_hull07", "Hull 07", "Repair tender", "Fen", ["npc_fen"], "Korr Anchorage", "Korr Anchorage", "repair_tender"),
-        "ves_dustwren": Vessel("ves_dustwren", "Dust Wren", "Light hauler", "Lia", ["npc_lia"], "Orin's Reach", "Orin's Reach", "supply_run")
-    }
-    
-    # Randomize Player Initial State
-    for track_name, track in game.player.tracks.items():
-        track.value = random.randint(3, 8)
-        # We don't bother updating the tier_idx here since the tier checks dynamically when rolling, but for consistency:
-        # Actually it's best to let change(0) run to fix tier names if value is modified.
-        track.change(0)
-        
-    bond_strengths = ["FRAGILE", "STABLE", "DEEP"]
-    for b in game.player.bonds:
-        b.strength = random.choice(bond_strengths)
-        
-    game.current_sector = game.sectors["Elace Station"]
-    game.phase = "Encounter"
-    return game
+class ConsolePolicy(Policy):
+    """Answers engine decisions from stdin and prints its narration."""
+    TONES = {"good": Colors.GREEN, "warning": Colors.WARNING, "fail": Colors.FAIL}
 
-def generate_sector_hooks(game):
-    # Only generate hooks for Encounter phase
-    if game.phase == "Encounter":
-        for h in game.current_sector.hooks:
-            if h.resolved:
-                game.current_sector.hooks.remove(h)
-                
-        # Fill hooks up to 2, tracking used sentences to avoid duplicates
-        current_npcs = game.get_npcs_at_sector(game.current_sector.name)
-        used_sentences = {h.name for h in game.current_sector.hooks}
-        while len(game.current_sector.hooks) < 2 and current_npcs:
-            provider = random.choice(current_npcs)
-            name, htype, paths, succ, fail = generate_dynamic_hook(game.current_sector, provider, used_sentences)
-            game.current_sector.hooks.append(Hook(name, htype, provider.name, paths, success_opt=succ, fail_opt=fail))
+    def show(self, text, tone=None):
+        if tone in self.TONES:
+            lead = text[:len(text) - len(text.lstrip("\n"))]
+            text = f"{lead}{self.TONES[tone]}{text[len(lead):]}{Colors.ENDC}"
+        print(text)
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        for i, opt in enumerate(options):
+            print(f"  {i+1}: {opt}")
+        while True:
+            choice = input(f"Enter choice for {label} (1-{len(options)}): ").strip()
+            try:
+                c_idx = int(choice) - 1
+                if 0 <= c_idx < len(options):
+                    return c_idx
+                print("Invalid choice.")
+            except ValueError:
+                print("Enter a number.")
+
+    def choose_bond(self, game, prompt):
+        print("\nSelect a bond to modify:")
+        for i, b in enumerate(game.player.bonds):
+            print(f"  {i+1}: {b.name} ({b.role}) - {b.strength}")
+        while True:
+            try:
+                choice = int(input(f"{prompt} (1-{len(game.player.bonds)}): ")) - 1
+                if 0 <= choice < len(game.player.bonds):
+                    return choice
+                print("Invalid.")
+            except ValueError:
+                print("Enter a number.")
+
+    def confirm(self, game, question):
+        print(question)
+        return input("> ").strip().lower().startswith('y')
+
+    def reflect(self, game, prompt):
+        print(f"\n{prompt}")
+        return input("> ").strip()
+
+CONSOLE = ConsolePolicy()
 
 def print_header(game):
     if game.game_over:
@@ -193,215 +164,11 @@ def print_state(game):
     print(Colors.CYAN + "=" * 70 + Colors.ENDC + "\n")
 
 
-def handle_bond_selection(game, prompt="Select bond"):
-    print("\nSelect a bond to modify:")
-    for i, b in enumerate(game.player.bonds):
-        print(f"  {i+1}: {b.name} ({b.role}) - {b.strength}")
-    while True:
-        try:
-            choice = int(input(f"{prompt} (1-{len(game.player.bonds)}): ")) - 1
-            if 0 <= choice < len(game.player.bonds):
-                return game.player.bonds[choice]
-            print("Invalid.")
-        except ValueError:
-            print("Enter a number.")
-
-def handle_options_loop(game, options_to_pick, is_crisis=False):
-    for opt_type, opt_list in options_to_pick:
-        while True:
-            choice = input(f"Enter choice for {opt_type} (1-{len(opt_list)}): ").strip()
-            try:
-                c_idx = int(choice) - 1
-                if 0 <= c_idx < len(opt_list):
-                    selected = opt_list[c_idx]
-                    results = game.player.apply_option(selected, is_crisis=is_crisis, current_sector_name=game.current_sector.name)
-                    print(f"Applied: {selected}")
-                    for res in results:
-                        if "choose a bond to STRENGTHEN" in res:
-                            b = handle_bond_selection(game, "Strengthen which bond?")
-                            res_bond = b.modify(1)
-                            print(f" -> {res_bond}")
-                            game.log(res_bond)
-                            game.reflection_pending = True
-                        elif "choose a bond to WEAKEN" in res:
-                            b = handle_bond_selection(game, "Weaken which bond?")
-                            res_bond = b.modify(-1)
-                            print(f" -> {res_bond}")
-                            game.log(res_bond)
-                            game.reflection_pending = True
-                        else:
-                            print(f" -> {res}")
-                            game.log(res)
-                            if "Shifted from" in res:
-                                game.reflection_pending = True
-                    break
-                else:
-                    print("Invalid choice.")
-            except ValueError:
-                print("Enter a number.")
-
-def roll_action_engine(game, track_name, approach, mod, hook=None, used_bond=None, used_tool=None):
-    roll = roll_3d6()
-    total = roll + mod
-    
-    print(f"\n[ACTION CHECK] Rolled 3d6: {roll} + Mod: {mod} = Total: {total}")
-    
-    is_crisis = False
-    is_outstanding = False
-    
-    if approach == "risky":
-        if roll <= 5: 
-            total = 6 
-            is_crisis = True
-        elif roll >= 16: 
-            total = 15 
-            is_outstanding = True
-            
-    if total <= 6:
-        outcome = "Crisis" if is_crisis else "Setback"
-    elif total <= 10:
-        outcome = "Partial"
-    elif total <= 14:
-        outcome = "Success"
-    else:
-        outcome = "Success (Outstanding)" if is_outstanding else "Success"
-
-    print(f"Outcome: {outcome.upper()}")
-    
-    in_space = game.phase == "Travel"
-    options_to_pick = []
-    
-    if hook:
-        if "Success" in outcome:
-            print(f"\n[HOOK SUCCESS] {hook.success_opt}")
-            options_to_pick.append(("Hook Success", [hook.success_opt]))
-        elif outcome == "Partial":
-            print(f"\n[HOOK SUCCESS] {hook.success_opt}")
-            print(f"[HOOK FAILURE] {hook.fail_opt}")
-            options_to_pick.append(("Hook Success", [hook.success_opt]))
-            options_to_pick.append(("Hook Failure", [hook.fail_opt]))
-        else:
-            print(f"\n[HOOK FAILURE] {hook.fail_opt}")
-            if is_crisis:
-                print("CRISIS ACTIVE: Any negative track hits in your choice will be doubled (-2)!")
-            options_to_pick.append(("Hook Failure", [hook.fail_opt]))
-    else:
-        if "Success" in outcome:
-            opp_name, adv_options = get_opportunity(in_space)
-            print(f"\n[OPPORTUNITY] {opp_name}")
-            for i, opt in enumerate(adv_options):
-                print(f"  {i+1}: {opt}")
-            options_to_pick.append(("Advantage", adv_options))
-            
-        elif outcome == "Partial":
-            opp_name, adv_options = get_opportunity(in_space)
-            comp_name, dis_options = get_complication()
-            print(f"\n[OPPORTUNITY] {opp_name}")
-            for i, opt in enumerate(adv_options):
-                print(f"  {i+1}: {opt}")
-            print(f"\n[COMPLICATION] {comp_name}")
-            for i, opt in enumerate(dis_options):
-                print(f"  {i+1}: {opt}")
-                
-            options_to_pick.append(("Advantage", adv_options))
-            options_to_pick.append(("Disadvantage", dis_options))
-            
-        elif outcome in ["Setback", "Crisis"]:
-            comp_name, dis_options = get_complication()
-            print(f"\n[COMPLICATION] {comp_name}")
-            if is_crisis:
-                print("CRISIS ACTIVE: Any negative track hits in your choice will be doubled (-2)!")
-            for i, opt in enumerate(dis_options):
-                print(f"  {i+1}: {opt}")
-            options_to_pick.append(("Disadvantage", dis_options))
-
-    handle_options_loop(game, options_to_pick, is_crisis=is_crisis)
-    
-    # Bond consequences — applied after oracle options
-    if used_bond:
-        if "Success" in outcome:
-            # On success: offer bond strengthen as an option
-            print(f"\n{Colors.GREEN}[BOND] You acted with {used_bond.name} in mind.{Colors.ENDC}")
-            print(f"  Strengthen bond with {used_bond.name}? [Y/N]")
-            if input("> ").strip().lower() == 'y':
-                res = used_bond.modify(1)
-                print(f" -> {res}")
-                game.log(res)
-                game.reflection_pending = True
-        elif outcome == "Partial":
-            # On partial: offer strengthen but also show the risk of -1
-            print(f"\n{Colors.WARNING}[BOND] You called on {used_bond.name}'s trust to get through this.{Colors.ENDC}")
-            print(f"  Strengthen bond with {used_bond.name}? [Y/N]")
-            if input("> ").strip().lower() == 'y':
-                res = used_bond.modify(1)
-                print(f" -> {res}")
-                game.log(res)
-                game.reflection_pending = True
-            else:
-                print(f"  (Bond unchanged.)")
-        elif outcome in ["Setback", "Crisis"]:
-            # On failure: weaken is optional (cautious) or enforced (risky)
-            if approach == "risky":
-                print(f"\n{Colors.FAIL}[BOND] You put {used_bond.name}'s trust on the line — and it cost them.{Colors.ENDC}")
-                res = used_bond.modify(-1)
-                print(f" -> {res} (Risky — enforced)")
-                game.log(res)
-                game.reflection_pending = True
-            else:
-                print(f"\n{Colors.WARNING}[BOND] {used_bond.name} was involved. Did this damage the relationship?{Colors.ENDC}")
-                print(f"  Weaken bond with {used_bond.name}? [Y/N]")
-                if input("> ").strip().lower() == 'y':
-                    res = used_bond.modify(-1)
-                    print(f" -> {res}")
-                    game.log(res)
-                    game.reflection_pending = True
-                else:
-                    print(f"  (Bond unchanged — noted for narrative.)")
-    
-    # Tool consequences — applied after bond consequences
-    if used_tool:
-        if "Success" in outcome:
-            # Success: tool is fine, note its contribution
-            print(f"\n{Colors.GREEN}[TOOL] {used_tool.name} performed well.{Colors.ENDC} Condition: {used_tool.condition}.")
-        elif outcome == "Partial":
-            # Partial: optional wear on cautious, enforced wear on risky
-            if approach == "risky":
-                print(f"\n{Colors.WARNING}[TOOL] The {used_tool.name} took strain from that approach.{Colors.ENDC}")
-                res = used_tool.wear()
-                print(f" -> {res} (Risky — enforced)")
-                game.log(res)
-            else:
-                print(f"\n{Colors.WARNING}[TOOL] Did the {used_tool.name} take wear from this?{Colors.ENDC}")
-                print(f"  Mark {used_tool.name} as Worn? [Y/N]")
-                if input("> ").strip().lower() == 'y':
-                    res = used_tool.wear()
-                    print(f" -> {res}")
-                    game.log(res)
-        elif outcome in ["Setback", "Crisis"]:
-            # Failure: wear on cautious, damaged on risky
-            if approach == "risky":
-                print(f"\n{Colors.FAIL}[TOOL] The {used_tool.name} was pushed too hard — it is now Damaged.{Colors.ENDC}")
-                res = used_tool.damage()
-                print(f" -> {res} (Risky — enforced)")
-                game.log(res)
-            else:
-                print(f"\n{Colors.WARNING}[TOOL] Did the {used_tool.name} get damaged in this?{Colors.ENDC}")
-                print(f"  Mark {used_tool.name} as Worn? [Y/N]")
-                if input("> ").strip().lower() == 'y':
-                    res = used_tool.wear()
-                    print(f" -> {res}")
-                    game.log(res)
-                else:
-                    print(f"  (Tool unchanged — noted for narrative.)")
-    
-    return outcome
-
 def prompt_reflection(game):
     print("\n[Reflect?] (Type your reflection, or press Enter to skip)")
     text = input("> ").strip()
     if text:
-        with open(game.log_file, "a") as f:
-            f.write(f"\n> **[REFLECT — T{game.clock}]** {text}\n\n")
+        game.log_reflection(text)
 
 def resolve_action(game, hook=None):
     if hook is None and game.current_sector.hooks:
@@ -420,9 +187,8 @@ def resolve_action(game, hook=None):
             except:
                 pass
 
-    actions_list = ["command", "navigate", "endure", "overcome", "scavenge", "repair", "barter", "acquire", "petition", "convince", "investigate", "scan"]
+    actions_list = ACTIONS
 
-    
     if hook:
         print(f"\n--- RESOLVING HOOK: {hook.name} ---")
         for i, p in enumerate(hook.paths):
@@ -488,7 +254,6 @@ def resolve_action(game, hook=None):
             approach = "risky"
             break
 
-    mod = game.player.tracks[track_name].modifier
     used_tags = []
     used_bond = None  # Track if a bond was used as modifier
     used_tool = None  # Track if a tool was used as modifier
@@ -498,7 +263,6 @@ def resolve_action(game, hook=None):
     available_tags = [t for t in game.player.tags if t.category in ["ALL", track_name.upper()] or t.category in ["SECURITY", "SOCIAL", "LOGISTICS", "ECONOMIC", "PHYSICAL"]]
     
     # We'll just show all active tags and bonds, let player toggle
-    added_mods = []
     if available_tags:
         print("Available Tags:")
         for i, t in enumerate(available_tags):
@@ -523,46 +287,26 @@ def resolve_action(game, hook=None):
             try:
                 idx = int(code[1:]) - 1
                 if 0 <= idx < len(available_tags):
-                    t = available_tags[idx]
-                    mod += t.modifier_value
-                    used_tags.append(t.name)
-                    added_mods.append(f"{t.name} ({t.modifier_value:+d})")
+                    used_tags.append(available_tags[idx])
             except: pass
         elif code.startswith('B') and len(code) > 1:
             try:
                 idx = int(code[1:]) - 1
                 if 0 <= idx < len(game.player.bonds):
-                    b = game.player.bonds[idx]
-                    b_mod = 1 if b.strength == "DEEP" else (-1 if b.strength == "SEVERED" else 0)
-                    mod += b_mod
-                    used_bond = b  # Remember which bond was used
-                    added_mods.append(f"{b.name} bond ({b_mod:+d})")
+                    used_bond = game.player.bonds[idx]  # Remember which bond was used
             except: pass
         elif code.startswith('O') and len(code) > 1:
             try:
                 idx = int(code[1:]) - 1
                 if 0 <= idx < len(game.player.tools):
                     tool = game.player.tools[idx]
-                    bonus = tool.bonus()
-                    if bonus > 0:
-                        mod += bonus
+                    if tool.bonus() > 0:
                         used_tool = tool
-                        added_mods.append(f"{tool.name} (+{bonus})")
                     else:
                         print(f"  {tool.name} is Damaged — no bonus applied.")
             except: pass
 
-    # Sector context
-    sector_tracks = list(game.current_sector.tracks.values())
-    avg_sector = sum(t.value for t in sector_tracks) / 4.0
-    if avg_sector > 6:
-        mod += 1
-        added_mods.append("Sector Conditions (+1)")
-    elif avg_sector < 4:
-        mod -= 1
-        added_mods.append("Sector Conditions (-1)")
-        
-    mod = max(-4, min(4, mod))
+    mod, added_mods = action_modifier(game, track_name, used_tags, used_bond, used_tool)
     
     print(f"\n--- CONFIRMATION ---")
     print(f"Action: {action_name.upper()}")
@@ -574,254 +318,35 @@ def resolve_action(game, hook=None):
     
     input("Press Enter to roll...")
     
-    kinetic_actions = ["command", "navigate", "scavenge", "repair"]
-    if action_name in kinetic_actions:
-        marker = f"[KINETIC STUB: PILOTING/EVA — {action_name.upper()}]"
-        print(f"\n{marker}")
-        game.log(marker)
-        
-    for t in used_tags:
-        game.player.remove_tag(t)
-        print(f"Used and expired tag: {t}")
-        
-    outcome = roll_action_engine(game, track_name, approach, mod, hook=hook, used_bond=used_bond, used_tool=used_tool)
-    
-    if hook and outcome != "Crisis" and outcome != "Setback":
-        hook.resolved = True
-        
-    next_action_tags = [t for t in game.player.tags if t.expiry_type == "next_action"]
-    for t in next_action_tags:
-        game.player.tags.remove(t)
-        print(f"Tag expired (next_action): {t.name}")
-        
-    game.advance_clock(1)
+    perform_action(game, CONSOLE, action_name, track_name, approach, hook=hook, tags=used_tags, bond=used_bond, tool=used_tool)
 
 def do_travel(game, destination_str):
-    dest_name = " ".join(destination_str)
-    if dest_name not in game.sectors:
-        print(f"Unknown destination: {dest_name}")
-        print("Available:", list(game.sectors.keys()))
-        return
-        
-    # Dijkstra's to find shortest path
-    import heapq
-    distances = {s: float('inf') for s in game.sectors}
-    distances[game.current_sector.name] = 0
-    pq = [(0, game.current_sector.name)]
-    
-    while pq:
-        d, current = heapq.heappop(pq)
-        if d > distances[current]:
-            continue
-        if current == dest_name:
-            break
-        for neighbor, weight in game.routes.get(current, {}).items():
-            dist = d + weight
-            if dist < distances[neighbor]:
-                distances[neighbor] = dist
-                heapq.heappush(pq, (dist, neighbor))
-                
-    distance = distances[dest_name]
-    if distance == float('inf'):
-        print(f"No known route to {dest_name}.")
-        return
-
-    game.phase = "Travel"
-    game.log(f"Initiated travel to {dest_name} (Distance: {distance})")
-    print(f"\n--- PRE-DEPARTURE SEQUENCE (Distance {distance}) ---")
-    
-    # 1. Community Cost & Crew Checks (Batched)
-    cost_name, cost_opts = get_community_cost()
-    print(f"\n[COMMUNITY COST] {cost_name}")
-    
-    import random
-    crew_opts = []
-    if random.random() < 0.5:
-        crew_name, crew_opts, ctype = get_pre_flight_crew()
-        print(f"[PRE-FLIGHT CREW CHECK] {ctype}: {crew_name}")
-    else:
-        print("[PRE-FLIGHT CREW CHECK] All crew report ready.")
-        
-    options_to_pick = [("Community Cost Option", cost_opts)]
-    for i, opt in enumerate(cost_opts):
-        print(f"  Cost Opt {i+1}: {opt}")
-        
-    if crew_opts:
-        options_to_pick.append(("Crew Check Option", crew_opts))
-        for i, opt in enumerate(crew_opts):
-            print(f"  Crew Opt {i+1}: {opt}")
-            
-    handle_options_loop(game, options_to_pick)
-    
-    # 2. Kinetic Stub & Travel Transit
-    print(f"\n[KINETIC STUB: FLIGHT MODE — {game.current_sector.name} → {dest_name}]")
-    game.log(f"[KINETIC STUB: FLIGHT MODE — {game.current_sector.name} → {dest_name}]")
-        
-    # 3. Travel Transit
-    print(f"\n--- TRAVELING TO {dest_name} ---")
-    
-    current_path_sector = game.current_sector.name
-    # Since we don't store the exact path in this simple Dijkstra, we'll just simulate passing through distance number of sectors.
-    
-    for step in range(distance):
-        game.player.tracks["Supplies"].change(-1)
-        game.log("Consumed 1 Supplies during travel.")
-        
-        # Encounter Phase Check
-        enc = random.randint(1, 6)
-        if enc == 1:
-            print("\n[TRAVEL ENCOUNTER] Hazard! Rolled 1 on Encounter die.")
-            comp_name, dis_opts = get_complication()
-            print(f"Hazard: {comp_name}")
-            for i, opt in enumerate(dis_opts):
-                print(f"  {i+1}: {opt}")
-            handle_options_loop(game, [("Hazard Disadvantage", dis_opts)])
-        elif enc == 2:
-            print("\n[TRAVEL ENCOUNTER] Opportunity! Rolled 2 on Encounter die.")
-            opp_name, adv_opts = get_opportunity(in_space=True)
-            print(f"Discovery: {opp_name}")
-            for i, opt in enumerate(adv_opts):
-                print(f"  {i+1}: {opt}")
-            handle_options_loop(game, [("Discovery Advantage", adv_opts)])
-        else:
-            print("Transit sector passed peacefully.")
-            
-        # Vessel encounter stub check
-        vessels_here = game.get_vessels_at_sector(current_path_sector)
-        if vessels_here:
-            for v in vessels_here:
-                print(f"\n[KINETIC STUB: Encountered {v.name} (Captain: {v.captain}) in {current_path_sector}. Hail? [Y/N]]")
-                if input("> ").lower().startswith('y'):
-                    if v.captain:
-                        do_converse(game, [v.captain], override_sector=current_path_sector)
-                    else:
-                        print(f"Vessel {v.name} is derelict or has no captain.")
-                
-        game.advance_clock(1)
-        
-    game.current_sector = game.sectors[dest_name]
-    game.phase = "Encounter"
-    print(f"\nARRIVED at {dest_name}. Phase: {game.phase}")
-    game.log(f"Arrived at {dest_name}")
-    
-    next_travel_tags = [t for t in game.player.tags if t.expiry_type == "next_travel"]
-    for t in next_travel_tags:
-        game.player.tags.remove(t)
-        print(f"Tag expired (next_travel): {t.name}")
-        
-    game.reflection_pending = True
+    travel(game, CONSOLE, " ".join(destination_str))
 
 def do_converse(game, args, override_sector=None):
     if len(args) < 1:
         print("Usage: converse <npc_name>")
         return
-    npc_name = " ".join(args)
-    
-    # Check crew first
-    crew_member = next((c for c in game.player.crew if c.name.lower() == npc_name.lower()), None)
-    if crew_member:
-        print(f"\n--- CONVERSATION WITH {crew_member.name} (Crew) ---")
-        seed = roll_conversation_seed()
-        print(f"{crew_member.name} ({crew_member.role}) — Morale: {crew_member.morale} — Topic: {seed}")
-        
-        print("\n[Reflect?] (Type your free-text narrative, or press Enter to skip)")
-        free_text = input("> ").strip()
-                
-        log_entry = f"Spoke with crew {crew_member.name}. Morale: {crew_member.morale}. Topic: {seed}."
-        game.log(log_entry)
-        
-        if free_text:
-            with open(game.log_file, "a") as f:
-                f.write(f"\n> **[REFLECT — T{game.clock}]** {free_text}\n\n")
-        print("Conversation logged.")
-        return
-
-    # Fallback to local NPCs
-    npc = next((n for n in game.get_all_npcs() if n.name.lower() == npc_name.lower()), None)
-    
-    if not npc:
-        print(f"Unknown NPC: {npc_name}")
-        return
-        
-    npc_loc = npc.get_location(game)
-    check_loc = override_sector if override_sector else game.current_sector.name
-    
-    if npc_loc != check_loc:
-        vessel_str = f" aboard {npc.vessel_id}" if npc.vessel_id else ""
-        print(f"{npc.name} is not here. They are{vessel_str} at {npc_loc}.")
-        return
-
-    print(f"\n--- CONVERSATION WITH {npc.name} ---")
-    seed = roll_conversation_seed()
-    disposition = roll_disposition()
-    npc.disposition = disposition
-    
-    print(f"{npc.name} ({npc.role}) — Mood: {disposition} — Topic: {seed}")
-    
-    print("\n[Reflect?] (Type your free-text narrative, or press Enter to skip)")
-    free_text = input("> ").strip()
-            
-    log_entry = f"Spoke with {npc.name}. Mood: {disposition}. Topic: {seed}."
-    game.log(log_entry)
-    
-    if free_text:
-        with open(game.log_file, "a") as f:
-            f.write(f"\n> **[REFLECT — T{game.clock}]** {free_text}\n\n")
-    print("Conversation logged.")
-    
-    # Resolve any pending notifications from this NPC
-    for n in game.notifications:
-        if not n.resolved and n.source.lower() == npc.name.lower():
-            n.resolved = True
-            print(f"[SYSTEM] Pending notification from {n.source} resolved.")
+    converse(game, CONSOLE, " ".join(args), override_sector=override_sector)
 
 def resolve_msg(game, args):
     if not args:
         print("Usage: resolve_message <msg_id>")
         return
     msg_id = args[0]
-    for m in game.message_queue:
-        if m.id == msg_id and m.status == "ARRIVED":
-            print(f"Resolving reply for message {m.id} to {m.to_npc}")
-            print("You must roll 'petition' to determine the outcome.")
-            approach = input("Approach [cautious/risky]: ").lower()
-            if approach not in ["cautious", "risky"]: approach = "cautious"
-            
-            mod, _ = game.player.get_track_modifier("Morale")
-            outcome = roll_action_engine(game, "Morale", approach, mod)
-            m.status = "RESOLVED"
-            game.log(f"Resolved message {m.id} with outcome: {outcome}")
-            return
-    print("No pending ARRIVED message found with that ID.")
+    if not any(m.id == msg_id and m.status == "ARRIVED" for m in game.message_queue):
+        print("No pending ARRIVED message found with that ID.")
+        return
+    print("You must roll 'petition' to determine the outcome.")
+    approach = input("Approach [cautious/risky]: ").lower()
+    if approach not in ["cautious", "risky"]: approach = "cautious"
+    resolve_message(game, CONSOLE, msg_id, approach)
 
 def resolve_goal(game, args):
     if len(args) < 2:
         print("Usage: goal_resolve <goal_id> <cautious/risky>")
         return
-    try:
-        goal_id = args[0]
-        app = args[1].lower()
-        g = next((g for g in game.player.goals if g.id == goal_id), None)
-        if g:
-            if g.progress < 10:
-                print("Goal must reach 10 progress to resolve.")
-                return
-            print(f"Attempting to resolve goal: {g.statement}")
-            mod, _ = game.player.get_track_modifier("Morale")
-            outcome = roll_action_engine(game, "Morale", app, mod)
-            if "Success" in outcome:
-                print("Goal FULFILLED!")
-                game.player.goals.remove(g)
-                game.log(f"Goal fulfilled: {g.statement}")
-                game.reflection_pending = True
-            else:
-                print("Goal resolution hit a snag. Retain it or abandon it.")
-                game.log(f"Goal resolution failed: {g.statement}")
-            game.advance_clock(1)
-        else:
-            print("Invalid goal ID.")
-    except Exception as e:
-        print(f"Error: {e}")
+    engine.resolve_goal(game, CONSOLE, args[0], args[1].lower())
 
 def session_zero(game):
     """Interactive session zero onboarding flow."""
@@ -989,8 +514,7 @@ relationships, and the weight of keeping something alive.
     print(f"  [Reflect?] Write your opening logbook entry, or press Enter to skip.")
     text = input(f"  {C.GREEN}> {C.ENDC}").strip()
     if text:
-        with open(game.log_file, "a") as f:
-            f.write(f"\n> **[SESSION ZERO — OPENING]** {text}\n\n")
+        game.log_reflection(text, heading="SESSION ZERO — OPENING")
 
     # ── SUMMARY ──────────────────────────────────────────────────────────────
     section("YOUR VESSEL IS READY")
@@ -1008,9 +532,17 @@ relationships, and the weight of keeping something alive.
 
 
 def main():
+    install_flush_handlers()
     game = setup_game()
+    try:
+        run_session(game)
+    finally:
+        game.close()
+
+def run_session(game):
     game.write_session_header()
     session_zero(game)
+    undo_history = UndoHistory()
     
     while True:
         if game.game_over:
@@ -1019,6 +551,7 @@ def main():
             for entry in game.chronicle:
                 print(entry)
             print("="*70)
+            game.chronicle_writer.flush()
             break
 
         print_header(game)
@@ -1030,13 +563,7 @@ def main():
         args = cmd_input[1:]
         
         if cmd not in ["undo", "state", "help", "log", "quit"]:
-            import copy
-            try:
-                if hasattr(game, 'previous_state'):
-                    del game.previous_state
-                game.previous_state = copy.deepcopy(game)
-            except Exception as e:
-                pass
+            undo_history.save(game)
         
         if cmd == "help":
             print("=" * 70)
@@ -1055,13 +582,12 @@ def main():
             print("  oracle <disposition|convo|theme|comp|opp> - Roll an oracle for inspiration")
             print("  wait <ticks> - Advance clock")
             print("  log <text> - Custom Chronicle log")
-            print("  undo - Revert the game state to before the last action")
+            print(f"  undo - Revert the game state to before the last action (up to {UNDO_DEPTH} steps)")
             print("  quit - End session and show Debrief")
             print("=" * 70)
             
         elif cmd == "undo":
-            if hasattr(game, 'previous_state') and game.previous_state:
-                game = game.previous_state
+            if undo_history.undo(game):
                 print("Undid last action.")
             else:
                 print("Nothing to undo.")
@@ -1074,12 +600,7 @@ def main():
             
         elif cmd == "wait":
             ticks = int(args[0]) if args else 1
-            for _ in range(ticks):
-                will_expire = any(not n.resolved and n.expiry_tick == game.clock + 1 for n in game.notifications)
-                game.advance_clock(1)
-                if will_expire:
-                    print("\n[!] Wait interrupted! A notification has expired.")
-                    break
+            wait(game, CONSOLE, ticks)
             
         elif cmd == "log":
             text = " ".join(args)
@@ -1152,18 +673,7 @@ def main():
                         subject = full_args[len(n):].strip()
                         break
                 if to_npc:
-                    arr_tick = game.clock + 2
-                    msg = Message(f"M{game.msg_counter}", to_npc, game.clock, arr_tick, subject)
-                    game.message_queue.append(msg)
-                    game.msg_counter += 1
-                    game.log(f"Sent tight-beam to {to_npc}. Subject: {subject}")
-                    print(f"Message sent. Will arrive at T{arr_tick}.")
-                    
-                    # Resolve any pending notifications from this NPC
-                    for n in game.notifications:
-                        if not n.resolved and n.source.lower() == to_npc.lower():
-                            n.resolved = True
-                            print(f"[SYSTEM] Pending notification from {n.source} resolved by sending message.")
+                    send_message(game, CONSOLE, to_npc, subject)
                 else:
                     print(f"Could not identify a valid NPC from: {full_args}")
             else:
@@ -1176,8 +686,7 @@ def main():
             if len(args) >= 2:
                 rank = args[0].upper()
                 stmt = " ".join(args[1:])
-                game.player.goals.append(Goal(stmt, rank=rank))
-                game.log(f"Added {rank} goal: {stmt}")
+                add_goal(game, stmt, rank=rank)
                 print("Goal added.")
             else:
                 print("Usage: goal_add <MINOR/MAJOR/EPIC> <statement>")
@@ -1189,17 +698,10 @@ def main():
                     amt = 1
                     if len(args) == 2:
                         amt = int(args[1])
-                    g = next((g for g in game.player.goals if g.id == goal_id), None)
-                    if g:
-                        max_amt = {"MINOR": 2, "MAJOR": 1, "EPIC": 1}.get(g.rank, 1)
-                        if amt > max_amt:
-                            print(f"Cannot advance {g.rank} goal by more than {max_amt} per action.")
-                            amt = max_amt
+                    if any(g.id == goal_id for g in game.player.goals):
                         confirm = input(f"Did your last action advance this goal? (y/n): ")
                         if confirm.lower().startswith('y'):
-                            res = g.advance(amt)
-                            print(res)
-                            game.log(res)
+                            advance_goal(game, CONSOLE, goal_id, amt)
                     else:
                         print("Invalid goal ID.")
                 except:
@@ -400,9 +400,177 @@ class Player:
         return False
 
 import os
+import atexit
+import signal
+from collections import deque
+import threading
+
+# Strong references: a writer must outlive its GameState until it is closed,
+# or lines logged after the last flush would be lost at exit.
+_open_writers = set()
+
+class ChronicleWriter:
+    """Buffers chronicle.md output and appends it in batches.
+
+    GameState flushes it when advance_clock finishes; it also flushes itself
+    once the buffer passes max_bytes or its oldest line is max_age seconds old
+    (a timer, so an idle buffer is not left waiting for the next write). Open
+    writers stay registered until close() and are flushed at exit (see
+    install_flush_handlers for SIGTERM/SIGHUP). With path=None nothing is
+    written (headless runs).
+    """
+    def __init__(self, path, max_bytes=64 * 1024, max_age=2.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._pending = []
+        self._pending_size = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        if path is not None:
+            _open_writers.add(self)
+
+    def write(self, text):
+        if self.path is None:
+            return
+        with self._lock:
+            self._pending.append(text)
+            self._pending_size += len(text)
+            if self._timer is None:
+                self._timer = threading.Timer(self.max_age, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            full = self._pending_size >= self.max_bytes
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            self._write_pending()
+
+    def flush_from_signal(self, timeout=0.5):
+        """flush() for signal handlers, which never block on the lock.
+
+        The handler may have interrupted a write() or flush() on its own thread,
+        which then holds the lock until the handler returns; after *timeout* the
+        buffer is written without it (a batch caught mid-flush may be repeated,
+        but nothing is lost).
+        """
+        locked = self._lock.acquire(timeout=timeout)
+        try:
+            self._write_pending()
+        finally:
+            if locked:
+                self._lock.release()
+
+    def _write_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        with open(self.path, "a") as f:
+            f.write("".join(self._pending))
+        self._pending = []
+        self._pending_size = 0
+
+    def close(self):
+        """Flush and deregister the writer once its game is finished."""
+        self.flush()
+        _open_writers.discard(self)
+
+    def __deepcopy__(self, memo):
+        # Copies of a GameState share the writer: the file is append-only, and a
+        # copied buffer would be written twice.
+        return self
+
+def flush_all_writers():
+    for writer in list(_open_writers):
+        writer.flush()
+
+atexit.register(flush_all_writers)
+
+def _flush_and_reraise(signum, frame):
+    for writer in list(_open_writers):
+        writer.flush_from_signal()
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+def install_flush_handlers():
+    """Flush buffered chronicle output when the process is terminated or its terminal hangs up."""
+    for name in ("SIGTERM", "SIGHUP"):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            signal.signal(signum, _flush_and_reraise)
+
+UNDO_DEPTH = 20
+
+def _copy_container(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+class UndoHistory:
+    """Bounded ring of undo snapshots for a GameState.
+
+    A snapshot holds the attribute dict of every model object reachable from
+    the game (lists and dicts copied one level deep) and is restored in place,
+    so references to the game, its sectors and goals stay valid across undo.
+    An object whose state is unchanged since the previous snapshot reuses that
+    snapshot's dict, and the append-only chronicle is recorded as its length,
+    so memory stays at depth x the live world however long the session runs.
+    """
+    APPEND_ONLY = ("chronicle",)
+
+    def __init__(self, depth=UNDO_DEPTH):
+        self.ring = deque(maxlen=depth)
+        self._last = {}
+
+    def __len__(self):
+        return len(self.ring)
+
+    def save(self, game):
+        states = {}
+        self._capture(game, states)
+        self._last = states
+        self.ring.append((list(states.values()), len(game.chronicle)))
+
+    def undo(self, game):
+        """Restore the most recent snapshot into game; False if there is none."""
+        if not self.ring:
+            return False
+        snapshot, chronicle_len = self.ring.pop()
+        for obj, state in snapshot:
+            attrs = vars(obj)
+            attrs.clear()
+            # Copy back out: the snapshot's containers may be shared with older snapshots
+            attrs.update({k: v if k in self.APPEND_ONLY else _copy_container(v) for k, v in state.items()})
+        del game.chronicle[chronicle_len:]
+        self._last = {id(obj): (obj, state) for obj, state in snapshot}
+        return True
+
+    def _capture(self, obj, states):
+        if id(obj) in states:
+            return
+        state = {k: v if k in self.APPEND_ONLY else _copy_container(v) for k, v in vars(obj).items()}
+        last = self._last.get(id(obj))
+        if last and last[0] is obj and last[1] == state:
+            state = last[1]
+        states[id(obj)] = (obj, state)
+        for k, v in state.items():
+            if k in self.APPEND_ONLY:
+                continue
+            for child in (v.values() if isinstance(v, dict) else v if isinstance(v, list) else (v,)):
+                if _is_model(child):
+                    self._capture(child, states)
+
+def _is_model(value):
+    return type(value).__module__ == __name__ and not isinstance(value, (ChronicleWriter, UndoHistory))
 
 class GameState:
-    def __init__(self, log_file=None):
+    def __init__(self, log_file=None, write_log=True):
         if log_file is None:
             # Place chronicle.md in the exact same directory as this file
             log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chronicle.md")
@@ -422,7 +590,19 @@ class GameState:
         self.last_goal_prompt_tick = -2
         self.game_over = False
         self.log_file = log_file
+        # write_log=False keeps the chronicle in memory only (bulk/headless simulation)
+        self.chronicle_writer = ChronicleWriter(log_file if write_log else None)
         self.reflection_pending = False
+        # Console echo of clock events; the TUI and headless runs turn it off
+        self.verbose = True
+
+    def close(self):
+        """Write out anything still buffered for chronicle.md."""
+        self.chronicle_writer.close()
+
+    def announce(self, text):
+        if self.verbose:
+            print(text)
 
     def get_npcs_at_sector(self, sector_name):
         return [npc for npc in self.npcs.values() if npc.get_location(self) == sector_name]
@@ -461,8 +641,7 @@ class GameState:
             header += f"  - {g}\n"
         header += "--------------------------------------------------\n\n"
         
-        with open(self.log_file, "a") as f:
-            f.write(header)
+        self.chronicle_writer.write(header)
 
 
     def advance_clock(self, ticks=1):
@@ -475,31 +654,34 @@ class GameState:
             tag_msgs = self.player.tick_tags()
             for msg in tag_msgs:
                 self.log(msg)
+        self.chronicle_writer.flush()
 
     def log(self, message):
         entry = f"**[T{self.clock}]** {message}"
         self.chronicle.append(entry)
-        with open(self.log_file, "a") as f:
-            f.write(f"- {entry}\n")
+        self.chronicle_writer.write(f"- {entry}\n")
             
     def log_narrative(self, narrative_text):
         entry = f"**[T{self.clock}]** [NARRATIVE]"
         self.chronicle.append(f"{entry} {narrative_text}")
-        with open(self.log_file, "a") as f:
-            f.write(f"\n> **NARRATIVE [T{self.clock}]:** {narrative_text}\n\n")
+        self.chronicle_writer.write(f"\n> **NARRATIVE [T{self.clock}]:** {narrative_text}\n\n")
 
     def log_system(self, message):
         entry = f"**[T{self.clock}]** *{message}*"
         self.chronicle.append(entry)
-        with open(self.log_file, "a") as f:
-            f.write(f"- {entry}\n")
+        self.chronicle_writer.write(f"- {entry}\n")
+
+    def log_reflection(self, text, heading=None):
+        # Free-text reflections go to chronicle.md only, not the in-game chronicle
+        heading = heading or f"REFLECT — T{self.clock}"
+        self.chronicle_writer.write(f"\n> **[{heading}]** {text}\n\n")
         
     def check_clock_events(self):
         # 1. Mutiny Check
         if self.player.tracks["Morale"].tier_name == "MUTINOUS":
-            print("\n*** CRITICAL EVENT: MUTINY! ***")
-            print("The Morale track has reached MUTINOUS. The crew refuses orders.")
-            print("Resolve via 'act petition cautious' (Negotiate) or 'act command risky' (Assert authority).")
+            self.announce("\n*** CRITICAL EVENT: MUTINY! ***")
+            self.announce("The Morale track has reached MUTINOUS. The crew refuses orders.")
+            self.announce("Resolve via 'act petition cautious' (Negotiate) or 'act command risky' (Assert authority).")
             self.log("Mutiny occurred due to MUTINOUS morale.")
 
         # 2. Defeat Conditions Check (Section 11)
@@ -528,7 +710,7 @@ class GameState:
         # 3. Check Incoming Notifications (NPC Interaction)
         warning_nots = [n for n in self.notifications if not n.resolved and n.expiry_tick - 1 == self.clock]
         for n in warning_nots:
-            print(f"\n[WARNING] Notification from {n.source} expires NEXT TICK! (Consequence: Bond weakens)")
+            self.announce(f"\n[WARNING] Notification from {n.source} expires NEXT TICK! (Consequence: Bond weakens)")
 
         expired_nots = [n for n in self.notifications if not n.resolved and n.expiry_tick <= self.clock]
         for n in expired_nots:
@@ -544,14 +726,14 @@ class GameState:
         arrived = [m for m in self.message_queue if m.arrival_tick == self.clock and m.status == "PENDING"]
         for m in arrived:
             m.status = "ARRIVED"
-            print(f"\n[COMMUNICATION] Message {m.id} has ARRIVED at {m.to_npc}.")
-            print(f"You must resolve the reply via Action Check: 'resolve_message {m.id}'")
+            self.announce(f"\n[COMMUNICATION] Message {m.id} has ARRIVED at {m.to_npc}.")
+            self.announce(f"You must resolve the reply via Action Check: 'resolve_message {m.id}'")
             self.log(f"Message {m.id} arrived to {m.to_npc}")
             
         # 5. Goal progress prompt check
         if self.clock - self.last_goal_prompt_tick >= 2 and self.phase == "Encounter":
-            print("\n[GOAL REMINDER] Time has passed. If you've acted on a goal's anchor, you may advance it using 'goal_advance'.")
-            print("To resolve a fully progressed goal, use 'goal_resolve <index>'.")
+            self.announce("\n[GOAL REMINDER] Time has passed. If you've acted on a goal's anchor, you may advance it using 'goal_advance'.")
+            self.announce("To resolve a fully progressed goal, use 'goal_resolve <index>'.")
             self.last_goal_prompt_tick = self.clock
             
         # Random chance to generate a new NPC notification based on World Clock
@@ -561,6 +743,6 @@ class GameState:
                 source = random.choice(potential_sources)
                 n = Notification(source, "Urgent community issue", self.clock)
                 self.notifications.append(n)
-                print(f"\n[INCOMING] {n}")
+                self.announce(f"\n[INCOMING] {n}")
                 self.log(f"Incoming notification generated for {source}.")
                 self.pending_alerts.append(f"INCOMING REQUEST\\n{source} is requesting urgent assistance regarding a community issue.\\n\\nRespond via the Main Menu before the expiry tick (T{n.expiry_tick})!")
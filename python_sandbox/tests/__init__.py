@@ -0,0 +1 @@
+# tests/ — unit tests for the python_sandbox solo RPG.
@@ -0,0 +1,35 @@
+"""Unit tests for the Monte Carlo balance harness.
+
+Run:
+    python3 -m unittest tests.test_balance -v
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from balance import play_session
+
+ROUTE = ["Korr Anchorage", "Orin's Reach", "New Eden"]
+
+
+class TestRouteAttribution(unittest.TestCase):
+    def test_stranded_on_last_leg_counts_as_during_route(self):
+        # Seed 10 arrives at New Eden, but game over is set while in transit
+        result = play_session(10, "random", route=ROUTE)
+        self.assertEqual(result["defeat"], "STRANDED")
+        self.assertEqual(result["jumps"], 3)
+        self.assertFalse(result["route_done"])
+        self.assertTrue(result["defeat_during_route"])
+
+    def test_defeat_after_route_counts_as_after(self):
+        result = play_session(1, "random", route=ROUTE)
+        self.assertEqual(result["defeat"], "STRANDED")
+        self.assertTrue(result["route_done"])
+        self.assertFalse(result["defeat_during_route"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Unit tests for buffered chronicle.md output.
+
+Run:
+    python3 -m unittest tests.test_chronicle_writer -v
+"""
+
+import gc
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import ChronicleWriter, GameState, flush_all_writers, _open_writers
+
+
+class TestChronicleWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "chronicle.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return ""
+        with open(self.path) as f:
+            return f.read()
+
+    def test_buffers_until_flush(self):
+        writer = ChronicleWriter(self.path)
+        writer.write("- one\n")
+        self.assertEqual(self.read(), "")
+        writer.close()
+        self.assertEqual(self.read(), "- one\n")
+
+    def test_game_state_out_of_scope_keeps_lines(self):
+        def session():
+            game = GameState(log_file=self.path)
+            game.log("MARKER")
+        session()
+        gc.collect()
+        flush_all_writers()
+        self.assertIn("MARKER", self.read())
+
+    def test_close_deregisters(self):
+        writer = ChronicleWriter(self.path)
+        self.assertIn(writer, _open_writers)
+        writer.close()
+        self.assertNotIn(writer, _open_writers)
+
+    def test_headless_writer_not_registered(self):
+        writer = ChronicleWriter(None)
+        writer.write("- ignored\n")
+        self.assertNotIn(writer, _open_writers)
+
+    def test_max_age_flushes_without_another_write(self):
+        writer = ChronicleWriter(self.path, max_age=0.05)
+        writer.write("- idle\n")
+        deadline = time.monotonic() + 2.0
+        while not self.read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.read(), "- idle\n")
+        writer.close()
+
+    def test_max_bytes_flushes_immediately(self):
+        writer = ChronicleWriter(self.path, max_bytes=10)
+        writer.write("- twelve chars\n")
+        self.assertEqual(self.read(), "- twelve chars\n")
+        writer.close()
+
+    @unittest.skipUnless(hasattr(signal, "SIGTERM") and os.name == "posix", "needs POSIX signals")
+    def test_sigterm_while_lock_held_flushes_and_exits(self):
+        # The signal interrupts the main thread while it holds the writer's lock,
+        # as it would in the middle of write() or flush().
+        script = textwrap.dedent(f"""
+            import os, signal, sys
+            sys.path.insert(0, {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))!r})
+            from models import ChronicleWriter, install_flush_handlers
+            install_flush_handlers()
+            writer = ChronicleWriter({self.path!r})
+            writer.write("- before hangup\\n")
+            with writer._lock:
+                os.kill(os.getpid(), signal.SIGTERM)
+        """)
+        proc = subprocess.run([sys.executable, "-c", script], timeout=10)
+        self.assertEqual(proc.returncode, -signal.SIGTERM)
+        self.assertEqual(self.read(), "- before hangup\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit tests for the headless engine, driven by the scripted epic session.
+
+Run:
+    python3 -m unittest tests.test_engine -v
+"""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import epic_session
+from engine import ActionResult, ConverseResult, GoalResult, TravelResult
+from models import _open_writers
+from oracles import get_action_tracks
+
+SEED = 2   # plays the whole script without a game over
+OUTCOMES = {"Crisis", "Setback", "Partial", "Success", "Success (Outstanding)"}
+
+
+def run_session(seed=SEED):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return epic_session.run_headless(seed)
+
+
+class TestHeadlessSession(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.game, cls.results = run_session()
+
+    def results_for(self, cmd):
+        return [(line.split(" ", 1)[1], result) for line, result in self.results if line.split(" ", 1)[0] == cmd]
+
+    def test_replays_the_whole_script(self):
+        self.assertFalse(self.game.game_over)
+        self.assertEqual(len(self.results), len(epic_session.ACTIONS) - 1)   # all but "quit"
+        self.assertEqual(self.results_for("wait"), [("10", 10)])
+
+    def test_action_results(self):
+        acts = self.results_for("act")
+        self.assertEqual(len(acts), 19)
+        for args, result in acts:
+            action, approach = args.split()
+            self.assertIsInstance(result, ActionResult)
+            self.assertIn(result.track, get_action_tracks(action))
+            self.assertEqual(result.approach, approach)
+            self.assertIn(result.outcome, OUTCOMES)
+            self.assertTrue(3 <= result.roll <= 18)
+            self.assertEqual(result.succeeded, "Success" in result.outcome)
+            self.assertEqual(result.failed, result.outcome in ("Setback", "Crisis"))
+            if approach == "cautious":
+                self.assertEqual(result.total, result.roll + result.mod)
+                self.assertFalse(result.is_crisis)
+
+    def test_travel_results(self):
+        travels = self.results_for("travel")
+        self.assertEqual([r.distance for _destination, r in travels], [1, 3, 2, 1, 2, 1, 5])
+        for destination, result in travels:
+            self.assertIsInstance(result, TravelResult)
+            self.assertEqual(result.destination, destination)
+            self.assertTrue(result.arrived)
+            self.assertIsNone(result.error)
+            self.assertEqual(result.applied[0][0], "Community Cost Option")
+            for step, kind, _name in result.encounters:
+                self.assertLess(step, result.distance)
+                self.assertIn(kind, ("Hazard", "Opportunity"))
+        self.assertEqual(self.game.current_sector.name, "New Eden")
+
+    def test_goal_results(self):
+        resolves = self.results_for("goal_resolve")
+        self.assertEqual([r.fulfilled for _args, r in resolves], [False, True, False, True, False])
+        for _args, result in resolves:
+            self.assertIsInstance(result, GoalResult)
+            if result.error:
+                self.assertIsNone(result.action)
+                self.assertLess(result.goal.progress, 10)
+                continue
+            self.assertEqual(result.fulfilled, result.action.succeeded)
+            self.assertEqual(result.action.track, "Morale")
+            self.assertEqual(result.goal in self.game.player.goals, not result.fulfilled)
+        self.assertEqual(resolves[-1][1].error, "Goal must reach 10 progress to resolve.")
+
+    def test_converse_results(self):
+        for npc_name, result in self.results_for("converse"):
+            self.assertIsInstance(result, ConverseResult)
+            self.assertEqual(result.npc_name, npc_name)
+            # The script talks to Kaelen wherever it is; elsewhere the conversation is refused
+            if result.error:
+                self.assertIn("is not here", result.error)
+                self.assertIsNone(result.seed)
+            else:
+                self.assertIsNotNone(result.seed)
+
+    def test_same_seed_same_session(self):
+        game, _results = run_session()
+        self.assertEqual(game.chronicle, self.game.chronicle)
+        self.assertEqual(game.clock, self.game.clock)
+
+    def test_write_log_false_does_no_file_io(self):
+        def refuse(*args, **kwargs):
+            raise AssertionError(f"file opened during a headless session: {args[:1]}")
+        with mock.patch("builtins.open", refuse), mock.patch("io.open", refuse), mock.patch("os.open", refuse):
+            game, _results = run_session()
+        self.assertIsNone(game.chronicle_writer.path)
+        self.assertNotIn(game.chronicle_writer, _open_writers)
+        self.assertTrue(game.chronicle)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Unit tests for the bounded, in-place undo history.
+
+Run:
+    python3 -m unittest tests.test_undo -v
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models import ChronicleWriter, Goal, Hook, Message, TempTag, UndoHistory, UNDO_DEPTH
+from engine import setup_game, generate_sector_hooks
+from balance import RandomStrategy, take_turn
+
+
+def fingerprint(value, stack=()):
+    """Plain nested copy of everything reachable from *value*, for equality checks."""
+    if isinstance(value, ChronicleWriter):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [fingerprint(v, stack) for v in value]
+    if isinstance(value, dict):
+        return sorted((repr(k), fingerprint(v, stack)) for k, v in value.items())
+    if type(value).__module__ == "models":
+        if id(value) in stack:
+            return ("cycle", type(value).__name__)
+        stack = stack + (id(value),)
+        return (type(value).__name__, fingerprint(vars(value), stack))
+    return value
+
+
+class TestUndoHistory(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+        self.game = setup_game(write_log=False, verbose=False)
+
+    def test_undo_restores_every_kind_of_change(self):
+        game = self.game
+        history = UndoHistory()
+        before = fingerprint(game)
+        sector, goal = game.current_sector, game.player.goals[0]
+        history.save(game)
+
+        game.player.tracks["Health"].change(-4)
+        game.player.add_tag(TempTag("Shaken", "ALL", -1, expiry_type="ticks", expiry_ticks=2))
+        goal.advance(1)
+        game.player.goals.append(Goal("New lead", anchor="New Eden"))
+        sector.hooks.append(Hook("Distress call", "Opportunity", "Tyra", [("Answer it", ["Aid"])]))
+        sector.tracks["Morale"].change(3)
+        game.message_queue.append(Message(game.msg_counter, "Voss", game.clock, game.clock + 2, "Checking in"))
+        game.msg_counter += 1
+        game.log("Something happened")
+        game.advance_clock(2)
+        game.current_sector = game.sectors["Korr Anchorage"]
+        self.assertNotEqual(fingerprint(game), before)
+
+        self.assertTrue(history.undo(game))
+        self.assertEqual(fingerprint(game), before)
+        # Restored in place: references held elsewhere still point at the live objects
+        self.assertIs(game.current_sector, sector)
+        self.assertIs(game.player.goals[0], goal)
+        self.assertIs(game.current_sector, game.sectors[sector.name])
+        self.assertFalse(history.undo(game))
+
+    def test_restored_state_is_independent_of_the_snapshot(self):
+        game = self.game
+        history = UndoHistory()
+        history.save(game)
+        history.save(game)
+        history.undo(game)
+        game.player.tags.append(TempTag("Marked"))
+        game.current_sector.hooks.append(Hook("Rumor", "Mystery", "Relt", [("Ask", ["Investigate"])]))
+        history.undo(game)
+        self.assertEqual([t.name for t in game.player.tags], [])
+        self.assertEqual(game.current_sector.hooks, [])
+
+    def test_every_step_of_a_session_undoes_exactly(self):
+        game = self.game
+        strategy = RandomStrategy(random.Random(7))
+        history = UndoHistory()
+        route, stats = ["Korr Anchorage", "Orin's Reach"], {"goals": [], "jumps": 0, "route_done": False}
+        fingerprints = []
+        for _ in range(UNDO_DEPTH + 10):
+            if game.game_over:
+                break
+            generate_sector_hooks(game)
+            fingerprints.append(fingerprint(game))
+            history.save(game)
+            take_turn(game, strategy, route, stats)
+        restorable = fingerprints[-UNDO_DEPTH:]
+        self.assertEqual(len(history), len(restorable))
+        for expected in reversed(restorable):
+            self.assertTrue(history.undo(game))
+            self.assertEqual(fingerprint(game), expected)
+        self.assertFalse(history.undo(game))
+
+    def test_ring_stops_growing_at_depth(self):
+        history = UndoHistory(depth=3)
+        for tick in range(5):
+            self.game.clock = tick
+            history.save(self.game)
+        self.assertEqual(len(history), 3)
+        clocks = []
+        while history.undo(self.game):
+            clocks.append(self.game.clock)
+        self.assertEqual(clocks, [4, 3, 2])
+
+    def test_default_depth(self):
+        history = UndoHistory()
+        for _ in range(UNDO_DEPTH + 5):
+            history.save(self.game)
+        self.assertEqual(len(history), UNDO_DEPTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,88 @@
 import curses
-import copy
 import textwrap
-import re
-import random
-from models import GameState, TempTag, Goal, Message, Hook
-from oracles import *
-from main import setup_game, generate_sector_hooks
+from models import TempTag, UndoHistory, UNDO_DEPTH, install_flush_handlers, flush_all_writers
+from engine import (Policy, ACTIONS, setup_game, generate_sector_hooks, best_track, perform_action,
+                    travel, converse, send_message, resolve_message, add_goal, advance_goal, resolve_goal, wait)
+
+class TUIPolicy(Policy):
+    """Answers engine decisions with modal menus and streams its narration into the chronicle pane."""
+    def __init__(self, tui):
+        self.tui = tui
+        self.recent = []
+
+    def show(self, text, tone=None):
+        lines = [line for line in text.split("\n") if line.strip()]
+        self.tui.log_lines.extend(lines)
+        self.recent.extend(lines)
+
+    def context(self, prompt):
+        # The narration since the last question becomes the menu text
+        text = "\n".join(self.recent[-6:] + [prompt])
+        self.recent = []
+        return text
+
+    def choose_option(self, game, label, options, is_crisis=False):
+        color = 7 if "Advantage" in label or "Success" in label else 6
+        prompt = "CRISIS ACTIVE: Negative track hits are doubled (-2)!" if is_crisis else "Choose one:"
+        return self.tui.ask(label, self.context(prompt), [(opt, color) for opt in options])
+
+    def choose_bond(self, game, prompt):
+        return self.tui.ask("Select Bond", self.context(prompt), [(f"{b.name} ({b.strength})", 5) for b in game.player.bonds])
+
+    def confirm(self, game, question):
+        return self.tui.ask("Confirm", self.context(question.strip()), [("Yes", 7), ("No", 4)]) == 0
+
+    def reflect(self, game, prompt):
+        self.recent = []
+        self.tui.draw()
+        return self.tui.get_string("Reflection (press Enter to skip): ").strip()
+
+class Pane:
+    """A curses window that is only repainted when the lines it shows change.
+
+    Lines are (y, x, text, attr) tuples; show() compares them with what was last
+    painted and queues the window with noutrefresh, leaving doupdate to the caller.
+    """
+    def __init__(self, stdscr, h, w, y, x):
+        max_y, max_x = stdscr.getmaxyx()
+        self.y, self.x = min(y, max_y - 1), min(x, max_x - 1)
+        self.h, self.w = max(1, min(h, max_y - self.y)), max(1, min(w, max_x - self.x))
+        self.win = curses.newwin(self.h, self.w, self.y, self.x)
+        self.lines = None
+
+    def show(self, lines):
+        if lines == self.lines:
+            return
+        self.lines = lines
+        self.win.erase()
+        for y, x, text, attr in lines:
+            if y < self.h and x < self.w:
+                try:
+                    self.win.addstr(y, x, text[:self.w - x - 1], attr)
+                except curses.error: pass
+        self.win.noutrefresh()
+
+    def touch(self):
+        """Queue the pane again as painted, for when something was drawn over it."""
+        self.win.touchwin()
+        self.win.noutrefresh()
 
 class TUI:
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, undo_depth=UNDO_DEPTH):
         self.stdscr = stdscr
         try:
             curses.curs_set(0)
         except curses.error:
             pass
         curses.mousemask(curses.ALL_MOUSE_EVENTS | curses.REPORT_MOUSE_POSITION)
-        self.game = setup_game()
-        self.game.previous_state = None
+        self.game = setup_game(verbose=False)
+        self.undo_history = UndoHistory(undo_depth)
+        self.policy = TUIPolicy(self)
         self.log_lines = ["[System] Welcome to GDTLancer TUI Sandbox"]
         self.menu_stack = []
         self.show_full_state = False
         self.state_scroll_offset = 0
+        self.active_buttons = []
         
         curses.start_color()
         curses.use_default_colors()
@@ -33,6 +95,7 @@ class TUI:
         curses.init_pair(7, curses.COLOR_BLACK, curses.COLOR_GREEN) 
         curses.init_pair(8, curses.COLOR_YELLOW, -1)   
         
+        self.layout()
         self.push_main_menu()
 
     def log(self, msg):
@@ -40,22 +103,31 @@ class TUI:
         self.game.log(msg)
         
     def save_undo(self):
-        # Detach previous state chain to prevent recursive deepcopy crashes
-        prev = getattr(self.game, 'previous_state', None)
-        self.game.previous_state = None
-        state_copy = copy.deepcopy(self.game)
-        self.game.previous_state = state_copy
-        state_copy.previous_state = prev
+        self.undo_history.save(self.game)
 
     def do_undo(self):
-        if self.game.previous_state:
-            self.game = self.game.previous_state
+        if self.undo_history.undo(self.game):
             self.log("[System] Undid last action.")
             self.menu_stack = []
             self.push_main_menu()
         else:
             self.log("[System] Nothing to undo.")
 
+    def ask(self, title, text, choices):
+        """Modal menu for engine decisions: blocks until an option is clicked or its number typed."""
+        answer = []
+        options = [(label, lambda i=i: answer.append(i), color) for i, (label, color) in enumerate(choices)]
+        self.push_menu(title, text, options)
+        while not answer:
+            self.draw()
+            event = self.stdscr.getch()
+            if event == curses.KEY_MOUSE:
+                self.handle_mouse()
+            elif ord('1') <= event < ord('1') + min(len(choices), 9):
+                answer.append(event - ord('1'))
+        self.menu_stack.pop()
+        return answer[0]
+
     def push_menu(self, title, text, options):
         self.menu_stack.append({"title": title, "text": text, "options": options})
 
@@ -72,111 +144,122 @@ class TUI:
         
     def get_string(self, prompt_text="> "):
         max_y, max_x = self.stdscr.getmaxyx()
-        self.stdscr.addstr(max_y-1, 0, " " * (max_x - 1))
-        self.stdscr.addstr(max_y-1, 0, prompt_text)
+        prompt = curses.newwin(1, max_x, max_y - 1, 0)
+        try:
+            prompt.addstr(0, 0, prompt_text[:max_x - 1])
+        except curses.error: pass
         curses.echo()
         try:
             curses.curs_set(1)
         except curses.error:
             pass
-        self.stdscr.refresh()
-        s = self.stdscr.getstr(max_y-1, len(prompt_text), 500).decode('utf-8')
+        prompt.refresh()
+        s = prompt.getstr(0, min(len(prompt_text), max_x - 1), 500).decode('utf-8')
         curses.noecho()
         try:
             curses.curs_set(0)
         except curses.error:
             pass
-        self.stdscr.addstr(max_y-1, 0, " " * (max_x - 1))
+        # The prompt line sits over the bottom of the menu pane
+        self.panes["menu"].touch()
         return s
 
-    def draw(self):
-        self.stdscr.clear()
-        max_y, max_x = self.stdscr.getmaxyx()
+    def layout(self):
+        """(Re)build the panes for the current terminal size; every pane repaints on the next draw."""
+        self.screen_size = max_y, max_x = self.stdscr.getmaxyx()
         mid_y = max_y // 2
         mid_x = max_x // 2
-        
-        generate_sector_hooks(self.game)
-        loc_status = "In Space" if self.game.phase == "Travel" or self.game.current_sector.type == "Deep Space" else "Docked"
-        self.stdscr.addstr(0, 0, f" [{self.game.current_sector.name} ({loc_status}) | Phase: {self.game.phase} | T{self.game.clock}] ", curses.color_pair(1) | curses.A_BOLD)
-        
-        t = self.game.player.tracks
-        self.stdscr.addstr(1, 0, f" Tracks: H:{t['Health'].value} W:{t['Wealth'].value} M:{t['Morale'].value} S:{t['Supplies'].value} ")
-        tag_str = ", ".join(str(tg) for tg in self.game.player.tags) if self.game.player.tags else "None"
-        self.stdscr.addstr(2, 0, f" Tags: {tag_str}")
-        bonds_str = ", ".join(f"{b.name}({b.strength[:3]})" for b in self.game.player.bonds) if self.game.player.bonds else "None"
-        self.stdscr.addstr(3, 0, f" Bonds: {bonds_str}")
-        
-        self.stdscr.addstr(4, 0, " Goals:")
-        goal_y = 5
-        for g in self.game.player.goals[:4]: 
-            try:
-                self.stdscr.addstr(goal_y, 2, f"[{g.rank[:3]}] {g.statement[:mid_x-10]} ({g.progress}/10)")
-                goal_y += 1
-            except curses.error: pass
-            
-        unresolved_hooks = [h for h in self.game.current_sector.hooks if not h.resolved]
+        self.stdscr.erase()
         try:
-            self.stdscr.addstr(goal_y, 0, f" Hooks: {len(unresolved_hooks)} active")
-            goal_y += 1
-            npcs_str = ", ".join(n.name for n in self.game.current_sector.npcs) if self.game.current_sector.npcs else "None"
-            self.stdscr.addstr(goal_y, 0, f" Local NPCs: {npcs_str[:mid_x-15]}")
+            self.stdscr.vline(0, mid_x, '|', mid_y)
+            self.stdscr.hline(mid_y, 0, '-', max_x - 1)
         except curses.error: pass
-        
-        for y in range(0, mid_y):
-            try:
-                self.stdscr.addch(y, mid_x, '|')
-            except curses.error: pass
-
-        self.stdscr.addstr(0, mid_x + 2, " CHRONICLE ", curses.A_BOLD)
-        log_height = mid_y - 1
-        visible_logs = self.log_lines[-log_height:] if len(self.log_lines) > log_height else self.log_lines
-        for i, line in enumerate(visible_logs):
-            try:
-                self.stdscr.addstr(1 + i, mid_x + 2, line[:(max_x - mid_x - 3)])
-            except curses.error: pass
+        self.stdscr.noutrefresh()
+        self.panes = {
+            "header": Pane(self.stdscr, 1, mid_x, 0, 0),
+            "tracks": Pane(self.stdscr, 3, mid_x, 1, 0),
+            "goals": Pane(self.stdscr, mid_y - 4, mid_x, 4, 0),
+            "log": Pane(self.stdscr, mid_y, max_x - mid_x - 1, 0, mid_x + 1),
+            "menu": Pane(self.stdscr, max_y - mid_y - 1, max_x, mid_y + 1, 0),
+        }
+        self.state_pad = None
+
+    def repaint(self):
+        """Push every pane to the screen again without re-rendering it (after an overlay)."""
+        self.stdscr.touchwin()
+        self.stdscr.noutrefresh()
+        for pane in self.panes.values():
+            pane.touch()
 
-        try:
-            self.stdscr.addstr(mid_y, 0, "-" * (max_x - 1))
-        except curses.error: pass
+    def draw(self):
+        if self.stdscr.getmaxyx() != self.screen_size:
+            self.layout()
+        game = self.game
+        panes = self.panes
+
+        loc_status = "In Space" if game.phase == "Travel" or game.current_sector.type == "Deep Space" else "Docked"
+        panes["header"].show([(0, 0, f" [{game.current_sector.name} ({loc_status}) | Phase: {game.phase} | T{game.clock}] ", curses.color_pair(1) | curses.A_BOLD)])
+
+        t = game.player.tracks
+        tag_str = ", ".join(str(tg) for tg in game.player.tags) if game.player.tags else "None"
+        bonds_str = ", ".join(f"{b.name}({b.strength[:3]})" for b in game.player.bonds) if game.player.bonds else "None"
+        panes["tracks"].show([
+            (0, 0, f" Tracks: H:{t['Health'].value} W:{t['Wealth'].value} M:{t['Morale'].value} S:{t['Supplies'].value} ", 0),
+            (1, 0, f" Tags: {tag_str}", 0),
+            (2, 0, f" Bonds: {bonds_str}", 0),
+        ])
+
+        width = panes["goals"].w
+        lines = [(0, 0, " Goals:", 0)]
+        for g in game.player.goals[:4]:
+            lines.append((len(lines), 2, f"[{g.rank[:3]}] {g.statement[:width-10]} ({g.progress}/10)", 0))
+        unresolved_hooks = [h for h in game.current_sector.hooks if not h.resolved]
+        lines.append((len(lines), 0, f" Hooks: {len(unresolved_hooks)} active", 0))
+        local_npcs = game.get_npcs_at_sector(game.current_sector.name)
+        npcs_str = ", ".join(n.name for n in local_npcs) if local_npcs else "None"
+        lines.append((len(lines), 0, f" Local NPCs: {npcs_str[:width-15]}", 0))
+        panes["goals"].show(lines)
+
+        log_height = panes["log"].h - 1
+        visible_logs = self.log_lines[-log_height:] if log_height > 0 else []
+        panes["log"].show([(0, 1, " CHRONICLE ", curses.A_BOLD)] + [(1 + i, 1, line, 0) for i, line in enumerate(visible_logs)])
 
         if self.menu_stack:
-            menu = self.menu_stack[-1]
-            try:
-                self.stdscr.addstr(mid_y + 1, 2, menu["title"], curses.A_BOLD)
-                wrapped = []
-                for paragraph in str(menu["text"]).split('\n'):
-                    if paragraph.strip() == "":
-                        wrapped.append("")
-                    else:
-                        wrapped.extend(textwrap.wrap(paragraph, width=max_x - 6))
-                text_y = mid_y + 3
-                for line in wrapped:
-                    self.stdscr.addstr(text_y, 4, line)
-                    text_y += 1
-                
-                self.active_buttons = []
-                btn_start_y = text_y + 1
+            self.draw_menu(self.menu_stack[-1])
+        curses.doupdate()
+
+    def draw_menu(self, menu):
+        pane = self.panes["menu"]
+        lines = [(0, 2, menu["title"], curses.A_BOLD)]
+        text_y = 2
+        for paragraph in str(menu["text"]).split('\n'):
+            wrapped = textwrap.wrap(paragraph, width=max(1, pane.w - 6)) if paragraph.strip() else [""]
+            for line in wrapped:
+                lines.append((text_y, 4, line, 0))
+                text_y += 1
+
+        self.active_buttons = []
+        btn_start_y = text_y + 1
+        curr_y = btn_start_y
+        curr_x = 4
+
+        # Dynamic column width based on longest label
+        max_label_len = max([len(l) for l, _, _ in menu["options"]] + [20])
+        col_width = min(max_label_len + 8, pane.w - 10)
+
+        for label, cb, color in menu["options"]:
+            if curr_y >= pane.h - 1:
                 curr_y = btn_start_y
-                curr_x = 4
-                
-                # Dynamic column width based on longest label
-                max_label_len = max([len(l) for l, _, _ in menu["options"]] + [20])
-                col_width = min(max_label_len + 8, max_x - 10)
-                
-                for label, cb, color in menu["options"]:
-                    if curr_y >= max_y - 1:
-                        curr_y = btn_start_y
-                        curr_x += col_width
-                        if curr_x >= max_x - 20: break 
-                    btn_str = f" [ {label} ] "
-                    if len(btn_str) > col_width - 2:
-                        btn_str = btn_str[:col_width-5] + "... ] "
-                    self.stdscr.addstr(curr_y, curr_x, btn_str, curses.color_pair(color))
-                    self.active_buttons.append((curr_y, curr_x, curr_x + len(btn_str), cb))
-                    curr_y += 2
-            except curses.error: pass
-
-        self.stdscr.refresh()
+                curr_x += col_width
+                if curr_x >= pane.w - 20: break
+            btn_str = f" [ {label} ] "
+            if len(btn_str) > col_width - 2:
+                btn_str = btn_str[:col_width-5] + "... ] "
+            lines.append((curr_y, curr_x, btn_str, curses.color_pair(color)))
+            # Buttons are hit-tested in screen coordinates
+            self.active_buttons.append((pane.y + curr_y, pane.x + curr_x, pane.x + curr_x + len(btn_str), cb))
+            curr_y += 2
+        pane.show(lines)
 
     def handle_mouse(self):
         try:
@@ -195,9 +278,13 @@ class TUI:
             if self.game.game_over and not getattr(self, 'game_over_shown', False):
                 self.game_over_shown = True
                 
+            # World upkeep happens once per input, not while rendering
+            generate_sector_hooks(self.game)
+
             if hasattr(self.game, 'pending_alerts') and self.game.pending_alerts:
                 alert = self.game.pending_alerts.pop(0)
                 if "[GAME OVER" in alert:
+                    self.game.chronicle_writer.flush()
                     self.push_menu("GAME OVER", alert, [("Quit", lambda: exit(0), 4)])
                 else:
                     self.push_menu("ALERT", alert, [("Acknowledge", self.pop_menu, 6)])
@@ -217,7 +304,7 @@ class TUI:
                     # Or limit it in draw_full_state.
                     self.state_scroll_offset += 1
                 elif event in [ord('q'), 27]: # q or ESC
-                    self.show_full_state = False
+                    self.close_full_state()
                 elif event == curses.KEY_MOUSE:
                     try:
                         _, _, _, _, bstate = curses.getmouse()
@@ -226,7 +313,7 @@ class TUI:
                         elif bstate & getattr(curses, 'BUTTON5_PRESSED', 2097152) or bstate == 2097152:
                             self.state_scroll_offset += 1
                         elif bstate & (curses.BUTTON1_CLICKED | curses.BUTTON1_PRESSED):
-                            self.show_full_state = False
+                            self.close_full_state()
                     except curses.error:
                         pass
                 continue
@@ -284,7 +371,7 @@ class TUI:
 
     def do_wait(self):
         self.save_undo()
-        self.game.advance_clock(1)
+        wait(self.game, self.policy, 1)
         self.log("Waited 1 tick.")
         
     def do_log(self):
@@ -295,11 +382,15 @@ class TUI:
     def flow_full_state(self):
         self.show_full_state = True
         self.state_scroll_offset = 0
-        
-    def draw_full_state(self):
-        self.stdscr.clear()
-        max_y, max_x = self.stdscr.getmaxyx()
-        
+        # The game cannot change while the overview is open, so its lines are built once
+        self.full_state_lines = self.build_full_state_lines()
+        self.state_pad = None
+
+    def close_full_state(self):
+        self.show_full_state = False
+        self.repaint()
+
+    def build_full_state_lines(self):
         lines = []
         lines.append(f"=== FULL STATE OVERVIEW ===")
         lines.append(f"Sector: {self.game.current_sector.name} ({self.game.current_sector.type})")
@@ -349,8 +440,9 @@ class TUI:
             lines.append(f"  {t.name}: {t.value}/10")
             
         lines.append("Local NPCs:")
-        if self.game.current_sector.npcs:
-            for n in self.game.current_sector.npcs:
+        local_npcs = self.game.get_npcs_at_sector(self.game.current_sector.name)
+        if local_npcs:
+            for n in local_npcs:
                 lines.append(f"  {n.name} ({n.role}) - Disposition: {n.disposition}")
         else:
             lines.append("  None")
@@ -370,152 +462,46 @@ class TUI:
         for r, d in self.game.routes.get(self.game.current_sector.name, {}).items():
             lines.append(f"  -> {r} (Dist: {d})")
 
+        return lines
+
+    def draw_full_state(self):
+        if self.stdscr.getmaxyx() != self.screen_size:
+            self.layout()
+        max_y, max_x = self.screen_size
+        lines = self.full_state_lines
+
+        if self.state_pad is None:
+            self.state_pad = curses.newpad(len(lines) + 1, max_x)
+            for i, line in enumerate(lines):
+                try:
+                    self.state_pad.addstr(i, 2, line[:max_x-4])
+                except curses.error:
+                    pass
+            self.state_footer = Pane(self.stdscr, 1, max_x, max_y - 1, 0)
+
         # Clamp scroll
         max_scroll = max(0, len(lines) - (max_y - 3))
         self.state_scroll_offset = min(max_scroll, self.state_scroll_offset)
-        
-        visible_lines = lines[self.state_scroll_offset : self.state_scroll_offset + max_y - 2]
-        
-        for i, line in enumerate(visible_lines):
-            try:
-                self.stdscr.addstr(i, 2, line[:max_x-4])
-            except curses.error:
-                pass
-                
-        try:
-            scroll_percent = int((self.state_scroll_offset / max(1, max_scroll)) * 100) if max_scroll > 0 else 100
-            self.stdscr.addstr(max_y-1, 2, f"[ UP/DOWN: Scroll ({scroll_percent}%) ]  [ Q or CLICK: Close ]", curses.color_pair(5))
-        except curses.error: pass
-        self.stdscr.refresh()
-
-    def apply_track_option(self, option_str, is_crisis=False):
-        results = self.game.player.apply_option(option_str, is_crisis=is_crisis, impact_callback=lambda t, a: ("Player", f"Strain on {t} is felt." if a < 0 else f"Boost to {t} invigorates."))
-        for res in results:
-            if "choose a bond to STRENGTHEN" in res:
-                self.flow_modify_bond(1)
-            elif "choose a bond to WEAKEN" in res:
-                self.flow_modify_bond(-1)
-            elif "pending" in res:
-                match = re.search(r'Sector (Health|Wealth|Morale|Supplies) change ([+-]\d+) pending', res)
-                if match:
-                    tr, amt = match.groups()
-                    if tr in self.game.current_sector.tracks:
-                        s_res = self.game.current_sector.tracks[tr].change(int(amt))
-                        self.log(f"Sector {self.game.current_sector.name} {s_res}")
-            else:
-                self.log(res)
 
-    def flow_modify_bond(self, amount):
-        opts = []
-        for b in self.game.player.bonds:
-            opts.append((f"{b.name} ({b.strength})", lambda b=b: self._apply_bond_mod(b, amount), 7 if amount > 0 else 6))
-        self.push_menu("Select Bond to Modify", f"Apply {amount} to a bond.", opts)
-
-    def _apply_bond_mod(self, bond, amount):
-        res = bond.modify(amount)
-        self.log(res)
-        self.pop_menu()
-
-    def process_action_outcome(self, outcome, is_crisis, hook=None, context=""):
-        in_space = self.game.phase == "Travel"
-        
-        def do_apply(opt, crisis):
-            self.pop_menu()
-            self.apply_track_option(opt, crisis)
-
-        def push_disadv(context_str=""):
-            comp_name, dis_options = get_complication()
-            text = f"{context_str}\n[COMPLICATION] {comp_name}\n"
-            if is_crisis: text += "CRISIS ACTIVE: Negative track hits are doubled (-2)!\n"
-            text += "Choose your disadvantage:"
-            opts = [(opt, lambda o=opt: do_apply(o, is_crisis), 6) for opt in dis_options]
-            self.push_menu("Action Disadvantage", text, opts)
-            
-        def push_adv(next_step=None, context_str=""):
-            opp_name, adv_options = get_opportunity(in_space)
-            text = f"{context_str}\n[OPPORTUNITY] {opp_name}\nChoose your advantage:"
-            opts = []
-            for opt in adv_options:
-                def cb(o=opt):
-                    self.pop_menu()
-                    self.apply_track_option(o, is_crisis)
-                    if next_step: next_step()
-                opts.append((opt, cb, 7))
-            self.push_menu("Action Advantage", text, opts)
-
-        c_str = context if context else ""
-
-        if hook:
-            hook.resolved = True
-            if "Success" in outcome:
-                self.log(f"[HOOK SUCCESS] {hook.success_opt}")
-                text = f"{c_str}\n\n[SUCCESS]\nYou fully resolved the hook!\nRewards: {hook.success_opt}"
-                self.push_menu("Hook Success", text, [("Excellent", lambda: do_apply(hook.success_opt, is_crisis), 7)])
-            elif outcome == "Partial":
-                self.log(f"[HOOK SUCCESS] {hook.success_opt}")
-                self.apply_track_option(hook.success_opt, is_crisis)
-                text = f"{c_str}\n\n[PARTIAL SUCCESS]\nYou succeeded ({hook.success_opt}) but suffer a complication:\n{hook.fail_opt}"
-                self.push_menu("Hook Complication", text, [("Accept", lambda: do_apply(hook.fail_opt, is_crisis), 6)])
-            else:
-                self.log(f"[HOOK FAILURE] {hook.fail_opt}")
-                text = f"{c_str}\n\n[FAILURE]\nYou failed to resolve the hook. Consequences:\n{hook.fail_opt}"
-                if is_crisis: text += "\nCRISIS ACTIVE (-2 instead of -1)!"
-                self.push_menu("Hook Failure", text, [("Accept", lambda: do_apply(hook.fail_opt, is_crisis), 6)])
-        else:
-            if "Success" in outcome: push_adv(context_str=c_str)
-            elif outcome == "Partial": push_adv(next_step=lambda: push_disadv(context_str=c_str), context_str=c_str)
-            elif outcome in ["Setback", "Crisis"]: push_disadv(context_str=c_str)
+        self.state_pad.touchwin()
+        self.state_pad.noutrefresh(self.state_scroll_offset, 0, 0, 0, max(0, max_y - 2), max_x - 1)
+        scroll_percent = int((self.state_scroll_offset / max(1, max_scroll)) * 100) if max_scroll > 0 else 100
+        self.state_footer.show([(0, 2, f"[ UP/DOWN: Scroll ({scroll_percent}%) ]  [ Q or CLICK: Close ]", curses.color_pair(5))])
+        curses.doupdate()
 
     def do_action_roll(self, action_name, approach, bond=None, tool=None, hook=None, context=""):
         self.save_undo()
-        valid_tracks = get_action_tracks(action_name)
-        track_name = valid_tracks[0]
-        if len(valid_tracks) > 1:
-            mod1, _ = self.game.player.get_track_modifier(valid_tracks[0])
-            mod2, _ = self.game.player.get_track_modifier(valid_tracks[1])
-            if mod2 > mod1: track_name = valid_tracks[1]
-                
-        mod, used_tags = self.game.player.get_track_modifier(track_name)
-        sector_tracks = list(self.game.current_sector.tracks.values())
-        avg_sector = sum(t.value for t in sector_tracks) / 4.0
-        if avg_sector > 6: mod += 1
-        elif avg_sector < 4: mod -= 1
-            
-        if bond:
-            if bond.strength == "DEEP": mod += 1
-            elif bond.strength == "SEVERED": mod -= 1
-        if tool:
-            mod += 1
+        track_name = best_track(self.game, action_name)
+        _, tag_names = self.game.player.get_track_modifier(track_name)
+        tags = [t for t in self.game.player.tags if t.name in tag_names]
 
-        mod = max(-4, min(4, mod))
-
-        for t in used_tags:
-            self.game.player.remove_tag(t)
-            self.log(f"Used tag: {t}")
-            
-        roll = roll_3d6()
-        total = roll + mod
-        is_crisis = False
-        is_outstanding = False
-        if approach == "risky":
-            if roll <= 5: total = 6; is_crisis = True
-            elif roll >= 16: total = 15; is_outstanding = True
-                
-        if total <= 6: outcome = "Crisis" if is_crisis else "Setback"
-        elif total <= 10: outcome = "Partial"
-        elif total <= 14: outcome = "Success"
-        else: outcome = "Success (Outstanding)" if is_outstanding else "Success"
-
-        roll_desc = f"Roll: 3d6({roll}) {mod:+d} mod = {total} -> {outcome.upper()}"
-        self.log(f"Action: {action_name.capitalize()} ({approach.capitalize()}) via {track_name}. {roll_desc}")
-        
         # Robustly clear action menus back to Main Menu
         self.menu_stack = []
         self.push_main_menu()
-        
-        extended_context = f"{context}\n{roll_desc}" if context else roll_desc
-        self.process_action_outcome(outcome, is_crisis, hook, extended_context)
-        self.game.advance_clock(1)
+
+        self.policy.recent = [context] if context else []
+        result = perform_action(self.game, self.policy, action_name, track_name, approach, hook=hook, tags=tags, bond=bond, tool=tool)
+        self.log(f"Action: {action_name.capitalize()} ({approach.capitalize()}) via {track_name}. Roll: 3d6({result.roll}) {result.mod:+d} mod = {result.total} -> {result.outcome.upper()}")
 
     def flow_act_modifiers(self, action_name, approach, hook=None, context=""):
         bonds = self.game.player.bonds
@@ -544,138 +530,56 @@ class TUI:
         self.push_menu(f"Approach: {action_name.capitalize()}", f"{context}\nChoose approach.", opts)
 
     def flow_act(self, hook=None, context=""):
-        actions = ["command", "navigate", "endure", "overcome", "scavenge", "repair", "barter", "acquire", "petition", "convince", "investigate", "scan"]
-        opts = [(a.capitalize(), lambda a=a: self.flow_act_approach(a, hook, context), 6) for a in actions]
+        opts = [(a.capitalize(), lambda a=a: self.flow_act_approach(a, hook, context), 6) for a in ACTIONS]
         opts.append(("Cancel", self.pop_menu, 4))
         self.push_menu("Select Action", (f"{context}\n" if context else "") + "What action are you taking?", opts)
 
     def flow_travel(self):
         sectors = list(self.game.sectors.keys())
-        opts = [(s, lambda s=s: self.do_travel_step1(s), 5) for s in sectors if s != self.game.current_sector.name]
+        opts = [(s, lambda s=s: self.do_travel(s), 5) for s in sectors if s != self.game.current_sector.name]
         opts.append(("Cancel", self.pop_menu, 4))
         self.push_menu("Travel", "Select destination.", opts)
 
-    def do_travel_step1(self, dest_name):
+    def do_travel(self, dest_name):
         self.save_undo()
-        import heapq
-        distances = {s: float('inf') for s in self.game.sectors}
-        distances[self.game.current_sector.name] = 0
-        pq = [(0, self.game.current_sector.name)]
-        while pq:
-            d, current = heapq.heappop(pq)
-            if d > distances[current]: continue
-            if current == dest_name: break
-            for neighbor, weight in self.game.routes.get(current, {}).items():
-                dist = d + weight
-                if dist < distances[neighbor]:
-                    distances[neighbor] = dist
-                    heapq.heappush(pq, (dist, neighbor))
-        
-        distance = distances[dest_name]
-        if distance == float('inf'):
-            self.push_menu("Error", "No route.", [("OK", self.pop_menu, 4)]); return
-            
-        self.game.phase = "Travel"
-        self.log(f"Initiated travel to {dest_name} (Dist: {distance})")
-        
-        # 1. Community Cost
-        cost_name, cost_opts = get_community_cost()
-        def pick_cost(opt):
-            self.pop_menu()
-            self.apply_track_option(opt, False)
-            # 2. Crew Checks
-            issues = []
-            for crew in self.game.player.crew:
-                if random.random() < 0.5:
-                    name, opts, ctype = get_pre_flight_crew()
-                    issues.append((crew, name, opts, ctype))
-            if issues:
-                crew, name, opts, ctype = random.choice(issues)
-                def pick_crew(opt2):
-                    self.pop_menu()
-                    self.apply_track_option(opt2, False)
-                    self.do_travel_step3(dest_name, distance)
-                c_opts = [(o, lambda o=o: pick_crew(o), 6) for o in opts]
-                self.push_menu(f"{ctype} for {crew.name}", f"Transit to {dest_name}\nIssue: {name}", c_opts)
-            else:
-                self.do_travel_step3(dest_name, distance)
-                
-        c_opts = [(o, lambda o=o: pick_cost(o), 6) for o in cost_opts]
-        self.replace_menu("Community Cost", f"Transit to {dest_name}\n{cost_name}", c_opts)
-
-    def do_travel_step3(self, dest_name, distance):
-        self.log(f"--- TRANSIT TO {dest_name} ---")
-        for step in range(distance):
-            self.game.player.tracks["Supplies"].change(-1)
-            self.log("Consumed 1 Supplies during travel.")
-            enc = random.randint(1, 6)
-            if enc == 1: 
-                comp_name, dis_opts = get_complication()
-                self.log(f"[TRAVEL ENCOUNTER] Hazard: {comp_name}")
-                def pick_haz(o):
-                    self.pop_menu()
-                    self.apply_track_option(o, False)
-                self.push_menu("Hazard Disadvantage", f"Travel to {dest_name}\nHazard: {comp_name}", [(o, lambda o=o: pick_haz(o), 6) for o in dis_opts])
-            elif enc == 2: 
-                opp_name, adv_opts = get_opportunity(in_space=True)
-                self.log(f"[TRAVEL ENCOUNTER] Opportunity: {opp_name}")
-                def pick_opp(o):
-                    self.pop_menu()
-                    self.apply_track_option(o, False)
-                self.push_menu("Discovery Advantage", f"Travel to {dest_name}\nDiscovery: {opp_name}", [(o, lambda o=o: pick_opp(o), 7) for o in adv_opts])
-            self.game.advance_clock(1)
-            
-        self.game.current_sector = self.game.sectors[dest_name]
-        self.game.phase = "Encounter"
-        self.log(f"Arrived at {dest_name}")
+        self.menu_stack = []
+        self.push_main_menu()
+        result = travel(self.game, self.policy, dest_name)
+        if result.error:
+            self.push_menu("Error", result.error, [("OK", self.pop_menu, 4)])
 
     def flow_converse(self):
-        if not self.game.current_sector.npcs:
+        npcs = self.game.get_npcs_at_sector(self.game.current_sector.name)
+        crew = self.game.player.crew
+        if not npcs and not crew:
             self.push_menu("Converse", "No NPCs present.", [("Back", self.pop_menu, 4)])
             return
-        opts = [(n.name, lambda n=n: self._converse_npc(n), 5) for n in self.game.current_sector.npcs]
+        opts = [(n.name, lambda n=n: self._converse_npc(n.name), 5) for n in npcs]
+        opts += [(f"{c.name} (Crew)", lambda c=c: self._converse_npc(c.name), 5) for c in crew]
         opts.append(("Cancel", self.pop_menu, 4))
         self.push_menu("Converse", "Select an NPC.", opts)
 
-    def _converse_npc(self, npc):
+    def _converse_npc(self, name):
         self.save_undo()
-        seed = roll_conversation_seed()
-        disp = roll_disposition()
-        npc.disposition = disp
-        
-        def do_text_input():
-            self.draw()
-            topic = self.get_string(f"Topic Node (e.g. 'a shortage' or press enter for '{seed}'): ")
-            if not topic.strip(): topic = seed
-            self.draw()
-            outcome = self.get_string("Outcome Node (e.g. 'tension increased', 'agreement'): ")
-            self.draw()
-            free_text = self.get_string("Optional Free Text (dialogue/notes): ")
-            
-            log_entry = f"Spoke with {npc.name} about {topic} resulting in {outcome}."
-            if free_text: log_entry += f" Note: {free_text}"
-            self.log(log_entry)
-            self.pop_menu()
-            self.pop_menu()
+        self.pop_menu()
+        result = converse(self.game, self.policy, name)
+        if result.error or result.is_crew:
+            return
+        npc = next(n for n in self.game.get_all_npcs() if n.name == result.npc_name)
 
-        text = f"NPC: {npc.name}\nDisposition: {disp}\nTopic Seed: {seed}"
-        opts = [("Continue to conversation input", do_text_input, 5)]
-        
-        if disp in ["Frustrated", "Worried", "Distant"]:
+        text = f"NPC: {npc.name}\nDisposition: {result.mood}\nTopic Seed: {result.seed}"
+        if result.mood in ["Frustrated", "Worried", "Distant"]:
             def calm():
                 self.game.player.tracks["Morale"].change(-1)
                 npc.disposition = "Calm"
                 self.log(f"Spent 1 Morale. {npc.name} is now Calm.")
-                do_text_input()
-            opts.insert(0, ("Spend 1 Morale to calm them", calm, 5))
-        elif disp in ["Hopeful", "Eager"]:
+                self.pop_menu()
+            self.push_menu(f"Converse with {npc.name}", text, [("Spend 1 Morale to calm them", calm, 5), ("Leave it", self.pop_menu, 4)])
+        elif result.mood in ["Hopeful", "Eager"]:
             def intel():
-                self.game.player.tags.append(TempTag("Useful Intel", "Used in action"))
-                self.log("Gained tag: Useful Intel")
-                do_text_input()
-            opts.insert(0, ("Accept Useful Intel tag", intel, 7))
-
-        self.push_menu(f"Converse with {npc.name}", text, opts)
+                self.log(self.game.player.add_tag(TempTag("Useful Intel", "Used in action")))
+                self.pop_menu()
+            self.push_menu(f"Converse with {npc.name}", text, [("Accept Useful Intel tag", intel, 7), ("Leave it", self.pop_menu, 4)])
 
     def flow_hooks(self):
         unresolved = [h for h in self.game.current_sector.hooks if not h.resolved]
@@ -708,16 +612,17 @@ class TUI:
         rank = self.get_string("Rank (MINOR/MAJOR/EPIC): ").upper()
         if rank in ["MINOR", "MAJOR", "EPIC"]:
             stmt = self.get_string("Statement: ")
-            self.game.player.goals.append(Goal(stmt, rank=rank))
-            self.log(f"Added {rank} goal: {stmt}")
+            add_goal(self.game, stmt, rank=rank)
+            self.log_lines.append(f"Added {rank} goal: {stmt}")
         self.pop_menu()
 
+    def ask_approach(self, context):
+        return ["cautious", "risky"][self.ask("Approach", f"{context}\nChoose approach.", [("Cautious", 5), ("Risky", 6)])]
+
     def flow_goal_detail(self, goal):
         def advance():
             self.save_undo()
-            amt = {"MINOR": 2, "MAJOR": 1, "EPIC": 1}.get(goal.rank, 1)
-            res = goal.advance(amt)
-            self.log(res)
+            advance_goal(self.game, self.policy, goal.id, {"MINOR": 2, "MAJOR": 1, "EPIC": 1}.get(goal.rank, 1))
             self.pop_menu(); self.pop_menu()
         def resolve():
             if goal.progress < 10:
@@ -725,12 +630,8 @@ class TUI:
                 return
             self.save_undo()
             self.pop_menu(); self.pop_menu()
-            
-            # Remove goal before action, as TUI action engine expects standard track options
-            # Alternatively we just let the player roleplay the failure.
-            self.game.player.goals.remove(goal)
-            self.log(f"Attempting to resolve goal: {goal.statement}")
-            self.flow_act_approach("petition", context="Action: Petition")
+            approach = self.ask_approach(f"Resolve goal: {goal.statement}")
+            resolve_goal(self.game, self.policy, goal.id, approach)
 
         opts = [("Advance Progress", advance, 7), ("Resolve Goal", resolve, 6), ("Back", self.pop_menu, 4)]
         self.push_menu(f"Goal: {goal.id}", f"{goal.rank} Goal\n{goal.statement}\nProgress: {goal.progress}/10", opts)
@@ -746,18 +647,14 @@ class TUI:
     def do_msg_send(self):
         to = self.get_string("Send to (NPC/Bond name): ")
         sub = self.get_string("Subject: ")
-        arr_tick = self.game.clock + 2
-        msg = Message(f"M{self.game.msg_counter}", to, self.game.clock, arr_tick, sub)
-        self.game.message_queue.append(msg)
-        self.game.msg_counter += 1
-        self.log(f"Sent tight-beam to {to}. Subject: {sub}")
+        send_message(self.game, self.policy, to, sub)
         self.pop_menu()
 
     def do_msg_resolve(self, m):
-        self.log(f"Resolving message {m.id} to {m.to_npc}")
-        m.status = "RESOLVED"
+        self.save_undo()
         self.pop_menu()
-        self.flow_act_approach("petition", context="Action: Petition")
+        approach = self.ask_approach(f"Resolve message {m.id} to {m.to_npc} (Petition)")
+        resolve_message(self.game, self.policy, m.id, approach)
 
     def flow_tags_bonds(self):
         opts = [("Add NPC Goal", self.do_npc_goal, 5)]
@@ -785,10 +682,13 @@ class TUI:
         self.pop_menu()
 
 def main():
+    install_flush_handlers()
     try:
         curses.wrapper(lambda stdscr: TUI(stdscr).run())
     except KeyboardInterrupt:
         pass
+    finally:
+        flush_all_writers()
 
 if __name__ == "__main__":
     main()